@@ -0,0 +1,105 @@
+"""
+Peak memory and state size of a full generation run, with and without
+low-memory mode. The API is replaced by a client returning fixed prose.
+
+    python benchmarks/low_memory.py --sections 10 40
+    python benchmarks/low_memory.py --sections 10 40 --low-memory
+
+Each book size runs in its own process, since peak RSS never goes down.
+In low-memory mode, peak RSS should stay flat as the book grows; the run
+fails if it grows by more than --max-growth MB from the smallest size.
+"""
+
+import argparse
+import asyncio
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from book_writer.generator import BookGenerator, combine_chapters
+from book_writer.models import (
+    BookOutline,
+    ChapterOutline,
+    GenerationConfig,
+    GenerationResult,
+    SectionOutline,
+)
+from book_writer.state import StateManager
+
+
+class FixedClient:
+    """Returns the same ~4,000-word section for every request."""
+
+    async def generate_result(self, messages, model=None):
+        return GenerationResult(content="word " * 4000, model="bench/model")
+
+
+def run_once(chapter_count: int, section_count: int, low_memory: bool) -> None:
+    """Generate one book and print its stats as key=value pairs."""
+    chapters = [
+        ChapterOutline(
+            id=str(c),
+            number=c,
+            title=f"Chapter {c}",
+            sections=[
+                SectionOutline(id=f"{c}.{i}", title=f"Section {i}", outline_content="Cover it")
+                for i in range(section_count)
+            ],
+        )
+        for c in range(1, chapter_count + 1)
+    ]
+    outline = BookOutline(title="Benchmark", chapters=chapters)
+
+    output_dir = Path(tempfile.mkdtemp())
+    state_manager = StateManager(output_dir, low_memory=low_memory)
+    state = state_manager.initialize_state(outline, "bench/model", "hash")
+    config = GenerationConfig(max_concurrent_chapters=2, low_memory=low_memory)
+    generator = BookGenerator(outline, FixedClient(), state_manager, config, output_dir)
+    state = asyncio.run(generator.generate_book(state))
+    combine_chapters(output_dir, outline)
+
+    completed = state_manager.get_overall_progress(state)["completed"]
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024
+    state_size = (output_dir / "state.json").stat().st_size
+    print(f"sections={completed} peak_rss={peak_mb} state_size={state_size}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--chapters", type=int, default=10)
+    parser.add_argument(
+        "--sections", type=int, nargs="+", default=[10, 40], help="Sections per chapter"
+    )
+    parser.add_argument("--low-memory", action="store_true")
+    parser.add_argument(
+        "--max-growth", type=int, default=10, help="Allowed peak RSS growth (MB), low-memory only"
+    )
+    parser.add_argument("--once", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.once:
+        run_once(args.chapters, args.sections[0], args.low_memory)
+        return
+
+    peaks = []
+    for count in sorted(args.sections):
+        command = [sys.executable, __file__, "--once", "--chapters", str(args.chapters)]
+        command += ["--sections", str(count)] + (["--low-memory"] if args.low_memory else [])
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        stats = dict(item.split("=") for item in output.split())
+        peaks.append(int(stats["peak_rss"]))
+        print(
+            f"low_memory={args.low_memory} sections={stats['sections']} "
+            f"peak_rss={stats['peak_rss']} MB state.json={int(stats['state_size']):,} bytes"
+        )
+
+    growth = peaks[-1] - peaks[0]
+    print(f"peak RSS growth: {growth} MB")
+    if args.low_memory and growth > args.max_growth:
+        raise SystemExit(f"Peak RSS grew by {growth} MB, more than {args.max_growth} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Time to build every section prompt of a long chapter: rebuilding each
+prompt from scratch (build_section_prompt) against the incremental
+ChapterPromptBuilder.
+
+    python benchmarks/prompt_builder.py --sections 100 200 400
+"""
+
+import argparse
+import time
+
+from book_writer.models import ChapterOutline, SectionOutline
+from book_writer.prompts import ChapterPromptBuilder, build_section_prompt
+
+BODY = "word " * 1000  # ~1,000 tokens per finished section
+OPTIONS = {"cache_control": True, "max_prompt_tokens": 10**9, "model": "bench/model"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sections", type=int, nargs="+", default=[100, 200, 400])
+    args = parser.parse_args()
+
+    print(f"{'sections':>8} {'rebuild (s)':>12} {'builder (s)':>12}")
+    for count in args.sections:
+        sections = [
+            SectionOutline(id=f"1.{i}", title=f"Section {i}", outline_content="Cover it")
+            for i in range(count)
+        ]
+        chapter = ChapterOutline(id="1", title="Chapter", sections=sections)
+
+        started = time.perf_counter()
+        previous: list[tuple[str, str]] = []
+        for section in sections:
+            build_section_prompt(section, chapter, "Benchmark", previous, **OPTIONS)
+            previous.append((section.title, BODY))
+        rebuild = time.perf_counter() - started
+
+        started = time.perf_counter()
+        builder = ChapterPromptBuilder(chapter, "Benchmark", **OPTIONS)
+        for section in sections:
+            builder.build(section)
+            builder.add_section(section.title, BODY)
+        incremental = time.perf_counter() - started
+
+        print(f"{count:>8} {rebuild:>12.3f} {incremental:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Startup cost of the lightweight CLI commands: wall time and the modules
+that dominate `python -X importtime`, for `--help`, `status` and `list`
+against a small generated book.
+
+    python benchmarks/startup.py --runs 5 --top 8
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from book_writer.models import BookOutline, ChapterOutline, SectionOutline
+from book_writer.state import StateManager
+
+
+def _book(root: Path) -> Path:
+    """A book with state and a fresh progress summary on disk."""
+    book = root / "book"
+    book.mkdir()
+    (book / "rubric.md").write_text("# Benchmark\n", encoding="utf-8")
+    (book / "config.yaml").write_text("title: Benchmark\n", encoding="utf-8")
+    chapters = [
+        ChapterOutline(
+            id=str(c),
+            number=c,
+            title=f"Chapter {c}",
+            sections=[
+                SectionOutline(id=f"{c}.{i}", title=f"Section {i}", outline_content="Cover it")
+                for i in range(10)
+            ],
+        )
+        for c in range(1, 11)
+    ]
+    StateManager(book / "output").initialize_state(
+        BookOutline(title="Benchmark", chapters=chapters), "bench/model", "hash"
+    )
+    return book
+
+
+def _run(args: list[str]) -> tuple[float, dict[str, int]]:
+    """Wall seconds and each module's self import time (us) for one CLI run."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "book_writer", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed = time.perf_counter() - started
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            own, _, name = line.removeprefix("import time:").split("|")
+            if own.strip().isdigit():
+                times[name.strip()] = int(own)
+    return elapsed, times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp())
+    book = _book(root)
+    commands = {
+        "--help": ["--help"],
+        "status": ["status", str(book)],
+        "list": ["list", str(root)],
+    }
+
+    for label, command in commands.items():
+        runs = [_run(command) for _ in range(args.runs)]
+        wall = statistics.median(elapsed for elapsed, _ in runs)
+        _, times = runs[-1]
+        print(f"{label}: median {wall * 1000:.0f} ms, imports {sum(times.values()) / 1000:.0f} ms")
+        for name, own in sorted(times.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+            print(f"  {own / 1000:7.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Load time, full save time and per-section save time for a large state
+(100 chapters of 20 completed sections by default).
+
+    python benchmarks/state_save.py
+    python benchmarks/state_save.py --compact
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from book_writer.models import (
+    BookState,
+    ChapterState,
+    SectionRevision,
+    SectionState,
+    SectionStatus,
+)
+from book_writer.state import StateManager
+
+WORDS = "the firm market price cost revenue margin cash flow capital".split()
+
+
+def build_state(chapters: int, sections: int) -> BookState:
+    rng = random.Random(0)
+    now = datetime.now()
+
+    def section(chapter: int, number: int) -> SectionState:
+        return SectionState(
+            section_id=f"{chapter}.{number}",
+            status=SectionStatus.COMPLETED,
+            generated_content=" ".join(rng.choices(WORDS, k=500)),
+            started_at=now,
+            completed_at=now,
+            token_count=1200,
+            prompt_tokens=900,
+            cost=0.01,
+            revisions=[
+                SectionRevision(
+                    number=n, content_hash="a" * 64, created_at=now, model="m", token_count=1
+                )
+                for n in (1, 2)
+            ],
+        )
+
+    return BookState(
+        rubric_hash="hash",
+        model="bench/model",
+        created_at=now,
+        updated_at=now,
+        chapters={
+            str(c): ChapterState(
+                chapter_id=str(c),
+                sections={f"{c}.{s}": section(c, s) for s in range(sections)},
+            )
+            for c in range(chapters)
+        },
+    )
+
+
+def timed(repeat: int, action) -> float:
+    """Mean milliseconds per call of action(i)."""
+    started = time.perf_counter()
+    for i in range(repeat):
+        action(i)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--chapters", type=int, default=100)
+    parser.add_argument("--sections", type=int, default=20)
+    parser.add_argument("--compact", action="store_true")
+    args = parser.parse_args()
+
+    state = build_state(args.chapters, args.sections)
+    output_dir = Path(tempfile.mkdtemp())
+    state_manager = StateManager(output_dir, compact=args.compact)
+    state_manager.save_state(state)
+    print(f"state.json: {(output_dir / 'state.json').stat().st_size:,} bytes")
+
+    print(f"load: {timed(5, lambda i: state_manager.load_state()):.1f} ms")
+    print(f"full save: {timed(5, lambda i: state_manager.save_state(state)):.1f} ms")
+
+    def update(i: int) -> None:
+        chapter_id = str(i % args.chapters)
+        state_manager.update_section(
+            state,
+            chapter_id,
+            f"{chapter_id}.3",
+            SectionStatus.COMPLETED,
+            content="new text " * 100,
+        )
+
+    print(f"update_section: {timed(20, update):.1f} ms")
+    assert state_manager.load_state().model_dump() == state.model_dump()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Write time, load time and size of a fully generated book's state in each
+storage format (plain, compact, gzip, zstd).
+
+    python benchmarks/state_storage.py
+    python benchmarks/state_storage.py --rubric books/business-literacy/rubric.md
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from book_writer.models import SectionStatus
+from book_writer.parser import parse_rubric
+from book_writer.state import StateManager
+from book_writer.storage import check_compression, find_state_file
+
+FORMATS = [(None, False), (None, True), ("gzip", False), ("gzip", True), ("zstd", True)]
+WORDS = "the firm market price cost revenue margin cash flow capital growth risk".split()
+
+
+def prose(rng: random.Random) -> str:
+    """Eight paragraphs of 120 random words."""
+    return "\n\n".join(" ".join(rng.choices(WORDS, k=120)) for _ in range(8))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rubric", type=Path, default=Path("books/business-literacy/rubric.md"))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    outline = parse_rubric(args.rubric)
+    for compression, compact in FORMATS:
+        try:
+            check_compression(compression)
+        except ValueError as e:
+            print(f"{compression}: skipped ({e})")
+            continue
+        output_dir = Path(tempfile.mkdtemp())
+        state_manager = StateManager(output_dir, compression=compression, compact=compact)
+        state = state_manager.initialize_state(outline, "bench/model", "hash")
+
+        rng = random.Random(0)
+        state_manager.update_sections(
+            state,
+            [
+                {
+                    "chapter_id": chapter_id,
+                    "section_id": section_id,
+                    "status": SectionStatus.COMPLETED,
+                    "content": prose(rng),
+                }
+                for chapter_id, chapter_state in state.chapters.items()
+                for section_id in chapter_state.sections
+            ],
+        )
+
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            state_manager.save_state(state)
+        write_ms = (time.perf_counter() - started) / args.repeat * 1000
+
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            loaded = StateManager(output_dir).load_state()
+        load_ms = (time.perf_counter() - started) / args.repeat * 1000
+        assert loaded.model_dump() == state.model_dump()
+
+        state_file = find_state_file(output_dir)
+        print(
+            f"{compression or 'none':5} compact={compact!s:5} write {write_ms:6.1f} ms "
+            f"load {load_ms:6.1f} ms {state_file.stat().st_size:>10,} bytes {state_file.name}"
+        )
+
+
+if __name__ == "__main__":
+    main()
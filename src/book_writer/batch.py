@@ -0,0 +1,155 @@
+"""Batch backends for bulk, non-interactive section generation."""
+
+import asyncio
+import tempfile
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from pydantic import BaseModel
+
+from .models import GenerationResult
+
+
+class BatchRequest(BaseModel):
+    """A single prompt submitted as part of a batch job."""
+
+    custom_id: str  # "<chapter_id>:<section_id>"
+    model: str
+    messages: list[dict[str, Any]]
+
+
+class BatchResult(BaseModel):
+    """Outcome of a single batch request."""
+
+    custom_id: str
+    result: Optional[GenerationResult] = None
+    error: Optional[str] = None
+
+
+class BatchError(Exception):
+    """Error submitting or reading a batch job."""
+
+    pass
+
+
+class BatchBackend(ABC):
+    """Interface for bulk job backends used by BookGenerator.generate_book_batch."""
+
+    @abstractmethod
+    async def submit(self, requests: list[BatchRequest]) -> str:
+        """Submit requests as one job and return its job id."""
+
+    @abstractmethod
+    async def poll(self, job_id: str) -> bool:
+        """Return True once the job has finished."""
+
+    @abstractmethod
+    async def fetch_results(self, job_id: str) -> list[BatchResult]:
+        """Return the results of a finished job."""
+
+
+BatchWorker = Callable[[BatchRequest], Awaitable[GenerationResult]]
+
+
+class FileBatchBackend(BatchBackend):
+    """
+    Local file-based batch backend.
+
+    Each job is a directory holding requests.jsonl; the job is finished once
+    results.jsonl appears next to it. Results are written either by an
+    external process or, if a worker is given, by running the worker over
+    the requests on the first poll.
+    """
+
+    def __init__(
+        self,
+        batch_dir: Path,
+        worker: Optional[BatchWorker] = None,
+        max_concurrent: int = 5,
+    ):
+        self.batch_dir = batch_dir
+        self.worker = worker
+        self.max_concurrent = max_concurrent
+        self.batch_dir.mkdir(parents=True, exist_ok=True)
+
+    def _job_dir(self, job_id: str) -> Path:
+        return self.batch_dir / job_id
+
+    async def submit(self, requests: list[BatchRequest]) -> str:
+        """Write requests.jsonl into a new job directory."""
+        job_id = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        job_dir = self._job_dir(job_id)
+        job_dir.mkdir(parents=True)
+
+        lines = [request.model_dump_json() for request in requests]
+        (job_dir / "requests.jsonl").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return job_id
+
+    async def poll(self, job_id: str) -> bool:
+        """Check for results.jsonl, running the worker if one is configured."""
+        job_dir = self._job_dir(job_id)
+        if not job_dir.exists():
+            raise BatchError(f"Unknown batch job: {job_id}")
+
+        if (job_dir / "results.jsonl").exists():
+            return True
+
+        if self.worker is None:
+            return False
+
+        await self._run_worker(job_dir, self.worker)
+        return True
+
+    async def fetch_results(self, job_id: str) -> list[BatchResult]:
+        """Read results.jsonl for a finished job."""
+        results_file = self._job_dir(job_id) / "results.jsonl"
+        if not results_file.exists():
+            raise BatchError(f"Batch job {job_id} has no results yet")
+
+        results = []
+        for line in results_file.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                results.append(BatchResult.model_validate_json(line))
+        return results
+
+    async def _run_worker(self, job_dir: Path, worker: BatchWorker) -> None:
+        """Fulfil a job locally and write results.jsonl atomically."""
+        requests = [
+            BatchRequest.model_validate_json(line)
+            for line in (job_dir / "requests.jsonl").read_text(encoding="utf-8").splitlines()
+            if line.strip()
+        ]
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async def run_one(request: BatchRequest) -> BatchResult:
+            async with semaphore:
+                try:
+                    result = await worker(request)
+                    return BatchResult(custom_id=request.custom_id, result=result)
+                except Exception as e:
+                    return BatchResult(custom_id=request.custom_id, error=str(e))
+
+        results = await asyncio.gather(*(run_one(r) for r in requests))
+
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            dir=job_dir,
+            delete=False,
+            suffix=".jsonl",
+            encoding="utf-8",
+        ) as f:
+            for result in results:
+                f.write(result.model_dump_json() + "\n")
+            temp_path = Path(f.name)
+
+        temp_path.rename(job_dir / "results.jsonl")
+
+
+def parse_custom_id(custom_id: str) -> tuple[str, str]:
+    """Split a batch custom id into (chapter_id, section_id)."""
+    chapter_id, _, section_id = custom_id.partition(":")
+    if not section_id:
+        raise BatchError(f"Malformed batch custom_id: {custom_id}")
+    return chapter_id, section_id
@@ -0,0 +1,171 @@
+"""Token and cost budgets with admission control for section generation."""
+
+from typing import Any, Optional
+
+from .models import (
+    BookOutline,
+    BookState,
+    GenerationConfig,
+    SectionStatus,
+    TokenUsage,
+)
+from .prompts import ChapterPromptBuilder
+from .state import StateManager
+from .tokens import count_message_tokens
+
+
+def expected_completion_tokens(state: Optional[BookState], default: int) -> int:
+    """Average size of completed sections in state, or the default."""
+    if state is None:
+        return default
+
+    sizes = [
+        section.token_count - (section.prompt_tokens or 0)
+        for chapter in state.chapters.values()
+        for section in chapter.sections.values()
+        if section.status == SectionStatus.COMPLETED
+        and section.token_count
+        and section.prompt_tokens
+    ]
+    if not sizes:
+        return default
+    return sum(sizes) // len(sizes)
+
+
+def estimate_book(
+    outline: BookOutline,
+    state: Optional[BookState],
+    completion_tokens: int,
+    model: Optional[str] = None,
+    state_manager: Optional[StateManager] = None,
+) -> dict[str, Any]:
+    """
+    Preflight token estimate for generating the book from its outline.
+
+    Prompts are built as they would be at generation time, using the actual
+    text of already generated sections and counting completion_tokens for
+    each not yet written one, so quadratic context growth is captured.
+    Pass the state_manager so prose kept on disk (low_memory) is read.
+    Returns totals for the whole book and for the remaining work.
+    """
+    chapters = [outline.preface] if outline.preface else []
+    chapters += outline.chapters + outline.appendices
+
+    estimate = {
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "remaining_prompt_tokens": 0,
+        "remaining_completion_tokens": 0,
+        "remaining_sections": 0,
+    }
+
+    for chapter in chapters:
+        chapter_state = state.chapters.get(chapter.id) if state else None
+        builder = ChapterPromptBuilder(chapter, outline.title)
+        placeholders = 0  # Previous sections not written yet
+
+        for section in chapter.sections:
+            section_state = chapter_state.sections.get(section.id) if chapter_state else None
+            done = section_state is not None and section_state.status == SectionStatus.COMPLETED
+
+            messages = builder.build(section)
+            prompt_tokens = count_message_tokens(messages, model)
+            prompt_tokens += placeholders * completion_tokens
+
+            estimate["prompt_tokens"] += prompt_tokens
+            estimate["completion_tokens"] += completion_tokens
+            if not done:
+                estimate["remaining_prompt_tokens"] += prompt_tokens
+                estimate["remaining_completion_tokens"] += completion_tokens
+                estimate["remaining_sections"] += 1
+
+            content = None
+            if done and section_state is not None:
+                content = (
+                    state_manager.get_section_content(section_state)
+                    if state_manager
+                    else section_state.generated_content
+                )
+            builder.add_section(section.title, content or "")
+            if not content:
+                placeholders += 1
+
+    estimate["total_tokens"] = estimate["prompt_tokens"] + estimate["completion_tokens"]
+    estimate["remaining_tokens"] = (
+        estimate["remaining_prompt_tokens"] + estimate["remaining_completion_tokens"]
+    )
+    return estimate
+
+
+class BudgetGovernor:
+    """
+    Admission control against per-run and per-book token/cost budgets.
+
+    Each section reserves its estimated tokens before it starts; the
+    reservation is replaced by actual usage when it finishes. Sections that
+    would not fit are refused and stay PENDING for a later resume.
+    """
+
+    def __init__(self, config: GenerationConfig, state: BookState):
+        self.config = config
+        self.book_tokens_before = state.tokens_used
+        self.book_cost_before = state.cost_used
+        self.run_tokens = 0
+        self.run_cost = 0.0
+        self.reserved_tokens = 0
+        self.refused = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any budget is configured."""
+        config = self.config
+        return any(
+            limit is not None
+            for limit in (
+                config.run_token_budget,
+                config.run_cost_budget,
+                config.book_token_budget,
+                config.book_cost_budget,
+            )
+        )
+
+    def try_admit(self, estimated_tokens: int) -> bool:
+        """Reserve tokens for a section. Returns False if a budget would be exceeded."""
+        committed = self.run_tokens + self.reserved_tokens + estimated_tokens
+        config = self.config
+
+        exceeded = (
+            (config.run_token_budget is not None and committed > config.run_token_budget)
+            or (
+                config.book_token_budget is not None
+                and self.book_tokens_before + committed > config.book_token_budget
+            )
+            or (config.run_cost_budget is not None and self.run_cost >= config.run_cost_budget)
+            or (
+                config.book_cost_budget is not None
+                and self.book_cost_before + self.run_cost >= config.book_cost_budget
+            )
+        )
+        if exceeded:
+            self.refused += 1
+            return False
+
+        self.reserved_tokens += estimated_tokens
+        return True
+
+    def record(self, reserved_tokens: int, usage: Optional[TokenUsage] = None) -> None:
+        """Release a reservation and add the actual usage, if any."""
+        self.reserved_tokens = max(0, self.reserved_tokens - reserved_tokens)
+        if usage is not None:
+            self.run_tokens += usage.total_tokens
+            self.run_cost += usage.cost
+
+    def summary(self) -> dict[str, Any]:
+        """Get usage counters for this run."""
+        return {
+            "run_tokens": self.run_tokens,
+            "run_cost": self.run_cost,
+            "book_tokens": self.book_tokens_before + self.run_tokens,
+            "book_cost": self.book_cost_before + self.run_cost,
+            "refused": self.refused,
+        }
@@ -0,0 +1,78 @@
+"""Scoring of candidate section drafts for quality-gated generation."""
+
+import json
+import re
+from typing import Optional
+
+from .models import SectionOutline
+
+# Drafts shorter than this many words lose length credit
+MIN_SECTION_WORDS = 300
+
+REFUSAL_MARKERS = (
+    "i can't help",
+    "i cannot help",
+    "i'm unable to",
+    "as an ai",
+    "i apologize, but",
+)
+
+STOPWORDS = frozenset(
+    "about after again against because before being between could doing during "
+    "every first other should their there these those through under until which "
+    "while where would without your".split()
+)
+
+_WORD_RE = re.compile(r"[a-z][a-z'-]{4,}")
+
+
+def outline_terms(outline: str) -> set[str]:
+    """Distinctive words from a section outline (five letters or longer)."""
+    return {word for word in _WORD_RE.findall(outline.lower()) if word not in STOPWORDS}
+
+
+def score_candidate(
+    content: str,
+    section: SectionOutline,
+    finish_reason: Optional[str] = None,
+) -> float:
+    """
+    Cheap local quality score in [0, 1].
+
+    Rewards coverage of the outline's vocabulary and a reasonable length;
+    penalises truncated output, refusals and a repeated section heading.
+    """
+    text = content.lower()
+    terms = outline_terms(section.outline_content)
+    coverage = sum(1 for term in terms if term in text) / len(terms) if terms else 1.0
+    length = min(1.0, len(content.split()) / MIN_SECTION_WORDS)
+
+    score = 0.6 * coverage + 0.4 * length
+    if finish_reason == "length":
+        score -= 0.3
+    if any(marker in text[:500] for marker in REFUSAL_MARKERS):
+        score -= 0.5
+    if content.lstrip().startswith("#") and section.title.lower() in text[:200]:
+        score -= 0.1
+
+    return max(0.0, min(1.0, score))
+
+
+def parse_judge_scores(response: str, count: int) -> Optional[list[float]]:
+    """
+    Read {"scores": [...]} from a judge response, normalised to [0, 1].
+    Returns None if the response does not hold exactly count scores.
+    """
+    match = re.search(r"\{.*\}", response, re.DOTALL)
+    if not match:
+        return None
+
+    try:
+        scores = json.loads(match.group(0)).get("scores")
+        scores = [float(score) for score in scores]
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+    if len(scores) != count:
+        return None
+    return [max(0.0, min(1.0, score / 10)) for score in scores]
@@ -1,29 +1,148 @@
 """CLI interface for the book writer application."""
 
-import asyncio
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional, cast
 
 import click
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
-
-from .config import (
-    ensure_output_directory,
-    get_api_key,
-    get_generation_config,
-    load_book_config,
-    save_book_config,
-    validate_book_directory,
-)
-from .generator import BookGenerator, combine_chapters
-from .models import BookConfig, ChapterStatus, SectionStatus
-from .openrouter import OpenRouterClient
-from .parser import compute_rubric_hash, parse_rubric
-from .state import StateManager
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from .budget import BudgetGovernor
+    from .hedging import HedgeStats
+    from .models import BookState
+    from .state import StateManager
+
+# Commands import their dependencies lazily so that lightweight commands
+# like `status` and `list` don't pay for httpx, the generator stack, etc.
+
+
+class _LazyConsole:
+    """Proxy that defers importing rich until the console is first used."""
+
+    _console: Optional["Console"] = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
+        return getattr(self._console, name)
+
+
+# Typed as the Console it stands in for, so calls are checked against rich
+console = cast("Console", _LazyConsole())
+
+
+def _print_budget_summary(budget: Optional["BudgetGovernor"]) -> None:
+    """Print token/cost usage if a budget governed the run."""
+    if budget is None:
+        return
+    usage = budget.summary()
+    console.print(
+        f"  Tokens this run: {usage['run_tokens']} (book total {usage['book_tokens']}), "
+        f"cost ${usage['run_cost']:.4f}"
+    )
+    if usage["refused"]:
+        console.print(
+            "  [yellow]Budget reached; remaining sections left pending. "
+            "Run 'bookwriter resume' to continue.[/yellow]"
+        )
+
+
+def _print_hedge_summary(hedge_stats: "HedgeStats") -> None:
+    """Print hedge counters if any hedge requests were fired."""
+    if hedge_stats.fired == 0:
+        return
+    console.print(
+        f"  Hedges fired: {hedge_stats.fired}/{hedge_stats.budget} "
+        f"(won {hedge_stats.wins}, {hedge_stats.hedge_tokens} extra tokens)"
+    )
+
+
+def _make_progress_callback(show_chapters: bool = False) -> Callable[..., None]:
+    """Progress callback printing section events, and chapter events if asked."""
+
+    def progress_callback(
+        ch_id: str, sec_id: Optional[str], status: str, message: Optional[str] = None
+    ) -> None:
+        if sec_id:
+            if status == "generating":
+                console.print(f"  [cyan]Generating {ch_id}.{sec_id}...[/cyan]")
+            elif status == "completed":
+                console.print(f"  [green]Completed {ch_id}.{sec_id}[/green]")
+            elif status == "failed":
+                console.print(f"  [red]Failed {ch_id}.{sec_id}: {message}[/red]")
+            elif status == "budget_exhausted":
+                console.print(f"  [yellow]Deferred {ch_id}.{sec_id}: {message}[/yellow]")
+            elif status == "truncated":
+                console.print(f"  [yellow]Truncated {ch_id}.{sec_id}: {message}[/yellow]")
+            elif status == "invalid":
+                console.print(f"  [yellow]Rejected {ch_id}.{sec_id}, retrying: {message}[/yellow]")
+            elif status == "repeats":
+                console.print(f"  [dim]{ch_id}.{sec_id} repeats other chapters: {message}[/dim]")
+        elif show_chapters:
+            if status == "started":
+                console.print(f"[blue]Starting chapter {ch_id}[/blue]")
+            elif status == "chapter_completed":
+                console.print(f"[green]Completed chapter {ch_id}[/green]")
+            elif status == "chapter_stopped":
+                console.print(f"[yellow]Stopped chapter {ch_id}: {message}[/yellow]")
+            elif status == "scheduled":
+                console.print(f"  [dim]Chapter {ch_id}: {message}[/dim]")
+
+    return progress_callback
+
+
+def _load_summary(output_dir: Path) -> Optional[dict[str, Any]]:
+    """Read the progress summary, falling back to a full state load if stale."""
+    from .storage import find_state_file
+    from .summary import read_summary
+
+    summary = read_summary(output_dir)
+    if summary is None and find_state_file(output_dir) is not None:
+        from .state import StateManager
+
+        summary = StateManager(output_dir).load_summary()
+    return summary
+
+
+def _parse_chapter_values(
+    values: tuple[str, ...], convert: Callable[[str], Any]
+) -> dict[str, Any]:
+    """Parse repeated CHAPTER=VALUE options into a dict."""
+    parsed = {}
+    for item in values:
+        chapter_id, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Expected CHAPTER=VALUE, got '{item}'")
+        try:
+            parsed[chapter_id.strip()] = convert(value.strip())
+        except ValueError as e:
+            raise ValueError(f"Invalid value for chapter {chapter_id}: {e}") from e
+    return parsed
+
+
+def _find_section_chapter(state: "BookState", section_id: str) -> Optional[str]:
+    """Return the id of the chapter holding section_id in state."""
+    for chapter_id, chapter_state in state.chapters.items():
+        if section_id in chapter_state.sections:
+            return chapter_id
+    return None
+
+
+def _book_state_manager(book_path: Path) -> "StateManager":
+    """StateManager using the storage settings in the book's config.yaml."""
+    from .config import load_book_config
+    from .state import StateManager
+
+    book_config = load_book_config(book_path)
+    return StateManager(
+        book_path / "output",
+        low_memory=book_config.low_memory,
+        compression=book_config.state_compression,
+        compact=book_config.compact_state,
+    )
 
 
 @click.group()
@@ -39,6 +158,9 @@ def cli():
 @click.option("--model", "-m", default="anthropic/claude-sonnet-4", help="LLM model to use")
 def init(book_dir: str, title: str, model: str):
     """Initialize a new book project."""
+    from .config import save_book_config
+    from .models import BookConfig
+
     book_path = Path(book_dir)
 
     if book_path.exists():
@@ -83,13 +205,71 @@ def init(book_dir: str, title: str, model: str):
 @click.option("--chapters", "-c", help="Comma-separated chapter numbers to generate")
 @click.option("--model", "-m", help="Override model from config")
 @click.option("--max-concurrent", type=int, help="Max concurrent chapters")
+@click.option("--token-budget", type=int, help="Token budget for this run")
+@click.option("--max-cost", type=float, help="Cost budget (credits) for this run")
+@click.option(
+    "--executor",
+    type=click.Choice(["async", "batch"]),
+    default="async",
+    help="Per-request generation or bulk batch jobs",
+)
+@click.option(
+    "--poll-interval", type=float, default=30.0, help="Seconds between batch job polls"
+)
+@click.option(
+    "--low-memory", is_flag=True, help="Keep generated prose on disk instead of in state"
+)
+@click.option(
+    "--schedule",
+    type=click.Choice(["order", "priority", "shortest", "deadline"]),
+    help="Chapter scheduling policy (default: from config, else by targets given)",
+)
+@click.option(
+    "--priority",
+    "priorities",
+    multiple=True,
+    help="Chapter priority as CHAPTER=N, higher first (repeatable)",
+)
+@click.option(
+    "--deadline",
+    "deadlines",
+    multiple=True,
+    help="Chapter deadline as CHAPTER=YYYY-MM-DDTHH:MM (repeatable)",
+)
+@click.option("--candidates", type=int, help="Drafts to sample per section, best one kept")
+@click.option("--judge-model", help="Model that scores candidate drafts (default: local heuristic)")
 def generate(
     book_dir: str,
     chapters: Optional[str],
     model: Optional[str],
     max_concurrent: Optional[int],
+    executor: str,
+    poll_interval: float,
+    low_memory: bool,
+    schedule: Optional[str],
+    priorities: tuple[str, ...],
+    deadlines: tuple[str, ...],
+    token_budget: Optional[int],
+    max_cost: Optional[float],
+    candidates: Optional[int],
+    judge_model: Optional[str],
 ):
     """Generate book content from the rubric outline."""
+    import asyncio
+    from datetime import datetime
+
+    from .budget import estimate_book, expected_completion_tokens
+    from .config import (
+        ensure_output_directory,
+        get_api_key,
+        get_generation_config,
+        validate_book_directory,
+    )
+    from .generator import BookGenerator
+    from .openrouter import OpenRouterClient
+    from .parser import compute_rubric_hash, parse_rubric
+    from .state import StateManager
+
     book_path = Path(book_dir)
 
     try:
@@ -110,11 +290,23 @@ def generate(
         console.print(f"[red]{e}[/red]")
         return
 
-    gen_config = get_generation_config(
-        book_path,
-        model_override=model,
-        max_concurrent_override=max_concurrent,
-    )
+    try:
+        gen_config = get_generation_config(
+            book_path,
+            model_override=model,
+            max_concurrent_override=max_concurrent,
+            low_memory_override=low_memory,
+            schedule_override=schedule,
+            priorities_override=_parse_chapter_values(priorities, int),
+            deadlines_override=_parse_chapter_values(deadlines, datetime.fromisoformat),
+            run_token_budget=token_budget,
+            run_cost_budget=max_cost,
+            candidates_override=candidates,
+            judge_model_override=judge_model,
+        )
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
 
     # Parse rubric
     rubric_path = book_path / "rubric.md"
@@ -124,10 +316,24 @@ def generate(
     console.print(f"[blue]Book: {outline.title}[/blue]")
     console.print(f"[blue]Model: {gen_config.model}[/blue]")
     console.print(f"[blue]Chapters: {len(outline.chapters)}[/blue]")
+    if gen_config.candidates > 1:
+        scorer = gen_config.judge_model or "local heuristic"
+        console.print(
+            f"[blue]Candidates: {gen_config.candidates} per section, scored by {scorer}[/blue]"
+        )
+        if executor == "batch":
+            console.print(
+                "[yellow]Candidate sampling applies to the async executor only[/yellow]"
+            )
 
     # Setup state
     output_dir = ensure_output_directory(book_path)
-    state_manager = StateManager(output_dir)
+    state_manager = StateManager(
+        output_dir,
+        low_memory=gen_config.low_memory,
+        compression=gen_config.state_compression,
+        compact=gen_config.compact_state,
+    )
 
     state = state_manager.load_state()
 
@@ -139,22 +345,34 @@ def generate(
     else:
         console.print("[green]Resuming from existing state[/green]")
 
-    # Progress tracking
-    def progress_callback(ch_id, sec_id, status, message=None):
-        if sec_id:
-            if status == "generating":
-                console.print(f"  [cyan]Generating {ch_id}.{sec_id}...[/cyan]")
-            elif status == "completed":
-                console.print(f"  [green]Completed {ch_id}.{sec_id}[/green]")
-            elif status == "failed":
-                console.print(f"  [red]Failed {ch_id}.{sec_id}: {message}[/red]")
-        else:
-            if status == "started":
-                console.print(f"[blue]Starting chapter {ch_id}[/blue]")
-            elif status == "chapter_completed":
-                console.print(f"[green]Completed chapter {ch_id}[/green]")
-            elif status == "chapter_stopped":
-                console.print(f"[yellow]Stopped chapter {ch_id}: {message}[/yellow]")
+    # Preflight token estimate from the outline
+    estimate = estimate_book(
+        outline,
+        state,
+        expected_completion_tokens(state, gen_config.expected_section_tokens),
+        model=gen_config.model,
+        state_manager=state_manager,
+    )
+    console.print(
+        f"[blue]Estimated tokens: ~{estimate['remaining_tokens']:,} for "
+        f"{estimate['remaining_sections']} remaining sections "
+        f"(~{estimate['total_tokens']:,} for the whole book)[/blue]"
+    )
+    token_budgets = [
+        limit - used
+        for limit, used in (
+            (gen_config.run_token_budget, 0),
+            (gen_config.book_token_budget, state.tokens_used),
+        )
+        if limit is not None
+    ]
+    if token_budgets and estimate["remaining_tokens"] > min(token_budgets):
+        console.print(
+            f"[yellow]Estimate exceeds the remaining token budget ({min(token_budgets):,}); "
+            "generation will stop when it is reached[/yellow]"
+        )
+
+    progress_callback = _make_progress_callback(show_chapters=True)
 
     # Run generation
     async def run():
@@ -167,10 +385,25 @@ def generate(
                 output_dir=output_dir,
                 progress_callback=progress_callback,
             )
-            return await generator.generate_book(state, chapter_list)
+            if executor == "batch":
+                from .batch import FileBatchBackend
+
+                backend = FileBatchBackend(
+                    output_dir / "batches",
+                    worker=lambda request: client.generate_result(
+                        request.messages, request.model
+                    ),
+                    max_concurrent=gen_config.max_concurrent_chapters,
+                )
+                final = await generator.generate_book_batch(
+                    state, backend, chapter_list, poll_interval=poll_interval
+                )
+            else:
+                final = await generator.generate_book(state, chapter_list)
+            return final, client.hedge_stats, generator.budget
 
     console.print("\n[bold]Starting generation...[/bold]\n")
-    final_state = asyncio.run(run())
+    final_state, hedge_stats, budget = asyncio.run(run())
 
     # Show summary
     progress = state_manager.get_overall_progress(final_state)
@@ -179,23 +412,39 @@ def generate(
     if progress["failed"] > 0:
         console.print(f"  [red]Sections failed: {progress['failed']}[/red]")
         console.print("  Run 'bookwriter resume' to retry failed sections")
+    _print_hedge_summary(hedge_stats)
+    _print_budget_summary(budget)
 
 
 @cli.command()
 @click.argument("book_dir", type=click.Path(exists=True), required=True)
 @click.option("--chapters", "-c", help="Comma-separated chapter numbers to retry")
-def resume(book_dir: str, chapters: Optional[str]):
+@click.option("--token-budget", type=int, help="Token budget for this run")
+@click.option("--max-cost", type=float, help="Cost budget (credits) for this run")
+def resume(
+    book_dir: str,
+    chapters: Optional[str],
+    token_budget: Optional[int],
+    max_cost: Optional[float],
+):
     """Resume generation of failed/incomplete sections."""
+    import asyncio
+
+    from .config import get_api_key, get_generation_config, validate_book_directory
+    from .generator import BookGenerator
+    from .openrouter import OpenRouterClient
+    from .parser import parse_rubric
+
     book_path = Path(book_dir)
 
     try:
         validate_book_directory(book_path)
+        state_manager = _book_state_manager(book_path)
     except ValueError as e:
         console.print(f"[red]{e}[/red]")
         return
 
     output_dir = book_path / "output"
-    state_manager = StateManager(output_dir)
     state = state_manager.load_state()
 
     if state is None:
@@ -233,21 +482,19 @@ def resume(book_dir: str, chapters: Optional[str]):
         console.print(f"[red]{e}[/red]")
         return
 
-    gen_config = get_generation_config(book_path)
+    try:
+        gen_config = get_generation_config(
+            book_path, run_token_budget=token_budget, run_cost_budget=max_cost
+        )
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
 
     # Parse rubric
     rubric_path = book_path / "rubric.md"
     outline = parse_rubric(rubric_path)
 
-    # Progress tracking
-    def progress_callback(ch_id, sec_id, status, message=None):
-        if sec_id:
-            if status == "generating":
-                console.print(f"  [cyan]Generating {ch_id}.{sec_id}...[/cyan]")
-            elif status == "completed":
-                console.print(f"  [green]Completed {ch_id}.{sec_id}[/green]")
-            elif status == "failed":
-                console.print(f"  [red]Failed {ch_id}.{sec_id}: {message}[/red]")
+    progress_callback = _make_progress_callback()
 
     # Run generation
     async def run():
@@ -260,10 +507,11 @@ def resume(book_dir: str, chapters: Optional[str]):
                 output_dir=output_dir,
                 progress_callback=progress_callback,
             )
-            return await generator.generate_book(state, affected_chapters)
+            final = await generator.generate_book(state, affected_chapters)
+            return final, client.hedge_stats, generator.budget
 
     console.print("\n[bold]Resuming generation...[/bold]\n")
-    final_state = asyncio.run(run())
+    final_state, hedge_stats, budget = asyncio.run(run())
 
     # Show summary
     progress = state_manager.get_overall_progress(final_state)
@@ -271,27 +519,269 @@ def resume(book_dir: str, chapters: Optional[str]):
     console.print(f"  Sections completed: {progress['completed']}/{progress['total_sections']}")
     if progress["failed"] > 0:
         console.print(f"  [red]Sections still failed: {progress['failed']}[/red]")
+    _print_hedge_summary(hedge_stats)
+    _print_budget_summary(budget)
 
 
 @cli.command()
 @click.argument("book_dir", type=click.Path(exists=True), required=True)
-def status(book_dir: str):
-    """Show current generation status."""
+@click.argument("section_ids", nargs=-1, required=True)
+@click.option(
+    "--downstream/--no-downstream",
+    default=None,
+    help="Also regenerate later sections that used these as context (asks if not given)",
+)
+@click.option("--token-budget", type=int, help="Token budget for this run")
+@click.option("--max-cost", type=float, help="Cost budget (credits) for this run")
+def regenerate(
+    book_dir: str,
+    section_ids: tuple[str, ...],
+    downstream: Optional[bool],
+    token_budget: Optional[int],
+    max_cost: Optional[float],
+):
+    """Regenerate specific sections, e.g. `regenerate ./books/my-book 4.2 7.1`."""
+    import asyncio
+
+    from .config import get_api_key, get_generation_config, validate_book_directory
+    from .generator import BookGenerator
+    from .models import SectionStatus
+    from .openrouter import OpenRouterClient
+    from .parser import parse_rubric
+
     book_path = Path(book_dir)
+
+    try:
+        validate_book_directory(book_path)
+        state_manager = _book_state_manager(book_path)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+
     output_dir = book_path / "output"
-    state_manager = StateManager(output_dir)
     state = state_manager.load_state()
 
     if state is None:
+        console.print("[red]No existing state found. Run 'generate' first.[/red]")
+        return
+
+    # Group the requested sections by chapter
+    requested: dict[str, list[str]] = {}
+    for section_id in section_ids:
+        chapter_id = _find_section_chapter(state, section_id)
+        if chapter_id is None:
+            console.print(f"[red]Section {section_id} not found[/red]")
+            return
+        requested.setdefault(chapter_id, []).append(section_id)
+
+    # Later sections in the same chapter were written with these in context
+    dependents = {
+        chapter_id: state_manager.downstream_sections(state, chapter_id, ids)
+        for chapter_id, ids in requested.items()
+    }
+    dependent_ids = [section_id for ids in dependents.values() for section_id in ids]
+    if dependent_ids:
+        console.print(f"Sections written with these as context: {', '.join(dependent_ids)}")
+        if downstream is None:
+            downstream = click.confirm("Regenerate them too?", default=False)
+        if downstream:
+            for chapter_id, ids in dependents.items():
+                requested[chapter_id].extend(ids)
+
+    to_process = [
+        (chapter_id, section_id) for chapter_id, ids in requested.items() for section_id in ids
+    ]
+
+    try:
+        api_key = get_api_key()
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+
+    try:
+        gen_config = get_generation_config(
+            book_path, run_token_budget=token_budget, run_cost_budget=max_cost
+        )
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+
+    outline = parse_rubric(book_path / "rubric.md")
+    state = state_manager.requeue_sections(state, to_process)
+    # A failed regeneration keeps the old text and returns to COMPLETED, so
+    # only a fresh completion time shows the section was rewritten
+    previously_completed = {
+        (chapter_id, section_id): state.chapters[chapter_id].sections[section_id].completed_at
+        for chapter_id, section_id in to_process
+    }
+    console.print(
+        f"Regenerating {len(to_process)} sections in {len(requested)} chapters "
+        "(previous text is kept in `bookwriter history`)"
+    )
+
+    progress_callback = _make_progress_callback()
+
+    async def run():
+        async with OpenRouterClient(api_key, gen_config) as client:
+            generator = BookGenerator(
+                outline=outline,
+                client=client,
+                state_manager=state_manager,
+                config=gen_config,
+                output_dir=output_dir,
+                progress_callback=progress_callback,
+            )
+            final = await generator.generate_book(
+                state,
+                list(requested),
+                sections_to_process={section_id for _, section_id in to_process},
+            )
+            return final, client.hedge_stats, generator.budget
+
+    final_state, hedge_stats, budget = asyncio.run(run())
+
+    failed = []
+    for chapter_id, section_id in to_process:
+        section_state = final_state.chapters[chapter_id].sections[section_id]
+        if (
+            section_state.status != SectionStatus.COMPLETED
+            or section_state.completed_at == previously_completed[(chapter_id, section_id)]
+        ):
+            failed.append(section_id)
+    console.print("\n[bold]Regeneration complete![/bold]")
+    console.print(f"  Sections regenerated: {len(to_process) - len(failed)}/{len(to_process)}")
+    if failed:
+        console.print(f"  [red]Not regenerated: {', '.join(failed)}[/red]")
+    _print_hedge_summary(hedge_stats)
+    _print_budget_summary(budget)
+
+
+@cli.command()
+@click.argument("book_dir", type=click.Path(exists=True), required=True)
+@click.option("--debounce", type=float, default=1.0, help="Seconds the rubric must be stable")
+@click.option("--poll-interval", type=float, default=0.5, help="Seconds between file checks")
+def watch(book_dir: str, debounce: float, poll_interval: float):
+    """Regenerate affected sections whenever rubric.md is saved."""
+    import asyncio
+
+    from .config import (
+        ensure_output_directory,
+        get_api_key,
+        get_generation_config,
+        validate_book_directory,
+    )
+    from .generator import BookGenerator, chapter_filename, combine_chapters
+    from .openrouter import OpenRouterClient
+    from .parser import compute_content_hash, diff_outlines, parse_rubric_text, reparse_outline
+    from .state import StateManager
+    from .watch import RubricWatcher
+
+    book_path = Path(book_dir)
+
+    try:
+        validate_book_directory(book_path)
+        api_key = get_api_key()
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+
+    try:
+        gen_config = get_generation_config(book_path)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+    rubric_path = book_path / "rubric.md"
+    output_dir = ensure_output_directory(book_path)
+    state_manager = StateManager(
+        output_dir,
+        low_memory=gen_config.low_memory,
+        compression=gen_config.state_compression,
+        compact=gen_config.compact_state,
+    )
+
+    progress_callback = _make_progress_callback()
+
+    async def run():
+        watcher = RubricWatcher(rubric_path, poll_interval=poll_interval, debounce=debounce)
+        outline = parse_rubric_text(watcher.content)
+        rubric_hash = compute_content_hash(watcher.content)
+
+        state = state_manager.load_state()
+        if state is None or state_manager.should_reinitialize(state, rubric_hash):
+            if state is not None:
+                console.print("[yellow]Rubric changed, reinitializing state...[/yellow]")
+            state = state_manager.initialize_state(outline, gen_config.model, rubric_hash)
+
+        async with OpenRouterClient(api_key, gen_config) as client:
+            generator = BookGenerator(
+                outline=outline,
+                client=client,
+                state_manager=state_manager,
+                config=gen_config,
+                output_dir=output_dir,
+                progress_callback=progress_callback,
+            )
+            console.print(f"[bold]Watching {rubric_path} (Ctrl+C to stop)...[/bold]")
+
+            while True:
+                old_content, new_content = await watcher.wait_for_change()
+                try:
+                    new_outline = reparse_outline(outline, old_content, new_content)
+                    changed, removed = diff_outlines(outline, new_outline)
+                    outline = new_outline
+                    generator.set_outline(outline)
+
+                    state = state_manager.apply_outline_changes(
+                        state, outline, changed, removed, compute_content_hash(new_content)
+                    )
+                    if not changed and not removed:
+                        console.print("[dim]Rubric saved; outline unchanged[/dim]")
+                        continue
+
+                    sections = sum(len(ids) for ids in changed.values())
+                    console.print(
+                        f"[blue]Rubric changed: {sections} sections in "
+                        f"{len(changed)} chapters to regenerate[/blue]"
+                    )
+
+                    for chapter_id in removed:
+                        (output_dir / "chapters" / chapter_filename(chapter_id)).unlink(
+                            missing_ok=True
+                        )
+
+                    state = await generator.generate_book(state, list(changed))
+                    await generator.write_chapters(state, list(changed))
+                    book_md = combine_chapters(output_dir, outline)
+                    console.print(f"[green]Updated: {book_md}[/green]")
+                except Exception as e:
+                    console.print(f"[red]Watch update failed: {e}[/red]")
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Stopped watching[/yellow]")
+
+
+@cli.command()
+@click.argument("book_dir", type=click.Path(exists=True), required=True)
+def status(book_dir: str):
+    """Show current generation status."""
+    from rich.table import Table
+
+    from .config import load_book_title
+
+    book_path = Path(book_dir)
+    output_dir = book_path / "output"
+    summary = _load_summary(output_dir)
+
+    if summary is None:
         console.print("[yellow]No generation state found.[/yellow]")
         return
 
-    # Load book config for title
-    book_config = load_book_config(book_path)
-    console.print(f"\n[bold]{book_config.title}[/bold]")
-    console.print(f"Model: {state.model}")
-    console.print(f"Created: {state.created_at}")
-    console.print(f"Updated: {state.updated_at}\n")
+    console.print(f"\n[bold]{load_book_title(book_path)}[/bold]")
+    console.print(f"Model: {summary['model']}")
+    console.print(f"Created: {summary['created_at']}")
+    console.print(f"Updated: {summary['updated_at']}\n")
 
     table = Table(title="Chapter Status")
     table.add_column("Chapter", style="cyan")
@@ -313,9 +803,8 @@ def status(book_dir: str):
             except ValueError:
                 return (1, 999)
 
-    for ch_id in sorted(state.chapters.keys(), key=sort_key):
-        ch_state = state.chapters[ch_id]
-        progress = state_manager.get_chapter_progress(state, ch_id)
+    for ch_id in sorted(summary["chapters"].keys(), key=sort_key):
+        progress = summary["chapters"][ch_id]
 
         # Format chapter name
         if ch_id == "preface":
@@ -326,14 +815,14 @@ def status(book_dir: str):
             ch_name = f"Chapter {ch_id}"
 
         # Format status with color
-        status_str = ch_state.status.value
-        if ch_state.status == ChapterStatus.COMPLETED:
+        status_str = progress["status"]
+        if status_str == "completed":
             status_str = f"[green]{status_str}[/green]"
-        elif ch_state.status == ChapterStatus.FAILED:
+        elif status_str == "failed":
             status_str = f"[red]{status_str}[/red]"
-        elif ch_state.status == ChapterStatus.PARTIAL:
+        elif status_str == "partial":
             status_str = f"[yellow]{status_str}[/yellow]"
-        elif ch_state.status == ChapterStatus.IN_PROGRESS:
+        elif status_str == "in_progress":
             status_str = f"[blue]{status_str}[/blue]"
 
         table.add_row(
@@ -348,7 +837,7 @@ def status(book_dir: str):
     console.print(table)
 
     # Overall summary
-    overall = state_manager.get_overall_progress(state)
+    overall = summary["overall"]
     console.print(f"\n[bold]Overall Progress:[/bold]")
     console.print(
         f"  {overall['completed']}/{overall['total_sections']} sections completed "
@@ -356,12 +845,258 @@ def status(book_dir: str):
     )
     if overall["failed"] > 0:
         console.print(f"  [red]{overall['failed']} sections failed[/red]")
+    if overall["cached_tokens"] > 0:
+        console.print(f"  Prompt cache hits: {overall['cached_tokens']} tokens")
+
+
+@cli.command()
+@click.argument("book_dir", type=click.Path(exists=True), required=True)
+@click.option(
+    "--threshold", type=float, default=0.5, help="Paragraph similarity to report (0-1)"
+)
+@click.option("--limit", type=int, default=50, help="Maximum pairs to show")
+def dedupe(book_dir: str, threshold: float, limit: int):
+    """Report near-duplicate paragraphs across sections of the book."""
+    from rich.markup import escape
+    from rich.table import Table
+
+    from .dedupe import DedupeIndex
+
+    output_dir = Path(book_dir) / "output"
+    state_manager = _book_state_manager(Path(book_dir))
+    state = state_manager.load_state()
+    if state is None:
+        console.print("[yellow]No generation state found.[/yellow]")
+        return
+
+    index = DedupeIndex(output_dir)
+    changed = index.sync(state, state_manager.get_section_content)
+    if changed:
+        index.save()
+        console.print(f"[blue]Indexed {changed} changed sections[/blue]")
+
+    pairs = index.duplicates(threshold)
+    if not pairs:
+        console.print(f"[green]No paragraphs above {threshold:.0%} similarity[/green]")
+        return
+
+    table = Table(title=f"Near-duplicate paragraphs ({len(pairs)} pairs)")
+    table.add_column("Similarity", justify="right", style="magenta")
+    table.add_column("Section", style="cyan")
+    table.add_column("Paragraph")
+    table.add_column("Repeated in", style="cyan")
+    table.add_column("Paragraph")
+
+    for source, match in pairs[:limit]:
+        table.add_row(
+            f"{match.similarity:.0%}",
+            source.section_id,
+            escape(source.snippet),
+            match.section_id,
+            escape(match.snippet),
+        )
+
+    console.print(table)
+    if len(pairs) > limit:
+        console.print(f"  ... and {len(pairs) - limit} more")
+
+
+@cli.command()
+@click.argument("book_dir", type=click.Path(exists=True), required=True)
+@click.argument("section_id")
+@click.option(
+    "--diff",
+    "diff_range",
+    nargs=2,
+    type=int,
+    help="Show the changes between two revisions, e.g. --diff 1 3",
+)
+@click.option("--show", type=int, help="Print the text of one revision")
+def history(
+    book_dir: str,
+    section_id: str,
+    diff_range: Optional[tuple[int, int]],
+    show: Optional[int],
+):
+    """List a section's revisions, or show/diff them."""
+    from rich.markup import escape
+    from rich.table import Table
+
+    from .revisions import diff_revisions
+
+    state_manager = _book_state_manager(Path(book_dir))
+    state = state_manager.load_state()
+    if state is None:
+        console.print("[yellow]No generation state found.[/yellow]")
+        return
+
+    chapter_id = _find_section_chapter(state, section_id)
+    if chapter_id is None:
+        console.print(f"[red]Section {section_id} not found[/red]")
+        raise SystemExit(1)
+    section_state = state.chapters[chapter_id].sections[section_id]
+
+    try:
+        if show is not None:
+            click.echo(state_manager.get_revision_content(section_state, show))
+            return
+        if diff_range:
+            old, new = diff_range
+            diff = diff_revisions(
+                state_manager.get_revision_content(section_state, old),
+                state_manager.get_revision_content(section_state, new),
+                f"{section_id} revision {old}",
+                f"{section_id} revision {new}",
+            )
+            click.echo(diff or "No differences")
+            return
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise SystemExit(1)
+
+    if not section_state.revisions:
+        console.print(f"[yellow]Section {section_id} has no revisions yet[/yellow]")
+        return
+
+    current_hash = state_manager.revisions.content_hash(
+        state_manager.get_section_content(section_state) or ""
+    )
+    current = max(
+        (r.number for r in section_state.revisions if r.content_hash == current_hash),
+        default=None,
+    )
+    table = Table(title=f"Revisions of section {section_id}")
+    table.add_column("#", justify="right", style="cyan")
+    table.add_column("Created")
+    table.add_column("Model", style="magenta")
+    table.add_column("Tokens", justify="right")
+    table.add_column("Cost", justify="right")
+    table.add_column("Prompt")
+    table.add_column("Note")
+
+    for revision in section_state.revisions:
+        notes = []
+        if revision.number == current:
+            notes.append("[green]current[/green]")
+        if revision.reverted_from:
+            notes.append(f"revert of {revision.reverted_from}")
+        table.add_row(
+            str(revision.number),
+            f"{revision.created_at:%Y-%m-%d %H:%M}",
+            escape(revision.model or "-"),
+            str(revision.token_count or "-"),
+            f"{revision.cost:.4f}" if revision.cost else "-",
+            revision.prompt_hash or "-",
+            ", ".join(notes),
+        )
+
+    console.print(table)
+
+
+@cli.command()
+@click.argument("book_dir", type=click.Path(exists=True), required=True)
+@click.argument("section_id")
+@click.argument("revision", type=int)
+def revert(book_dir: str, section_id: str, revision: int):
+    """Make an earlier revision a section's current content."""
+    from .generator import write_chapter_file
+    from .models import ChapterStatus
+    from .parser import parse_rubric
+
+    book_path = Path(book_dir)
+    output_dir = book_path / "output"
+    state_manager = _book_state_manager(book_path)
+    state = state_manager.load_state()
+    if state is None:
+        console.print("[yellow]No generation state found.[/yellow]")
+        return
+
+    chapter_id = _find_section_chapter(state, section_id)
+    if chapter_id is None:
+        console.print(f"[red]Section {section_id} not found[/red]")
+        raise SystemExit(1)
+
+    try:
+        state = state_manager.revert_section(state, chapter_id, section_id, revision)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise SystemExit(1)
+    console.print(f"[green]Section {section_id} reverted to revision {revision}[/green]")
+
+    # Refresh the chapter file so combine/convert pick up the change
+    rubric_path = book_path / "rubric.md"
+    if rubric_path.exists():
+        outline = parse_rubric(rubric_path)
+        for chapter in [outline.preface, *outline.chapters, *outline.appendices]:
+            if chapter is not None and chapter.id == chapter_id:
+                chapter_state = state.chapters[chapter_id]
+                path = write_chapter_file(
+                    output_dir,
+                    chapter,
+                    chapter_state,
+                    state_manager,
+                    partial=chapter_state.status != ChapterStatus.COMPLETED,
+                )
+                console.print(f"[green]Updated: {path}[/green]")
+
+
+@cli.command()
+@click.argument("path", type=click.Path(exists=True), required=True)
+@click.argument("query")
+@click.option("--limit", type=int, default=20, help="Maximum matches to show")
+@click.option("--reindex", is_flag=True, help="Rebuild the index from state before searching")
+def search(path: str, query: str, limit: int, reindex: bool):
+    """Search generated sections of a book, or of every book in a directory."""
+    from rich.markup import escape
+    from rich.table import Table
+
+    from .search import search_books
+    from .state import StateManager
+
+    search_path = Path(path)
+    single_book = (search_path / "rubric.md").exists()
+    book_dirs = [search_path] if single_book else sorted(
+        book_dir for book_dir in search_path.iterdir() if (book_dir / "rubric.md").exists()
+    )
+
+    # Books generated before the index existed are indexed on first search
+    for book_dir in book_dirs:
+        state_manager = StateManager(book_dir / "output")
+        if state_manager.search.path.exists() and not reindex:
+            continue
+        state = state_manager.load_state()
+        if state is not None:
+            changed = state_manager.search.sync(state, state_manager.get_section_content)
+            if changed:
+                console.print(f"[blue]Indexed {changed} sections of {book_dir.name}[/blue]")
+        state_manager.search.close()
+
+    hits = search_books(book_dirs, query, limit)
+    if not hits:
+        console.print(f"[yellow]No matches for {query!r}[/yellow]")
+        return
+
+    table = Table(title=f"Matches for {query!r}")
+    if not single_book:
+        table.add_column("Book", style="magenta")
+    table.add_column("Chapter", style="cyan")
+    table.add_column("Section", style="cyan")
+    table.add_column("Snippet")
+
+    for hit in hits:
+        row = [hit.chapter_id, hit.section_id, escape(hit.snippet)]
+        table.add_row(*row if single_book else [hit.book, *row])
+
+    console.print(table)
 
 
 @cli.command()
 @click.argument("book_dir", type=click.Path(exists=True), required=True)
 def combine(book_dir: str):
     """Combine all chapter files into a single book.md."""
+    from .generator import combine_chapters
+    from .parser import parse_rubric
+
     book_path = Path(book_dir)
     output_dir = book_path / "output"
 
@@ -382,18 +1117,75 @@ def combine(book_dir: str):
 @click.option(
     "--format",
     "-f",
-    type=click.Choice(["pdf", "epub", "both"]),
+    type=click.Choice(["pdf", "epub", "html", "both"]),
     default="both",
-    help="Output format",
+    help="Output format (both: PDF and EPUB with pandoc, EPUB and HTML with builtin)",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(["pandoc", "builtin"]),
+    default="pandoc",
+    help="pandoc for full fidelity, builtin for fast previews without Pandoc/LaTeX",
 )
-def convert(book_dir: str, format: str):
-    """Convert generated markdown to PDF/EPUB using Pandoc."""
-    from .converter import convert_to_epub, convert_to_pdf
+@click.option(
+    "--split",
+    is_flag=True,
+    help="Render the PDF chapter by chapter in parallel, reusing unchanged chapters",
+)
+def convert(book_dir: str, format: str, engine: str, split: bool):
+    """Convert generated markdown to PDF/EPUB/HTML."""
+    from .converter import convert_to_epub, convert_to_html, convert_to_pdf
+    from .generator import combine_chapters, list_chapter_files
+    from .parser import parse_rubric
 
     book_path = Path(book_dir)
     output_dir = book_path / "output"
     book_md = output_dir / "book.md"
 
+    if engine == "builtin":
+        from .export import export_epub, export_html
+
+        if format == "pdf":
+            console.print("[red]The builtin engine cannot build PDF; use --engine pandoc[/red]")
+            return
+        rubric_path = book_path / "rubric.md"
+        if not rubric_path.exists():
+            console.print(f"[red]Rubric not found: {rubric_path}[/red]")
+            return
+        chapter_files = list_chapter_files(output_dir)
+        if not chapter_files:
+            console.print(f"[red]No chapter files found in {output_dir}[/red]")
+            return
+
+        title = parse_rubric(rubric_path).title
+        if format in ("epub", "both"):
+            epub_path = export_epub(chapter_files, title, output_dir / "book.epub")
+            console.print(f"[green]Created: {epub_path}[/green]")
+        if format in ("html", "both"):
+            html_path = export_html(chapter_files, title, output_dir / "book.html")
+            console.print(f"[green]Created: {html_path}[/green]")
+        return
+
+    if split and format in ("pdf", "both"):
+        from .pdfsplit import build_split_pdf
+
+        rubric_path = book_path / "rubric.md"
+        if not rubric_path.exists():
+            console.print(f"[red]Rubric not found: {rubric_path}[/red]")
+            return
+        try:
+            pdf_path = build_split_pdf(
+                list_chapter_files(output_dir),
+                parse_rubric(rubric_path).title,
+                output_dir / "book.pdf",
+                progress_callback=lambda status: console.print(f"  [dim]{status}[/dim]"),
+            )
+            console.print(f"[green]Created: {pdf_path}[/green]")
+        except Exception as e:
+            console.print(f"[red]PDF conversion failed: {e}[/red]")
+        if format == "pdf":
+            return
+
     if not book_md.exists():
         # Try to combine first
         rubric_path = book_path / "rubric.md"
@@ -405,7 +1197,7 @@ def convert(book_dir: str, format: str):
         book_md = combine_chapters(output_dir, outline)
         console.print(f"[green]Combined chapters into: {book_md}[/green]")
 
-    if format in ("pdf", "both"):
+    if format in ("pdf", "both") and not split:
         try:
             pdf_path = convert_to_pdf(book_md, output_dir / "book.pdf")
             console.print(f"[green]Created: {pdf_path}[/green]")
@@ -419,11 +1211,78 @@ def convert(book_dir: str, format: str):
         except Exception as e:
             console.print(f"[red]EPUB conversion failed: {e}[/red]")
 
+    if format == "html":
+        try:
+            html_path = convert_to_html(book_md, output_dir / "book.html")
+            console.print(f"[green]Created: {html_path}[/green]")
+        except Exception as e:
+            console.print(f"[red]HTML conversion failed: {e}[/red]")
+
+
+@cli.command()
+@click.argument("book_dir", type=click.Path(exists=True), required=True)
+@click.option(
+    "--format",
+    "-f",
+    "formats",
+    type=click.Choice(["pdf", "epub", "html"]),
+    multiple=True,
+    help="Formats to build (repeatable; default: all)",
+)
+@click.option("--force", is_flag=True, help="Rebuild every stage even if its inputs are unchanged")
+@click.option(
+    "--engine",
+    type=click.Choice(["pandoc", "builtin"]),
+    default="pandoc",
+    help="builtin builds EPUB/HTML without Pandoc (default formats: epub, html)",
+)
+@click.option(
+    "--split-pdf",
+    is_flag=True,
+    help="Render the PDF chapter by chapter in parallel, reusing unchanged chapters",
+)
+def publish(book_dir: str, formats: tuple[str, ...], force: bool, engine: str, split_pdf: bool):
+    """Assemble book.md and build PDF/EPUB/HTML in parallel, skipping unchanged stages."""
+    from .parser import parse_rubric
+    from .publish import publish as run_publish
+
+    book_path = Path(book_dir)
+    output_dir = book_path / "output"
+    rubric_path = book_path / "rubric.md"
+    if not rubric_path.exists():
+        console.print(f"[red]Rubric not found: {rubric_path}[/red]")
+        return
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    def progress_callback(result):
+        if result.status == "skipped":
+            console.print(f"  [dim]{result.stage}: unchanged, skipped[/dim]")
+        elif result.status == "built":
+            console.print(f"  [green]{result.stage}: {result.path} ({result.seconds:.1f}s)[/green]")
+        else:
+            console.print(f"  [red]{result.stage} failed: {result.error}[/red]")
+
+    results = run_publish(
+        output_dir,
+        parse_rubric(rubric_path),
+        list(formats) or (["epub", "html"] if engine == "builtin" else ["pdf", "epub", "html"]),
+        force=force,
+        progress_callback=progress_callback,
+        engine=engine,
+        split_pdf=split_pdf,
+    )
+    if any(result.status == "failed" for result in results):
+        raise SystemExit(1)
+
 
 @cli.command("list")
 @click.argument("books_dir", type=click.Path(exists=True), required=True)
 def list_books(books_dir: str):
     """List all book projects in a directory."""
+    from rich.table import Table
+
+    from .config import load_book_title
+
     books_path = Path(books_dir)
 
     table = Table(title="Book Projects")
@@ -440,16 +1299,11 @@ def list_books(books_dir: str):
         if not rubric_path.exists():
             continue
 
-        # Load config
-        config = load_book_config(book_dir)
-
         # Check state
-        output_dir = book_dir / "output"
-        state_manager = StateManager(output_dir)
-        state = state_manager.load_state()
+        summary = _load_summary(book_dir / "output")
 
-        if state:
-            progress = state_manager.get_overall_progress(state)
+        if summary:
+            progress = summary["overall"]
             total = progress["total_sections"]
             completed = progress["completed"]
             pct = 100 * completed // max(1, total)
@@ -468,7 +1322,7 @@ def list_books(books_dir: str):
             status_str = "[dim]Not started[/dim]"
             progress_str = "-"
 
-        table.add_row(book_dir.name, config.title, status_str, progress_str)
+        table.add_row(book_dir.name, load_book_title(book_dir), status_str, progress_str)
 
     console.print(table)
 
@@ -1,36 +1,44 @@
 """Configuration management for the book writer application."""
 
 import os
+import re
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import yaml
-from pydantic_settings import BaseSettings
+from .storage import check_compression
 
-from .models import BookConfig, GenerationConfig
+if TYPE_CHECKING:
+    from .models import BookConfig, GenerationConfig
+    from .settings import Settings
 
+# yaml and the pydantic models cost ~150 ms to import, so they are loaded
+# inside the functions that need them; `status` and `list` only read the title
 
-class Settings(BaseSettings):
-    """Application settings loaded from environment."""
+# A top-level `title:` holding a plain or simply quoted scalar
+_TITLE_RE = re.compile(
+    r"""^title:[ \t]*(?:"([^"\\\n]*)"|'([^'\n]*)'|([^\s"'|>&!*%@`\[{#-][^\n]*?))"""
+    r"""[ \t]*(?:[ \t]#.*)?$""",
+    re.MULTILINE,
+)
+# Plain scalars that YAML reads as something other than a string
+_NON_STRINGS = {"null", "~", "true", "false", "yes", "no", "on", "off"}
 
-    openrouter_api_key: str = ""
-    default_model: str = "anthropic/claude-sonnet-4"
-    max_retries: int = 3
-    max_concurrent_chapters: int = 5
 
-    class Config:
-        env_file = ".env"
-        env_prefix = ""
-        extra = "ignore"
-
-
-def get_settings() -> Settings:
+def get_settings() -> "Settings":
     """Load and validate settings from environment."""
+    # pydantic-settings is slow to import; only pay for it when needed
+    from .settings import Settings
+
     return Settings()
 
 
-def load_book_config(book_dir: Path) -> BookConfig:
+def load_book_config(book_dir: Path) -> "BookConfig":
     """Load book-specific configuration from config.yaml if it exists."""
+    import yaml
+
+    from .models import BookConfig
+
     config_file = book_dir / "config.yaml"
 
     if config_file.exists():
@@ -43,8 +51,31 @@ def load_book_config(book_dir: Path) -> BookConfig:
     return BookConfig()
 
 
-def save_book_config(book_dir: Path, config: BookConfig) -> None:
+def load_book_title(book_dir: Path) -> str:
+    """
+    The book's title from config.yaml, without importing yaml or pydantic
+    when the title is a simple scalar. Anything else gets a full load.
+    """
+    config_file = book_dir / "config.yaml"
+    try:
+        text = config_file.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return load_book_config(book_dir).title
+
+    matches: list[tuple[str, str, str]] = _TITLE_RE.findall(text)
+    if len(matches) == 1:
+        double, single, plain = matches[0]
+        if double or single:
+            return double or single
+        if plain.lower() not in _NON_STRINGS and not plain[0].isdigit() and ": " not in plain:
+            return plain
+    return load_book_config(book_dir).title
+
+
+def save_book_config(book_dir: Path, config: "BookConfig") -> None:
     """Save book configuration to config.yaml."""
+    import yaml
+
     config_file = book_dir / "config.yaml"
 
     with open(config_file, "w", encoding="utf-8") as f:
@@ -55,7 +86,15 @@ def get_generation_config(
     book_dir: Path,
     model_override: Optional[str] = None,
     max_concurrent_override: Optional[int] = None,
-) -> GenerationConfig:
+    low_memory_override: Optional[bool] = None,
+    schedule_override: Optional[str] = None,
+    priorities_override: Optional[dict[str, int]] = None,
+    deadlines_override: Optional[dict[str, datetime]] = None,
+    run_token_budget: Optional[int] = None,
+    run_cost_budget: Optional[float] = None,
+    candidates_override: Optional[int] = None,
+    judge_model_override: Optional[str] = None,
+) -> "GenerationConfig":
     """
     Build generation config with proper priority:
     1. CLI overrides (highest)
@@ -63,12 +102,29 @@ def get_generation_config(
     3. Environment variables
     4. Defaults (lowest)
     """
+    from .models import GenerationConfig
+
     # Load from environment
     settings = get_settings()
 
     # Load book-specific config
     book_config = load_book_config(book_dir)
 
+    priorities = {**book_config.chapter_priorities, **(priorities_override or {})}
+    deadlines = {**book_config.chapter_deadlines, **(deadlines_override or {})}
+
+    from .validation import VALIDATORS
+
+    unknown = [name for name in book_config.validators if name not in VALIDATORS]
+    if unknown:
+        raise ValueError(f"Unknown validators {unknown}, expected some of {list(VALIDATORS)}")
+    check_compression(book_config.state_compression)
+
+    # Without an explicit policy, use whichever targets were given
+    schedule = schedule_override or book_config.schedule
+    if not schedule:
+        schedule = "deadline" if deadlines else "priority" if priorities else "order"
+
     # Build config with priority chain
     return GenerationConfig(
         model=model_override or book_config.model or settings.default_model,
@@ -80,6 +136,31 @@ def get_generation_config(
             or book_config.max_concurrent_chapters
             or settings.max_concurrent_chapters
         ),
+        hedge_enabled=book_config.hedging,
+        hedge_model=book_config.hedge_model,
+        hedge_budget=book_config.hedge_budget,
+        low_memory=low_memory_override or book_config.low_memory,
+        state_compression=book_config.state_compression,
+        compact_state=book_config.compact_state,
+        schedule=schedule,
+        chapter_priorities=priorities,
+        chapter_deadlines=deadlines,
+        book_token_budget=book_config.token_budget,
+        book_cost_budget=book_config.cost_budget,
+        run_token_budget=run_token_budget,
+        run_cost_budget=run_cost_budget,
+        max_tokens=book_config.max_tokens_per_section,
+        context_window=book_config.context_window,
+        candidates=candidates_override or book_config.candidates,
+        candidate_models=book_config.candidate_models,
+        candidate_chapters=book_config.candidate_chapters,
+        judge_model=judge_model_override or book_config.judge_model,
+        validation_retries=book_config.validation_retries,
+        validators=book_config.validators,
+        dedupe_hints=book_config.dedupe_hints,
+        dedupe_threshold=book_config.dedupe_threshold,
+        glossary=book_config.glossary,
+        glossary_tokens=book_config.glossary_tokens,
     )
 
 
@@ -16,12 +16,8 @@ def check_pandoc_installed() -> bool:
     return shutil.which("pandoc") is not None
 
 
-def convert_to_pdf(input_md: Path, output_pdf: Path) -> Path:
-    """
-    Convert markdown to PDF using Pandoc.
-
-    Requires Pandoc and a LaTeX distribution (e.g., texlive, xelatex).
-    """
+def check_pdf_tools() -> None:
+    """Raise ConversionError unless Pandoc and a LaTeX engine are installed."""
     if not check_pandoc_installed():
         raise ConversionError(
             "Pandoc not found. Install Pandoc from https://pandoc.org/installing.html"
@@ -33,14 +29,16 @@ def convert_to_pdf(input_md: Path, output_pdf: Path) -> Path:
             "LaTeX not found. Install a LaTeX distribution (e.g., texlive-xetex) for PDF generation."
         )
 
+
+def pdf_command(output_pdf: Path, input_md: Path | None = None, toc: bool = True) -> list[str]:
+    """Pandoc command for a PDF build; with no input_md, Pandoc reads stdin."""
     cmd = [
         "pandoc",
-        str(input_md),
+        *([str(input_md)] if input_md else ["--from=markdown"]),
         "-o",
         str(output_pdf),
         "--pdf-engine=xelatex",
-        "--toc",
-        "--toc-depth=2",
+        *(["--toc", "--toc-depth=2"] if toc else []),
         "-V",
         "geometry:margin=1in",
         "-V",
@@ -57,6 +55,17 @@ def convert_to_pdf(input_md: Path, output_pdf: Path) -> Path:
     # Try xelatex first, fall back to pdflatex
     if not shutil.which("xelatex"):
         cmd[cmd.index("--pdf-engine=xelatex")] = "--pdf-engine=pdflatex"
+    return cmd
+
+
+def convert_to_pdf(input_md: Path, output_pdf: Path) -> Path:
+    """
+    Convert markdown to PDF using Pandoc.
+
+    Requires Pandoc and a LaTeX distribution (e.g., texlive, xelatex).
+    """
+    check_pdf_tools()
+    cmd = pdf_command(output_pdf, input_md)
 
     try:
         result = subprocess.run(
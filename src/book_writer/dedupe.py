@@ -0,0 +1,267 @@
+"""Book-wide near-duplicate index over paragraphs, using MinHash and LSH."""
+
+import hashlib
+import json
+import random
+import re
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel
+
+from .models import BookState, SectionState, SectionStatus
+
+INDEX_FILENAME = "dedupe.json"
+INDEX_VERSION = 1
+
+NUM_PERM = 64  # MinHash signature length
+BANDS = 16  # LSH bands of NUM_PERM // BANDS rows; catches pairs above ~0.5 similarity
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 5
+MIN_PARAGRAPH_WORDS = 30  # Shorter paragraphs are too generic to compare
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)  # Fixed seed so signatures are stable across runs
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class DuplicateMatch(BaseModel):
+    """A paragraph in the index that resembles a queried paragraph."""
+
+    chapter_id: str
+    section_id: str
+    paragraph: int  # Index among the section's indexed paragraphs
+    similarity: float  # Estimated Jaccard similarity of word shingles
+    snippet: str
+
+
+def split_paragraphs(content: str) -> list[str]:
+    """Prose paragraphs worth indexing (no headings, code or short fragments)."""
+    paragraphs = []
+    for block in re.split(r"\n\s*\n", content):
+        block = block.strip()
+        if not block or block.startswith(("#", "```", "|")):
+            continue
+        if len(_WORD_RE.findall(block)) >= MIN_PARAGRAPH_WORDS:
+            paragraphs.append(block)
+    return paragraphs
+
+
+def minhash(text: str) -> Optional[list[int]]:
+    """MinHash signature of a text's word shingles, or None if it is too short."""
+    words = _WORD_RE.findall(text.lower())
+    shingles = {
+        zlib.crc32(" ".join(words[i : i + SHINGLE_WORDS]).encode("utf-8"))
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+    if not shingles:
+        return None
+    # Keeping the low 32 bits of each minimum halves the index size
+    return [
+        min((a * h + b) % _PRIME for h in shingles) & 0xFFFFFFFF for a, b in _PERMUTATIONS
+    ]
+
+
+def similarity(sig_a: list[int], sig_b: list[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+
+def _band_keys(signature: list[int]) -> list[tuple[int, tuple[int, ...]]]:
+    return [(band, tuple(signature[band * ROWS : (band + 1) * ROWS])) for band in range(BANDS)]
+
+
+def _snippet(paragraph: str, length: int = 100) -> str:
+    text = " ".join(paragraph.split())
+    return text if len(text) <= length else text[: length - 3] + "..."
+
+
+class DedupeIndex:
+    """
+    Paragraph-level MinHash index of completed sections, stored as
+    dedupe.json next to state.json.
+
+    Sections are re-indexed only when their content hash changes. LSH
+    buckets are rebuilt in memory on load, so a query touches only the
+    paragraphs sharing a band with it.
+    """
+
+    def __init__(self, output_dir: Path):
+        self.path = output_dir / INDEX_FILENAME
+        # "chapter:section" -> {"hash": ..., "paragraphs": [{"sig": [...], "snippet": ...}]}
+        self.sections: dict[str, dict[str, Any]] = {}
+        self._buckets: dict[tuple[int, tuple[int, ...]], set[tuple[str, int]]] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Read the index from disk, if present and current."""
+        self.sections = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        if data.get("version") == INDEX_VERSION and data.get("num_perm") == NUM_PERM:
+            self.sections = data.get("sections", {})
+        self._rebuild_buckets()
+
+    def save(self) -> None:
+        """Write the index atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": INDEX_VERSION, "num_perm": NUM_PERM, "sections": self.sections}
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            dir=self.path.parent,
+            delete=False,
+            suffix=".json",
+            encoding="utf-8",
+        ) as f:
+            json.dump(data, f)
+            temp_path = Path(f.name)
+        temp_path.rename(self.path)
+
+    def _rebuild_buckets(self) -> None:
+        self._buckets = {}
+        for key, entry in self.sections.items():
+            self._add_buckets(key, entry)
+
+    def _add_buckets(self, key: str, entry: dict[str, Any]) -> None:
+        for i, paragraph in enumerate(entry["paragraphs"]):
+            for band_key in _band_keys(paragraph["sig"]):
+                self._buckets.setdefault(band_key, set()).add((key, i))
+
+    def remove_section(self, chapter_id: str, section_id: str) -> bool:
+        """Drop a section from the index. Returns True if it was present."""
+        key = f"{chapter_id}:{section_id}"
+        entry = self.sections.pop(key, None)
+        if entry is None:
+            return False
+        for i, paragraph in enumerate(entry["paragraphs"]):
+            for band_key in _band_keys(paragraph["sig"]):
+                bucket = self._buckets.get(band_key)
+                if bucket:
+                    bucket.discard((key, i))
+        return True
+
+    def update_section(self, chapter_id: str, section_id: str, content: str) -> bool:
+        """(Re)index a section. Returns False if its content was already indexed."""
+        key = f"{chapter_id}:{section_id}"
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if self.sections.get(key, {}).get("hash") == content_hash:
+            return False
+
+        self.remove_section(chapter_id, section_id)
+        paragraphs = []
+        for paragraph in split_paragraphs(content):
+            signature = minhash(paragraph)
+            if signature is not None:
+                paragraphs.append({"sig": signature, "snippet": _snippet(paragraph)})
+
+        entry = {"hash": content_hash, "paragraphs": paragraphs}
+        self.sections[key] = entry
+        self._add_buckets(key, entry)
+        return True
+
+    def sync(
+        self, state: BookState, get_content: Callable[[SectionState], Optional[str]]
+    ) -> int:
+        """
+        Bring the index in line with the completed sections in state.
+        get_content maps a SectionState to its prose. Returns the number of
+        sections added, changed or removed.
+        """
+        changed = 0
+        live = set()
+        for chapter_id, chapter_state in state.chapters.items():
+            for section_id, section_state in chapter_state.sections.items():
+                if section_state.status != SectionStatus.COMPLETED:
+                    continue
+                content = get_content(section_state)
+                if not content:
+                    continue
+                live.add(f"{chapter_id}:{section_id}")
+                changed += self.update_section(chapter_id, section_id, content)
+
+        for key in list(self.sections):
+            if key not in live:
+                chapter_id, _, section_id = key.partition(":")
+                changed += self.remove_section(chapter_id, section_id)
+        return changed
+
+    def _candidates(self, signature: list[int]) -> set[tuple[str, int]]:
+        found = set()
+        for band_key in _band_keys(signature):
+            found |= self._buckets.get(band_key, set())
+        return found
+
+    def query_signature(
+        self,
+        signature: list[int],
+        threshold: float = 0.5,
+        exclude_chapter: Optional[str] = None,
+    ) -> list[DuplicateMatch]:
+        """Indexed paragraphs at least threshold-similar to a signature, best first."""
+        matches = []
+        for key, i in self._candidates(signature):
+            chapter_id, _, section_id = key.partition(":")
+            if chapter_id == exclude_chapter:
+                continue
+            paragraph = self.sections[key]["paragraphs"][i]
+            score = similarity(signature, paragraph["sig"])
+            if score >= threshold:
+                matches.append(
+                    DuplicateMatch(
+                        chapter_id=chapter_id,
+                        section_id=section_id,
+                        paragraph=i,
+                        similarity=score,
+                        snippet=paragraph["snippet"],
+                    )
+                )
+        return sorted(matches, key=lambda match: -match.similarity)
+
+    def query(
+        self,
+        content: str,
+        threshold: float = 0.5,
+        exclude_chapter: Optional[str] = None,
+    ) -> list[DuplicateMatch]:
+        """Indexed paragraphs resembling any paragraph of content, best first."""
+        best: dict[tuple[str, str, int], DuplicateMatch] = {}
+        for paragraph in split_paragraphs(content):
+            signature = minhash(paragraph)
+            if signature is None:
+                continue
+            for match in self.query_signature(signature, threshold, exclude_chapter):
+                key = (match.chapter_id, match.section_id, match.paragraph)
+                if key not in best or match.similarity > best[key].similarity:
+                    best[key] = match
+        return sorted(best.values(), key=lambda match: -match.similarity)
+
+    def duplicates(self, threshold: float = 0.5) -> list[tuple[DuplicateMatch, DuplicateMatch]]:
+        """All pairs of similar paragraphs in different sections, most similar first."""
+        pairs = []
+        seen = set()
+        for key, entry in self.sections.items():
+            chapter_id, _, section_id = key.partition(":")
+            for i, paragraph in enumerate(entry["paragraphs"]):
+                for match in self.query_signature(paragraph["sig"], threshold):
+                    other = f"{match.chapter_id}:{match.section_id}"
+                    if other == key:
+                        continue
+                    pair = tuple(sorted([(key, i), (other, match.paragraph)]))
+                    if pair in seen:
+                        continue
+                    seen.add(pair)
+                    source = DuplicateMatch(
+                        chapter_id=chapter_id,
+                        section_id=section_id,
+                        paragraph=i,
+                        similarity=match.similarity,
+                        snippet=paragraph["snippet"],
+                    )
+                    pairs.append((source, match))
+        return sorted(pairs, key=lambda pair: -pair[1].similarity)
@@ -0,0 +1,212 @@
+"""Built-in HTML and EPUB export that needs neither Pandoc nor LaTeX.
+
+Chapters are rendered with markdown-it (already installed as a rich
+dependency) in worker processes and streamed into the output file, so a
+preview build takes well under a second. Pandoc remains the high-fidelity
+path, and the only one that produces PDF.
+"""
+
+import html
+import os
+import re
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    from markdown_it import MarkdownIt
+
+# Part of the publish manifest inputs; bump when the output markup changes
+EXPORT_VERSION = "3"
+
+STYLESHEET = """
+body { max-width: 42em; margin: 0 auto; padding: 1em 1.5em; font-family: Georgia, serif;
+       line-height: 1.6; color: #222; }
+h1, h2, h3, h4 { font-family: Helvetica, Arial, sans-serif; line-height: 1.25; }
+h1 { margin-top: 2.5em; border-bottom: 1px solid #ccc; padding-bottom: 0.3em; }
+blockquote { margin: 1em 0; padding: 0 1em; border-left: 3px solid #ccc; color: #555; }
+code, pre { font-family: Menlo, Consolas, monospace; font-size: 0.9em; background: #f5f5f5; }
+pre { padding: 0.8em; overflow-x: auto; }
+table { border-collapse: collapse; margin: 1em 0; }
+th, td { border: 1px solid #ccc; padding: 0.3em 0.6em; }
+nav li { margin: 0.2em 0; }
+"""
+
+_HEADING_RE = re.compile(r"<h([1-3])>(.*?)</h\1>", re.DOTALL)
+_UNSAFE_ID_RE = re.compile(r"[^\w.-]")
+
+_markdown: Optional["MarkdownIt"] = None
+
+
+def _renderer() -> "MarkdownIt":
+    global _markdown
+    if _markdown is None:
+        from markdown_it import MarkdownIt
+
+        # The commonmark preset emits XHTML void tags (<br />), which EPUB
+        # requires; raw HTML in the prose is escaped, as it may not be XHTML
+        _markdown = (
+            MarkdownIt("commonmark", {"html": False}).enable("table").enable("strikethrough")
+        )
+    return _markdown
+
+
+def chapter_title(path: Path) -> str:
+    """Text of a chapter file's first heading, or its file name."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#"):
+                return line.lstrip("#").strip()
+    return path.stem
+
+
+def chapter_anchor(path: Path) -> str:
+    """
+    Id of a chapter's first heading. XHTML ids may not start with a digit
+    or hold spaces, which chapter file names can.
+    """
+    return "ch-" + _UNSAFE_ID_RE.sub("-", path.stem)
+
+
+def render_chapter(path: str) -> str:
+    """
+    Render a chapter file to an HTML fragment, giving h1-h3 headings ids
+    prefixed with the chapter's anchor. Runs in worker processes.
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    body = _renderer().render(text)
+    prefix = chapter_anchor(Path(path))
+    count = 0
+
+    def add_id(match: re.Match[str]) -> str:
+        nonlocal count
+        count += 1
+        anchor = prefix if count == 1 else f"{prefix}-{count}"
+        return f'<h{match.group(1)} id="{anchor}">{match.group(2)}</h{match.group(1)}>'
+
+    return _HEADING_RE.sub(add_id, body)
+
+
+def _render_all(chapter_files: list[Path], workers: Optional[int]) -> Iterator[str]:
+    """Rendered chapters in order, from a process pool when there are several."""
+    paths = [str(path) for path in chapter_files]
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    if workers <= 1 or len(paths) <= 1:
+        yield from map(render_chapter, paths)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(render_chapter, paths)
+
+
+def export_html(
+    chapter_files: list[Path], title: str, output_html: Path, workers: Optional[int] = None
+) -> Path:
+    """Write a standalone HTML book with a chapter table of contents."""
+    titles = [chapter_title(path) for path in chapter_files]
+    with open(output_html, "w", encoding="utf-8") as out:
+        out.write(
+            "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+            "<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">\n"
+            f"<title>{html.escape(title)}</title>\n<style>{STYLESHEET}</style>\n"
+            f"</head>\n<body>\n<header><h1>{html.escape(title)}</h1></header>\n"
+            "<nav id=\"toc\"><ul>\n"
+        )
+        for path, chapter in zip(chapter_files, titles):
+            out.write(f'<li><a href="#{chapter_anchor(path)}">{html.escape(chapter)}</a></li>\n')
+        out.write("</ul></nav>\n")
+
+        for path, body in zip(chapter_files, _render_all(chapter_files, workers)):
+            out.write(f'<section class="chapter">\n{body}</section>\n')
+        out.write("</body>\n</html>\n")
+    return output_html
+
+
+_XHTML_TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
+<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" \
+xml:lang="en" lang="en">
+<head>
+<meta charset="utf-8"/>
+<title>{title}</title>
+<link rel="stylesheet" type="text/css" href="style.css"/>
+</head>
+<body>
+{body}</body>
+</html>
+"""
+
+_CONTAINER_XML = """<?xml version="1.0" encoding="utf-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>
+"""
+
+_OPF_TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <dc:identifier id="book-id">urn:uuid:{book_id}</dc:identifier>
+    <dc:title>{title}</dc:title>
+    <dc:language>en</dc:language>
+    <meta property="dcterms:modified">{modified}</meta>
+  </metadata>
+  <manifest>
+    <item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>
+    <item id="css" href="style.css" media-type="text/css"/>
+{items}
+  </manifest>
+  <spine>
+{itemrefs}
+  </spine>
+</package>
+"""
+
+
+def export_epub(
+    chapter_files: list[Path], title: str, output_epub: Path, workers: Optional[int] = None
+) -> Path:
+    """Write an EPUB 3 book with one XHTML document per chapter."""
+    titles = [chapter_title(path) for path in chapter_files]
+    escaped_title = html.escape(title)
+    with zipfile.ZipFile(output_epub, "w", zipfile.ZIP_DEFLATED) as epub:
+        # The mimetype entry must come first and be stored uncompressed
+        epub.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        epub.writestr("META-INF/container.xml", _CONTAINER_XML)
+        epub.writestr("OEBPS/style.css", STYLESHEET)
+
+        for path, chapter, body in zip(
+            chapter_files, titles, _render_all(chapter_files, workers)
+        ):
+            epub.writestr(
+                f"OEBPS/{path.stem}.xhtml",
+                _XHTML_TEMPLATE.format(title=html.escape(chapter), body=body),
+            )
+
+        nav = "".join(
+            f'<li><a href="{path.stem}.xhtml">{html.escape(chapter)}</a></li>\n'
+            for path, chapter in zip(chapter_files, titles)
+        )
+        toc = f'<nav epub:type="toc" id="toc"><h1>{escaped_title}</h1><ol>\n{nav}</ol></nav>\n'
+        epub.writestr("OEBPS/nav.xhtml", _XHTML_TEMPLATE.format(title=escaped_title, body=toc))
+
+        items = "\n".join(
+            f'    <item id="c{i}" href="{path.stem}.xhtml" media-type="application/xhtml+xml"/>'
+            for i, path in enumerate(chapter_files)
+        )
+        itemrefs = "\n".join(f'    <itemref idref="c{i}"/>' for i in range(len(chapter_files)))
+        epub.writestr(
+            "OEBPS/content.opf",
+            _OPF_TEMPLATE.format(
+                book_id=uuid.uuid5(uuid.NAMESPACE_URL, title),
+                title=escaped_title,
+                modified=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                items=items,
+                itemrefs=itemrefs,
+            ),
+        )
+    return output_epub
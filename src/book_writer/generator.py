@@ -1,21 +1,45 @@
 """Core generation logic for book writing."""
 
 import asyncio
+import shutil
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 
+from .batch import BatchBackend, BatchRequest, parse_custom_id
+from .budget import BudgetGovernor, expected_completion_tokens
+from .candidates import parse_judge_scores, score_candidate
+from .dedupe import DedupeIndex, DuplicateMatch
+from .glossary import GlossaryIndex, extract_terms
 from .models import (
     BookOutline,
     BookState,
+    CandidateRecord,
     ChapterOutline,
+    ChapterState,
     ChapterStatus,
     GenerationConfig,
+    GenerationResult,
     SectionOutline,
     SectionStatus,
+    TokenUsage,
 )
 from .openrouter import OpenRouterClient, OpenRouterError
-from .prompts import build_section_prompt
+from .prompts import (
+    ChapterPromptBuilder,
+    build_judge_prompt,
+    build_validation_retry_messages,
+    format_covered,
+    format_glossary,
+    prompt_hash,
+    supports_cache_control,
+)
+from .scheduler import ChapterScheduler
 from .state import StateManager
+from .tokens import context_window, count_message_tokens
+from .validation import ValidationContext, ValidationPipeline
+from .workers import WorkerPool
+
+MAX_COVERED_HINTS = 3  # Repeated passages pointed out to a chapter's next section
 
 
 class BookGenerator:
@@ -36,6 +60,23 @@ class BookGenerator:
         self.config = config
         self.output_dir = output_dir
         self.progress_callback = progress_callback
+        self.budget: Optional[BudgetGovernor] = None
+        # Caps in-flight API requests, so candidate sampling in one chapter
+        # shares capacity with the others instead of adding to it
+        self._request_limiter = asyncio.Semaphore(config.max_concurrent_chapters)
+        self.workers = WorkerPool(config.worker_processes)
+        self.validator = ValidationPipeline(config.validators, self.workers)
+        self.dedupe: Optional[DedupeIndex] = None
+        self._dedupe_dirty = False  # Saved at chapter end rather than per section
+        # Passages each chapter's latest section repeated, for its next prompt
+        self._covered: dict[str, list[DuplicateMatch]] = {}
+        self.glossary: Optional[GlossaryIndex] = None
+
+        self.set_outline(outline)
+
+    def set_outline(self, outline: BookOutline) -> None:
+        """Replace the outline (e.g. after a rubric edit) and rebuild the lookup."""
+        self.outline = outline
 
         # Build chapter lookup
         self._chapters: dict[str, ChapterOutline] = {}
@@ -50,12 +91,17 @@ class BookGenerator:
         self,
         state: BookState,
         chapters_to_process: Optional[list[str]] = None,
+        sections_to_process: Optional[set[str]] = None,
     ) -> BookState:
         """
         Generate all chapters in parallel.
-        Each chapter processes sections sequentially.
+        Each chapter processes sections sequentially. With
+        sections_to_process, other unfinished sections are left alone.
         """
         semaphore = asyncio.Semaphore(self.config.max_concurrent_chapters)
+        self._ensure_budget(state)
+        self._ensure_dedupe(state)
+        await self._ensure_glossary(state)
 
         # Determine which chapters to process
         if chapters_to_process:
@@ -63,15 +109,31 @@ class BookGenerator:
         else:
             chapter_ids = list(self._chapters.keys())
 
+        # Order chapters by the scheduling policy; the semaphore hands out
+        # slots in task creation order
+        chapter_ids = [ch_id for ch_id in chapter_ids if ch_id in self._chapters]
+        scheduler = ChapterScheduler(self.config, state)
+        chapter_ids = scheduler.order(chapter_ids)
+
+        for chapter_id, eta in scheduler.project(chapter_ids).items():
+            message = f"projected {eta:%Y-%m-%d %H:%M}"
+            deadline = scheduler.deadline(chapter_id)
+            if deadline and eta > deadline:
+                message += f", misses deadline {deadline:%Y-%m-%d %H:%M}"
+            self._notify_progress(chapter_id, None, "scheduled", message)
+
         # Create tasks for each chapter
         tasks = [
-            self._generate_chapter_with_semaphore(semaphore, state, chapter_id)
+            self._generate_chapter_with_semaphore(
+                semaphore, state, chapter_id, sections_to_process
+            )
             for chapter_id in chapter_ids
-            if chapter_id in self._chapters
         ]
 
         # Run all chapters in parallel (limited by semaphore)
         await asyncio.gather(*tasks, return_exceptions=True)
+        self.workers.close()
+        self._save_dedupe()
 
         # Reload and return final state
         return self.state_manager.load_state() or state
@@ -81,15 +143,17 @@ class BookGenerator:
         semaphore: asyncio.Semaphore,
         state: BookState,
         chapter_id: str,
+        sections_to_process: Optional[set[str]] = None,
     ) -> None:
         """Wrapper to limit concurrent chapter generation."""
         async with semaphore:
-            await self._generate_chapter(state, chapter_id)
+            await self._generate_chapter(state, chapter_id, sections_to_process)
 
     async def _generate_chapter(
         self,
         state: BookState,
         chapter_id: str,
+        sections_to_process: Optional[set[str]] = None,
     ) -> None:
         """
         Generate a single chapter by processing sections sequentially.
@@ -113,17 +177,10 @@ class BookGenerator:
         self.state_manager.mark_chapter_started(state, chapter_id)
         self._notify_progress(chapter_id, None, "started")
 
-        # Track previously generated content for context
-        previous_sections: list[tuple[str, str]] = []
-
-        # First, load any already completed sections
-        for section in chapter.sections:
-            section_state = chapter_state.sections.get(section.id)
-            if section_state and section_state.status == SectionStatus.COMPLETED:
-                if section_state.generated_content:
-                    previous_sections.append(
-                        (section.title, section_state.generated_content)
-                    )
+        # Track previously generated content for context. Only sections
+        # before the one being generated are included, so regenerating a
+        # section mid-chapter sees the same context as the original run.
+        builder = self._prompt_builder(chapter)
 
         # Process each section sequentially
         for section in chapter.sections:
@@ -133,15 +190,33 @@ class BookGenerator:
 
             # Skip already completed sections
             if section_state.status == SectionStatus.COMPLETED:
+                content = self.state_manager.get_section_content(section_state)
+                if content:
+                    builder.add_section(section.title, content)
                 continue
 
+            if sections_to_process is not None and section.id not in sections_to_process:
+                continue
+
+            messages = builder.build(
+                section, self._glossary_block(chapter, section), self._covered_block(chapter.id)
+            )
+            reserved = self._admit_section(state, messages, self._candidate_count(chapter_id))
+            if reserved is None:
+                # Over budget - leave the rest of the chapter PENDING for resume
+                self._notify_progress(
+                    chapter_id, section.id, "budget_exhausted", "Token/cost budget reached"
+                )
+                await self._write_partial_chapter(chapter_id, state)
+                return
+
             # Generate this section
             success, content = await self._generate_section(
-                chapter, section, previous_sections, state
+                chapter, section, messages, state, reserved, builder.sections
             )
 
             if success and content:
-                previous_sections.append((section.title, content))
+                builder.add_section(section.title, content)
             else:
                 # Section failed after retries - stop this chapter
                 self._notify_progress(
@@ -153,6 +228,13 @@ class BookGenerator:
                 await self._write_partial_chapter(chapter_id, state)
                 return
 
+        # Re-read: sections generated above have moved the chapter's status on
+        chapter_status = state.chapters[chapter_id].status
+        if sections_to_process is not None and chapter_status != ChapterStatus.COMPLETED:
+            # Sections outside sections_to_process are still unfinished
+            await self._write_partial_chapter(chapter_id, state)
+            return
+
         # All sections completed
         self._notify_progress(chapter_id, None, "chapter_completed")
         await self._write_complete_chapter(chapter_id, state)
@@ -161,12 +243,15 @@ class BookGenerator:
         self,
         chapter: ChapterOutline,
         section: SectionOutline,
-        previous_sections: list[tuple[str, str]],
+        messages: list[dict[str, Any]],
         state: BookState,
+        reserved_tokens: int = 0,
+        previous_sections: Optional[list[str]] = None,
     ) -> tuple[bool, Optional[str]]:
         """
         Generate a single section with retries.
-        Returns (success, content).
+        Drafts that fail validation are regenerated with the problems fed
+        back, up to validation_retries times. Returns (success, content).
         """
         # Mark as in progress
         self.state_manager.update_section(
@@ -174,30 +259,51 @@ class BookGenerator:
         )
         self._notify_progress(chapter.id, section.id, "generating")
 
-        # Build prompt
-        messages = build_section_prompt(
-            section=section,
-            chapter=chapter,
-            book_title=self.outline.title,
-            previous_sections=previous_sections,
+        context = ValidationContext(
+            section_id=section.id,
+            section_title=section.title,
+            outline_content=section.outline_content,
+            previous_sections=previous_sections or [],
         )
+        usage = TokenUsage()
+        retries = 0
+        attempt_messages = messages
 
         try:
-            content = await self.client.generate(messages)
+            for attempt in range(self.config.validation_retries + 1):
+                result, candidates = await self._produce_section(
+                    chapter, section, attempt_messages
+                )
+                usage = usage.add(result.usage)
+                retries += result.retries
 
-            # Success - save content
-            self.state_manager.update_section(
-                state,
-                chapter.id,
-                section.id,
-                status=SectionStatus.COMPLETED,
-                content=content,
-            )
+                problems = await self.validator.validate(result.content, context)
+                if not problems:
+                    break
 
-            self._notify_progress(chapter.id, section.id, "completed")
-            return True, content
+                self._notify_progress(chapter.id, section.id, "invalid", "; ".join(problems))
+                attempt_messages = build_validation_retry_messages(messages, problems)
+            else:
+                if self.budget:
+                    self.budget.record(reserved_tokens, usage)
+                error = "Validation failed: " + "; ".join(problems)
+                self.state_manager.update_section(
+                    state,
+                    chapter.id,
+                    section.id,
+                    status=SectionStatus.FAILED,
+                    error=error,
+                    token_count=usage.total_tokens or None,
+                    retries=retries,
+                    cost=usage.cost or None,
+                )
+                self._notify_progress(chapter.id, section.id, "failed", error)
+                return False, None
 
         except OpenRouterError as e:
+            if self.budget:
+                self.budget.record(reserved_tokens, usage)
+
             # All retries exhausted
             self.state_manager.update_section(
                 state,
@@ -205,11 +311,505 @@ class BookGenerator:
                 section.id,
                 status=SectionStatus.FAILED,
                 error=str(e),
+                token_count=usage.total_tokens or None,
+                retries=retries + e.retries,
+                cost=usage.cost or None,
             )
 
             self._notify_progress(chapter.id, section.id, "failed", str(e))
             return False, None
 
+        except Exception as e:
+            # Validator, worker pool or dedupe errors; without this the section
+            # would stay IN_PROGRESS with the error swallowed by gather()
+            if self.budget:
+                self.budget.record(reserved_tokens, usage)
+            error = f"{type(e).__name__}: {e}"
+            self.state_manager.update_section(
+                state,
+                chapter.id,
+                section.id,
+                status=SectionStatus.FAILED,
+                error=error,
+                token_count=usage.total_tokens or None,
+                retries=retries,
+                cost=usage.cost or None,
+            )
+            self._notify_progress(chapter.id, section.id, "failed", error)
+            return False, None
+
+        content = result.content
+        if self.budget:
+            self.budget.record(reserved_tokens, usage)
+
+        # Success - save content
+        self.state_manager.update_section(
+            state,
+            chapter.id,
+            section.id,
+            status=SectionStatus.COMPLETED,
+            content=content,
+            token_count=usage.total_tokens or None,
+            cached_tokens=usage.cached_tokens or None,
+            retries=retries,
+            prompt_tokens=usage.prompt_tokens or None,
+            cost=usage.cost or None,
+            candidates=candidates,
+            model=result.model,
+            prompt_hash=prompt_hash(attempt_messages),
+        )
+
+        await self._index_section(chapter.id, section.id, content)
+        self._notify_truncated(chapter.id, section.id, result)
+        self._notify_progress(chapter.id, section.id, "completed")
+        return True, content
+
+    async def _produce_section(
+        self,
+        chapter: ChapterOutline,
+        section: SectionOutline,
+        messages: list[dict[str, Any]],
+    ) -> tuple[GenerationResult, Optional[list[CandidateRecord]]]:
+        """Generate one draft, or the best of several when sampling candidates."""
+        if self._candidate_count(chapter.id) > 1:
+            return await self._sample_candidates(chapter, section, messages)
+        async with self._request_limiter:
+            return await self.client.generate_result(messages), None
+
+    def _candidate_count(self, chapter_id: str) -> int:
+        """Number of drafts to sample for sections of a chapter."""
+        chapters = self.config.candidate_chapters
+        if self.config.candidates > 1 and (not chapters or chapter_id in chapters):
+            return self.config.candidates
+        return 1
+
+    async def _sample_candidates(
+        self,
+        chapter: ChapterOutline,
+        section: SectionOutline,
+        messages: list[dict[str, Any]],
+    ) -> tuple[GenerationResult, list[CandidateRecord]]:
+        """
+        Generate several drafts concurrently, rotating through the candidate
+        models, and return the best-scoring one with a record of every draft.
+        The returned usage covers all drafts and the judge call.
+        """
+        models = self.config.candidate_models or [self.config.model]
+        models = [models[i % len(models)] for i in range(self.config.candidates)]
+
+        async def sample(model: str) -> GenerationResult:
+            async with self._request_limiter:
+                return await self.client.generate_result(messages, model)
+
+        outcomes = await asyncio.gather(
+            *(sample(model) for model in models), return_exceptions=True
+        )
+        drafts = [outcome for outcome in outcomes if isinstance(outcome, GenerationResult)]
+        errors = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+        if not drafts:
+            raise errors[0]
+
+        scores, usage = await self._score_candidates(chapter, section, drafts)
+        best = drafts[max(range(len(drafts)), key=scores.__getitem__)]
+        score_by_draft = {id(draft): score for draft, score in zip(drafts, scores)}
+
+        records = []
+        retries = 0
+        for index, (model, outcome) in enumerate(zip(models, outcomes)):
+            if not isinstance(outcome, GenerationResult):
+                retries += getattr(outcome, "retries", 0)
+                records.append(CandidateRecord(model=model, error=str(outcome)))
+                continue
+
+            usage = usage.add(outcome.usage)
+            retries += outcome.retries
+            records.append(
+                CandidateRecord(
+                    model=outcome.model,
+                    score=score_by_draft[id(outcome)],
+                    selected=outcome is best,
+                    content_path=self.state_manager.store_candidate(
+                        chapter.id, section.id, index, outcome.content
+                    ),
+                    finish_reason=outcome.finish_reason,
+                    token_count=outcome.usage.total_tokens or None,
+                )
+            )
+
+        return best.model_copy(update={"usage": usage, "retries": retries}), records
+
+    async def _score_candidates(
+        self,
+        chapter: ChapterOutline,
+        section: SectionOutline,
+        drafts: list[GenerationResult],
+    ) -> tuple[list[float], TokenUsage]:
+        """
+        Score drafts with the judge model if configured, falling back to the
+        local heuristic. Returns (scores, judge usage).
+        """
+        usage = TokenUsage()
+        if self.config.judge_model:
+            judge_messages = build_judge_prompt(
+                section, chapter, [draft.content for draft in drafts]
+            )
+            try:
+                async with self._request_limiter:
+                    verdict = await self.client.generate_result(
+                        judge_messages, self.config.judge_model
+                    )
+                usage = verdict.usage
+                scores = parse_judge_scores(verdict.content, len(drafts))
+                if scores is not None:
+                    return scores, usage
+            except OpenRouterError:
+                pass
+
+        scores = [
+            score_candidate(draft.content, section, draft.finish_reason) for draft in drafts
+        ]
+        return scores, usage
+
+    async def write_chapters(self, state: BookState, chapter_ids: list[str]) -> None:
+        """Rewrite chapter files from state, e.g. after sections were removed."""
+        for chapter_id in chapter_ids:
+            chapter_state = state.chapters.get(chapter_id)
+            if not chapter_state:
+                continue
+            if chapter_state.status == ChapterStatus.COMPLETED:
+                await self._write_complete_chapter(chapter_id, state)
+            else:
+                await self._write_partial_chapter(chapter_id, state)
+
+    def _ensure_dedupe(self, state: BookState) -> None:
+        """Load and sync the book-wide duplicate index when hints are enabled."""
+        if self.config.dedupe_hints and self.dedupe is None:
+            self.dedupe = DedupeIndex(self.output_dir)
+            if self.dedupe.sync(state, self.state_manager.get_section_content):
+                self.dedupe.save()
+
+    async def _ensure_glossary(self, state: BookState) -> None:
+        """
+        Load the glossary index when enabled and extract terms from completed
+        sections it has not seen, on the worker pool.
+        """
+        if not self.config.glossary or self.glossary is not None:
+            return
+
+        self.glossary = GlossaryIndex(self.output_dir)
+        changed = self.glossary.prune(state)
+        for chapter_id, chapter_state in state.chapters.items():
+            for section_id, section_state in chapter_state.sections.items():
+                if section_state.status != SectionStatus.COMPLETED:
+                    continue
+                content = self.state_manager.get_section_content(section_state)
+                if not content or self.glossary.is_current(chapter_id, section_id, content):
+                    continue
+                terms = await self.workers.run(extract_terms, content)
+                self.glossary.set_terms(chapter_id, section_id, content, terms)
+                changed += 1
+        if changed:
+            self.glossary.save()
+
+    def _glossary_block(self, chapter: ChapterOutline, section: SectionOutline) -> Optional[str]:
+        """Prompt block of terms from other chapters that the section touches on."""
+        if self.glossary is None:
+            return None
+        text = f"{section.title}\n{section.outline_content}\n{chapter.goals or ''}"
+        entries = self.glossary.relevant(
+            text, self.config.glossary_tokens, chapter.id, self.config.model
+        )
+        return format_glossary(entries) if entries else None
+
+    def _covered_block(self, chapter_id: str) -> Optional[str]:
+        """Prompt block pointing at passages the chapter's last section repeated."""
+        matches = self._covered.get(chapter_id)
+        return format_covered(matches) if matches else None
+
+    async def _index_section(self, chapter_id: str, section_id: str, content: str) -> None:
+        """Add a completed section to the duplicate and glossary indexes."""
+        if self.dedupe:
+            matches = self.dedupe.query(content, self.config.dedupe_threshold, chapter_id)
+            self._covered[chapter_id] = matches[:MAX_COVERED_HINTS]
+            if matches:
+                covered = ", ".join(sorted({match.section_id for match in matches}))
+                self._notify_progress(chapter_id, section_id, "repeats", f"Resembles {covered}")
+            if self.dedupe.update_section(chapter_id, section_id, content):
+                self._dedupe_dirty = True
+        if self.glossary and not self.glossary.is_current(chapter_id, section_id, content):
+            terms = await self.workers.run(extract_terms, content)
+            self.glossary.set_terms(chapter_id, section_id, content, terms)
+            self.glossary.save()
+
+    def _save_dedupe(self) -> None:
+        """Write the duplicate index if sections were added since the last save."""
+        if self.dedupe and self._dedupe_dirty:
+            self.dedupe.save()
+            self._dedupe_dirty = False
+
+    def _ensure_budget(self, state: BookState) -> None:
+        """Create the run's budget governor on first use."""
+        if self.budget is None:
+            governor = BudgetGovernor(self.config, state)
+            if governor.enabled:
+                self.budget = governor
+
+    def _admit_section(
+        self, state: BookState, messages: list[dict[str, Any]], drafts: int = 1
+    ) -> Optional[int]:
+        """
+        Reserve budget for a section about to be generated (drafts times over
+        when sampling candidates). Returns the reserved token estimate, or
+        None if it was refused.
+        """
+        if self.budget is None:
+            return 0
+
+        estimate = count_message_tokens(messages, self.config.model)
+        estimate += expected_completion_tokens(state, self.config.expected_section_tokens)
+        estimate *= drafts
+        if not self.budget.try_admit(estimate):
+            return None
+        return estimate
+
+    def _prompt_builder(self, chapter: ChapterOutline) -> ChapterPromptBuilder:
+        """Create a chapter's prompt builder, trimming to the model's window."""
+        model = self.config.model
+        window = context_window(model, self.config.context_window)
+        reserve = self.config.max_tokens or self.config.output_reserve_tokens
+        return ChapterPromptBuilder(
+            chapter,
+            self.outline.title,
+            cache_control=supports_cache_control(model),
+            max_prompt_tokens=window - reserve,
+            model=model,
+        )
+
+    async def generate_book_batch(
+        self,
+        state: BookState,
+        backend: BatchBackend,
+        chapters_to_process: Optional[list[str]] = None,
+        poll_interval: float = 30.0,
+    ) -> BookState:
+        """
+        Generate chapters through a batch backend instead of per-request calls.
+
+        Works in rounds: each round submits the next ready section of every
+        chapter as one job, polls until it finishes, and ingests all results
+        with a single state save. A chapter stops at its first failed section.
+        Results that fail validation are requeued for the next round with
+        the problems fed back, up to validation_retries times.
+        """
+        chapter_ids = [
+            ch_id
+            for ch_id in (chapters_to_process or list(self._chapters.keys()))
+            if ch_id in self._chapters and ch_id in state.chapters
+        ]
+        stopped: set[str] = set()
+        builders: dict[str, tuple[ChapterPromptBuilder, int]] = {}
+        contexts: dict[str, ValidationContext] = {}
+        feedback: dict[str, list[str]] = {}  # Problems from the last rejected draft
+        rejections: dict[str, int] = {}
+        self._ensure_budget(state)
+        self._ensure_dedupe(state)
+        await self._ensure_glossary(state)
+
+        while True:
+            ready = self._collect_ready_sections(state, chapter_ids, stopped, builders)
+
+            requests = []
+            reservations: dict[str, int] = {}
+            for chapter, section, builder in ready:
+                custom_id = f"{chapter.id}:{section.id}"
+                messages = builder.build(
+                    section, self._glossary_block(chapter, section), self._covered_block(chapter.id)
+                )
+                if custom_id in feedback:
+                    messages = build_validation_retry_messages(messages, feedback[custom_id])
+                reserved = self._admit_section(state, messages)
+                if reserved is None:
+                    stopped.add(chapter.id)
+                    self._notify_progress(
+                        chapter.id, section.id, "budget_exhausted", "Token/cost budget reached"
+                    )
+                    continue
+
+                contexts[custom_id] = ValidationContext(
+                    section_id=section.id,
+                    section_title=section.title,
+                    outline_content=section.outline_content,
+                    previous_sections=builder.sections,
+                )
+                reservations[custom_id] = reserved
+                requests.append(
+                    BatchRequest(custom_id=custom_id, model=self.config.model, messages=messages)
+                )
+
+            if not requests:
+                break
+
+            self.state_manager.update_sections(
+                state,
+                [
+                    {
+                        "chapter_id": chapter_id,
+                        "section_id": section_id,
+                        "status": SectionStatus.IN_PROGRESS,
+                    }
+                    for chapter_id, section_id in map(parse_custom_id, reservations)
+                ],
+            )
+
+            job_id = await backend.submit(requests)
+            for request in requests:
+                chapter_id, section_id = parse_custom_id(request.custom_id)
+                self._notify_progress(chapter_id, section_id, "generating", f"batch {job_id}")
+
+            while not await backend.poll(job_id):
+                await asyncio.sleep(poll_interval)
+
+            results = {r.custom_id: r for r in await backend.fetch_results(job_id)}
+            drafts = {
+                custom_id: result.result.content
+                for custom_id, result in results.items()
+                if custom_id in contexts and result.result and result.result.content
+            }
+            checks = await asyncio.gather(
+                *(
+                    self.validator.validate(content, contexts[custom_id])
+                    for custom_id, content in drafts.items()
+                )
+            )
+            problems_by_id = dict(zip(drafts, checks))
+
+            updates = []
+            for request in requests:
+                chapter_id, section_id = parse_custom_id(request.custom_id)
+                batch_result = results.get(request.custom_id)
+                generated = batch_result.result if batch_result else None
+                if self.budget:
+                    self.budget.record(
+                        reservations[request.custom_id], generated.usage if generated else None
+                    )
+
+                problems = problems_by_id.get(request.custom_id)
+                if problems and generated:
+                    rejections[request.custom_id] = rejections.get(request.custom_id, 0) + 1
+                    error = "Validation failed: " + "; ".join(problems)
+                    requeue = rejections[request.custom_id] <= self.config.validation_retries
+                    updates.append(
+                        {
+                            "chapter_id": chapter_id,
+                            "section_id": section_id,
+                            "status": SectionStatus.PENDING if requeue else SectionStatus.FAILED,
+                            "error": error,
+                            "token_count": generated.usage.total_tokens or None,
+                            "retries": generated.retries,
+                            "cost": generated.usage.cost or None,
+                        }
+                    )
+                    if requeue:
+                        feedback[request.custom_id] = problems
+                        self._notify_progress(chapter_id, section_id, "invalid", error)
+                    else:
+                        stopped.add(chapter_id)
+                        self._notify_progress(chapter_id, section_id, "failed", error)
+                elif generated and generated.content:
+                    usage = generated.usage
+                    updates.append(
+                        {
+                            "chapter_id": chapter_id,
+                            "section_id": section_id,
+                            "status": SectionStatus.COMPLETED,
+                            "content": generated.content,
+                            "token_count": usage.total_tokens or None,
+                            "cached_tokens": usage.cached_tokens or None,
+                            "retries": generated.retries,
+                            "prompt_tokens": usage.prompt_tokens or None,
+                            "cost": usage.cost or None,
+                            "model": generated.model,
+                            "prompt_hash": prompt_hash(request.messages),
+                        }
+                    )
+                    await self._index_section(chapter_id, section_id, generated.content)
+                    self._notify_truncated(chapter_id, section_id, generated)
+                    self._notify_progress(chapter_id, section_id, "completed")
+                else:
+                    error = (
+                        batch_result.error if batch_result and batch_result.error
+                        else "No result returned by batch job"
+                    )
+                    updates.append(
+                        {
+                            "chapter_id": chapter_id,
+                            "section_id": section_id,
+                            "status": SectionStatus.FAILED,
+                            "error": error,
+                        }
+                    )
+                    stopped.add(chapter_id)
+                    self._notify_progress(chapter_id, section_id, "failed", error)
+
+            self.state_manager.update_sections(state, updates)
+
+        self.workers.close()
+        self._save_dedupe()
+        for chapter_id in chapter_ids:
+            if state.chapters[chapter_id].status == ChapterStatus.COMPLETED:
+                self._notify_progress(chapter_id, None, "chapter_completed")
+                await self._write_complete_chapter(chapter_id, state)
+            else:
+                self._notify_progress(
+                    chapter_id, None, "chapter_stopped", "Stopped before completing"
+                )
+                await self._write_partial_chapter(chapter_id, state)
+
+        return state
+
+    def _collect_ready_sections(
+        self,
+        state: BookState,
+        chapter_ids: list[str],
+        stopped: set[str],
+        builders: dict[str, tuple[ChapterPromptBuilder, int]],
+    ) -> list[tuple[ChapterOutline, SectionOutline, ChapterPromptBuilder]]:
+        """
+        Find the next section of each chapter that can be generated now.
+        Returns (chapter, section, builder) triples. builders maps chapter
+        ids to their prompt builder and the index of the first section not
+        yet folded into it, and is carried across rounds.
+        """
+        ready = []
+        for chapter_id in chapter_ids:
+            if chapter_id in stopped:
+                continue
+
+            chapter = self._chapters[chapter_id]
+            chapter_state = state.chapters[chapter_id]
+            if chapter_id not in builders:
+                builders[chapter_id] = (self._prompt_builder(chapter), 0)
+            builder, position = builders[chapter_id]
+
+            for index in range(position, len(chapter.sections)):
+                section = chapter.sections[index]
+                section_state = chapter_state.sections.get(section.id)
+                if not section_state:
+                    continue
+                if section_state.status == SectionStatus.COMPLETED:
+                    content = self.state_manager.get_section_content(section_state)
+                    if content:
+                        builder.add_section(section.title, content)
+                    continue
+
+                builders[chapter_id] = (builder, index)
+                ready.append((chapter, section, builder))
+                break
+            else:
+                builders[chapter_id] = (builder, len(chapter.sections))
+
+        return ready
+
     async def _write_partial_chapter(
         self,
         chapter_id: str,
@@ -249,79 +849,101 @@ class BookGenerator:
         partial: bool = False,
     ) -> None:
         """Write chapter content to markdown file."""
-        chapters_dir = self.output_dir / "chapters"
-        chapters_dir.mkdir(parents=True, exist_ok=True)
-
-        # Determine filename
-        if chapter.id == "preface":
-            filename = "00_preface.md"
-        elif chapter.id.startswith("appendix_"):
-            letter = chapter.id.replace("appendix_", "").upper()
-            filename = f"appendix_{letter.lower()}.md"
-        else:
-            num = int(chapter.id) if chapter.id.isdigit() else 0
-            filename = f"chapter_{num:02d}.md"
+        self._save_dedupe()
+        write_chapter_file(self.output_dir, chapter, chapter_state, self.state_manager, partial)
 
-        filepath = chapters_dir / filename
+    def _notify_truncated(
+        self, chapter_id: str, section_id: str, result: GenerationResult
+    ) -> None:
+        """Warn when a section is still cut off after all continuations."""
+        if result.finish_reason == "length":
+            self._notify_progress(
+                chapter_id,
+                section_id,
+                "truncated",
+                f"Still at the length limit after {result.continuations} continuations",
+            )
 
-        # Build chapter content
-        lines = []
+    def _notify_progress(
+        self,
+        chapter_id: str,
+        section_id: Optional[str],
+        status: str,
+        message: Optional[str] = None,
+    ) -> None:
+        """Notify progress callback if set."""
+        if self.progress_callback:
+            self.progress_callback(chapter_id, section_id, status, message)
 
-        # Chapter heading
-        if chapter.id == "preface":
-            lines.append(f"# Preface: {chapter.title}")
-        elif chapter.id.startswith("appendix_"):
-            letter = chapter.id.replace("appendix_", "").upper()
-            lines.append(f"# Appendix {letter}: {chapter.title}")
-        else:
-            lines.append(f"# Chapter {chapter.id}: {chapter.title}")
 
-        lines.append("")
+def chapter_filename(chapter_id: str) -> str:
+    """Return the markdown filename used for a chapter in output/chapters."""
+    if chapter_id == "preface":
+        return "00_preface.md"
+    elif chapter_id.startswith("appendix_"):
+        letter = chapter_id.replace("appendix_", "").upper()
+        return f"appendix_{letter.lower()}.md"
+    num = int(chapter_id) if chapter_id.isdigit() else 0
+    return f"chapter_{num:02d}.md"
+
+
+def write_chapter_file(
+    output_dir: Path,
+    chapter: ChapterOutline,
+    chapter_state: ChapterState,
+    state_manager: StateManager,
+    partial: bool = False,
+) -> Path:
+    """Write a chapter's sections from state to its markdown file."""
+    chapters_dir = output_dir / "chapters"
+    chapters_dir.mkdir(parents=True, exist_ok=True)
+
+    filepath = chapters_dir / chapter_filename(chapter.id)
+
+    # Chapter heading
+    if chapter.id == "preface":
+        heading = f"# Preface: {chapter.title}"
+    elif chapter.id.startswith("appendix_"):
+        letter = chapter.id.replace("appendix_", "").upper()
+        heading = f"# Appendix {letter}: {chapter.title}"
+    else:
+        heading = f"# Chapter {chapter.id}: {chapter.title}"
+
+    # Stream sections to the file one at a time so only a single
+    # section's prose is held in memory
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write(f"{heading}\n\n")
 
         if partial:
-            lines.append("> **Note**: This chapter is incomplete due to generation errors.")
-            lines.append("")
+            f.write("> **Note**: This chapter is incomplete due to generation errors.\n\n")
 
-        # Add each section
         for section in chapter.sections:
             section_state = chapter_state.sections.get(section.id)
             if not section_state:
                 continue
 
-            lines.append(f"## {section.title}")
-            lines.append("")
+            f.write(f"## {section.title}\n\n")
 
             if section_state.status == SectionStatus.COMPLETED:
-                if section_state.generated_content:
-                    lines.append(section_state.generated_content)
+                content = state_manager.get_section_content(section_state)
+                if content:
+                    f.write(f"{content}\n")
             elif section_state.status == SectionStatus.FAILED:
-                lines.append(f"> **Generation failed**: {section_state.last_error}")
+                f.write(f"> **Generation failed**: {section_state.last_error}\n")
+            elif content := state_manager.get_section_content(section_state):
+                # Requeued for regeneration; the earlier text stands until replaced
+                f.write(f"{content}\n")
             else:
-                lines.append("> *Section not yet generated*")
+                f.write("> *Section not yet generated*\n")
 
-            lines.append("")
+            f.write("\n")
 
-        # Write to file
-        filepath.write_text("\n".join(lines), encoding="utf-8")
-
-    def _notify_progress(
-        self,
-        chapter_id: str,
-        section_id: Optional[str],
-        status: str,
-        message: Optional[str] = None,
-    ) -> None:
-        """Notify progress callback if set."""
-        if self.progress_callback:
-            self.progress_callback(chapter_id, section_id, status, message)
+    return filepath
 
 
-def combine_chapters(output_dir: Path, outline: BookOutline) -> Path:
-    """Combine all chapter markdown files into single book.md."""
+def list_chapter_files(output_dir: Path) -> list[Path]:
+    """Existing chapter markdown files in output/chapters, in book order."""
     chapters_dir = output_dir / "chapters"
-    book_md = output_dir / "book.md"
-
-    # Get all chapter files in order
     chapter_files = []
 
     # Preface first
@@ -341,6 +963,14 @@ def combine_chapters(output_dir: Path, outline: BookOutline) -> Path:
         if appendix_file.exists():
             chapter_files.append(appendix_file)
 
+    return chapter_files
+
+
+def combine_chapters(output_dir: Path, outline: BookOutline) -> Path:
+    """Combine all chapter markdown files into single book.md."""
+    book_md = output_dir / "book.md"
+    chapter_files = list_chapter_files(output_dir)
+
     # Combine into book.md
     with open(book_md, "w", encoding="utf-8") as out:
         # Add YAML frontmatter
@@ -351,7 +981,7 @@ def combine_chapters(output_dir: Path, outline: BookOutline) -> Path:
 
         for chapter_file in chapter_files:
             with open(chapter_file, encoding="utf-8") as f:
-                out.write(f.read())
+                shutil.copyfileobj(f, out)
             out.write("\n\n---\n\n")
 
     return book_md
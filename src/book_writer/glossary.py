@@ -0,0 +1,210 @@
+"""Book-wide index of defined terms and key entities for consistent prompts."""
+
+import hashlib
+import json
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+from .models import BookState, SectionStatus
+from .tokens import count_tokens
+
+GLOSSARY_FILENAME = "glossary.json"
+GLOSSARY_VERSION = 1
+
+MAX_DEFINITION_CHARS = 240
+
+_SENTENCE_RE = re.compile(r"[^.!?\n]+(?:[.!?]+|$)")
+_BOLD_RE = re.compile(r"\*\*([^*\n]{2,60}?)\*\*")
+_CALLED_RE = re.compile(
+    r"\b(?:called|known as|termed|referred to as|defined as)\s+[\"'*_“]*"
+    r"([A-Za-z][\w'-]*(?:\s[A-Za-z][\w'-]*){0,3})"
+)
+_ENTITY_RE = re.compile(r"\b[A-Z][a-z]+(?:\s(?:of\s|the\s|and\s|&\s)?[A-Z][a-z]+)+")
+
+# Capitalised words that start phrases rather than names
+_ENTITY_STOP_STARTS = frozenset(
+    "The This That These Those When While If In On At For And But Or So As A An "
+    "It Its Our We You Your They Their Most Many Some Each Every".split()
+)
+
+
+def _key(term: str) -> str:
+    return " ".join(term.lower().split())
+
+
+def _clip(sentence: str) -> str:
+    text = " ".join(sentence.replace("**", "").split())
+    if len(text) <= MAX_DEFINITION_CHARS:
+        return text
+    return text[: MAX_DEFINITION_CHARS - 3] + "..."
+
+
+def extract_terms(content: str) -> list[dict[str, Any]]:
+    """
+    Pull defined terms and named entities out of section prose.
+
+    Definitions are bold terms and phrases introduced by "called", "known
+    as" and similar, paired with the sentence that introduces them.
+    Entities are multi-word capitalised names. Runs in worker processes.
+    """
+    entries: dict[str, dict[str, Any]] = {}
+    for paragraph in re.split(r"\n\s*\n", content):
+        if paragraph.lstrip().startswith(("#", "```", "|")):
+            continue
+        for sentence in _SENTENCE_RE.findall(paragraph):
+            terms = _BOLD_RE.findall(sentence) + _CALLED_RE.findall(sentence)
+            for term in terms:
+                term = term.strip(" .,;:")
+                key = _key(term)
+                if key and (key not in entries or entries[key]["kind"] == "entity"):
+                    entries[key] = {
+                        "term": term,
+                        "kind": "definition",
+                        "definition": _clip(sentence),
+                    }
+
+            for match in _ENTITY_RE.finditer(sentence):
+                name = match.group(0)
+                words = name.split()
+                if words[0] in _ENTITY_STOP_STARTS:
+                    name = " ".join(words[1:])
+                    if len(name.split()) < 2:
+                        continue
+                key = _key(name)
+                if key not in entries:
+                    entries[key] = {"term": name, "kind": "entity", "definition": _clip(sentence)}
+
+    return list(entries.values())
+
+
+class GlossaryIndex:
+    """
+    Terms extracted from completed sections, stored as glossary.json next to
+    state.json and updated per section as its content changes.
+
+    When several sections define a term, the one earliest in the book wins,
+    so later chapters are steered towards the first definition.
+    """
+
+    def __init__(self, output_dir: Path):
+        self.path = output_dir / GLOSSARY_FILENAME
+        # "chapter:section" -> {"hash": ..., "terms": [...]}
+        self.sections: dict[str, dict[str, Any]] = {}
+        # Book order of each "chapter:section", from state; earliest wins
+        self.order: dict[str, tuple[int, int]] = {}
+        self._merged: Optional[dict[str, dict[str, Any]]] = None
+        self.load()
+
+    def load(self) -> None:
+        """Read the index from disk, if present and current."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        self.sections = data.get("sections", {}) if data.get("version") == GLOSSARY_VERSION else {}
+        self._merged = None
+
+    def save(self) -> None:
+        """Write the index atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            dir=self.path.parent,
+            delete=False,
+            suffix=".json",
+            encoding="utf-8",
+        ) as f:
+            json.dump({"version": GLOSSARY_VERSION, "sections": self.sections}, f)
+            temp_path = Path(f.name)
+        temp_path.rename(self.path)
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """Hash used to skip re-extracting unchanged sections."""
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def is_current(self, chapter_id: str, section_id: str, content: str) -> bool:
+        """Whether the section's content has already been extracted."""
+        entry = self.sections.get(f"{chapter_id}:{section_id}")
+        return entry is not None and entry["hash"] == self.content_hash(content)
+
+    def set_terms(
+        self, chapter_id: str, section_id: str, content: str, terms: list[dict[str, Any]]
+    ) -> None:
+        """Record the terms extracted from a section's content."""
+        self.sections[f"{chapter_id}:{section_id}"] = {
+            "hash": self.content_hash(content),
+            "terms": terms,
+        }
+        self._merged = None
+
+    def prune(self, state: BookState) -> int:
+        """Drop sections that are no longer completed. Returns how many."""
+        live = {
+            f"{chapter_id}:{section_id}"
+            for chapter_id, chapter_state in state.chapters.items()
+            for section_id, section_state in chapter_state.sections.items()
+            if section_state.status == SectionStatus.COMPLETED
+        }
+        stale = [key for key in self.sections if key not in live]
+        for key in stale:
+            del self.sections[key]
+        self.order = {
+            f"{chapter_id}:{section_id}": (i, j)
+            for i, (chapter_id, chapter_state) in enumerate(state.chapters.items())
+            for j, section_id in enumerate(chapter_state.sections)
+        }
+        self._merged = None
+        return len(stale)
+
+    def entries(self) -> dict[str, dict[str, Any]]:
+        """Merged glossary keyed by lowercase term, earliest definition first."""
+        if self._merged is not None:
+            return self._merged
+
+        # Outline order, not the section ids' string order ("1.10" < "1.2");
+        # sections missing from state go last
+        merged: dict[str, dict[str, Any]] = {}
+        for key in sorted(self.sections, key=lambda key: self.order.get(key, (len(self.order),))):
+            chapter_id = key.partition(":")[0]
+            for term in self.sections[key]["terms"]:
+                term_key = _key(term["term"])
+                existing = merged.get(term_key)
+                if existing is None or (
+                    existing["kind"] == "entity" and term["kind"] == "definition"
+                ):
+                    merged[term_key] = {**term, "chapter_id": chapter_id}
+        self._merged = merged
+        return merged
+
+    def relevant(
+        self,
+        text: str,
+        max_tokens: int,
+        exclude_chapter: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Entries whose term appears in text (e.g. a section outline), from
+        other chapters, definitions first, packed within max_tokens.
+        """
+        text = " ".join(text.lower().split())
+        matches = [
+            entry
+            for term_key, entry in self.entries().items()
+            if entry["chapter_id"] != exclude_chapter
+            and re.search(rf"\b{re.escape(term_key)}\b", text)
+        ]
+        matches.sort(key=lambda entry: (entry["kind"] != "definition", -len(entry["term"])))
+
+        selected = []
+        used = 0
+        for entry in matches:
+            cost = count_tokens(entry["definition"], model) + 8
+            if used + cost > max_tokens:
+                continue
+            selected.append(entry)
+            used += cost
+        return selected
@@ -0,0 +1,67 @@
+"""Latency tracking and budget bookkeeping for hedged requests."""
+
+import math
+from collections import deque
+from typing import Any, Optional
+
+
+class LatencyTracker:
+    """Rolling window of observed request latencies per model."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, model: str, seconds: float) -> None:
+        """Record a latency sample for a model."""
+        samples = self._samples.setdefault(model, deque(maxlen=self.window))
+        samples.append(seconds)
+
+    def count(self, model: str) -> int:
+        """Number of samples recorded for a model."""
+        return len(self._samples.get(model, ()))
+
+    def percentile(self, model: str, pct: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Return the latency at the given percentile (0-1) for a model.
+        Returns None until at least min_samples have been observed.
+        """
+        samples = self._samples.get(model)
+        if not samples or len(samples) < max(1, min_samples):
+            return None
+
+        ordered = sorted(samples)
+        # Nearest-rank percentile
+        rank = max(1, math.ceil(pct * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+
+
+class HedgeStats:
+    """Counters for hedge requests fired during a run, bounded by a budget."""
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self.fired = 0
+        self.wins = 0
+        self.hedge_tokens = 0  # Tokens spent (or, if cancelled, estimated) by losing requests
+
+    @property
+    def remaining(self) -> int:
+        """Hedge requests still allowed in this run."""
+        return max(0, self.budget - self.fired)
+
+    def try_acquire(self) -> bool:
+        """Reserve one hedge from the budget. Returns False if exhausted."""
+        if self.remaining <= 0:
+            return False
+        self.fired += 1
+        return True
+
+    def summary(self) -> dict[str, Any]:
+        """Get hedge counters as a dict."""
+        return {
+            "fired": self.fired,
+            "wins": self.wins,
+            "hedge_tokens": self.hedge_tokens,
+            "budget": self.budget,
+        }
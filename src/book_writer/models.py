@@ -2,9 +2,9 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class SectionStatus(str, Enum):
@@ -37,6 +37,32 @@ class SectionOutline(BaseModel):
     line_end: int = 0
 
 
+class CandidateRecord(BaseModel):
+    """One sampled draft of a section, kept for audit."""
+
+    model: str
+    score: Optional[float] = None  # None if the draft failed
+    selected: bool = False
+    content_path: Optional[str] = None  # Relative to output dir
+    finish_reason: Optional[str] = None
+    token_count: Optional[int] = None
+    error: Optional[str] = None
+
+
+class SectionRevision(BaseModel):
+    """One completed version of a section; its text lives in the revision store."""
+
+    number: int  # 1-based, in order of creation
+    content_hash: str
+    created_at: datetime
+    model: Optional[str] = None
+    token_count: Optional[int] = None
+    prompt_tokens: Optional[int] = None
+    cost: Optional[float] = None
+    prompt_hash: Optional[str] = None  # Identifies the prompt that produced it
+    reverted_from: Optional[int] = None  # Set when created by reverting to an older revision
+
+
 class SectionState(BaseModel):
     """State tracking for a single section."""
 
@@ -45,9 +71,15 @@ class SectionState(BaseModel):
     retry_count: int = 0
     last_error: Optional[str] = None
     generated_content: Optional[str] = None
+    content_path: Optional[str] = None  # Relative to output dir when prose is stored on disk
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     token_count: Optional[int] = None
+    cached_tokens: Optional[int] = None  # Prompt cache hits for the accepted generation
+    prompt_tokens: Optional[int] = None
+    cost: Optional[float] = None
+    candidates: list[CandidateRecord] = Field(default_factory=list)  # Quality-gated drafts
+    revisions: list[SectionRevision] = Field(default_factory=list)
 
 
 class ChapterOutline(BaseModel):
@@ -92,6 +124,8 @@ class BookState(BaseModel):
     created_at: datetime
     updated_at: datetime
     chapters: dict[str, ChapterState] = Field(default_factory=dict)
+    tokens_used: int = 0  # Cumulative tokens across all runs, for budgets
+    cost_used: float = 0.0
 
     def get_pending_sections(self) -> list[tuple[str, str]]:
         """Return list of (chapter_id, section_id) pairs needing work."""
@@ -112,12 +146,83 @@ class BookState(BaseModel):
         return completed
 
 
+class TokenUsage(BaseModel):
+    """Token usage reported in an API response's usage block."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    cached_tokens: int = 0  # Prompt tokens served from the provider's prompt cache
+    cost: float = 0.0  # Credits charged, when the provider reports it
+
+    def add(self, other: "TokenUsage") -> "TokenUsage":
+        """Return the sum of two usage blocks."""
+        return TokenUsage(
+            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
+            completion_tokens=self.completion_tokens + other.completion_tokens,
+            total_tokens=self.total_tokens + other.total_tokens,
+            cached_tokens=self.cached_tokens + other.cached_tokens,
+            cost=self.cost + other.cost,
+        )
+
+
+class GenerationResult(BaseModel):
+    """A completed generation with the metadata needed for bookkeeping."""
+
+    content: str
+    model: str
+    finish_reason: Optional[str] = None
+    usage: TokenUsage = Field(default_factory=TokenUsage)  # Includes a hedge loser's spend
+    latency: float = 0.0  # Wall-clock seconds for the request
+    hedged: bool = False  # True if a hedge request produced this result
+    retries: int = 0  # Retries made before the request succeeded
+    continuations: int = 0  # Follow-up requests stitched on after length cut-offs
+
+
 class BookConfig(BaseModel):
     """Per-book configuration (config.yaml)."""
 
     title: str = "Untitled Book"
     model: str = "anthropic/claude-sonnet-4"
     max_concurrent_chapters: int = 5
+    hedging: bool = False  # Fire a duplicate request for slow sections
+    hedge_model: Optional[str] = None  # Fallback model used for hedge requests
+    hedge_budget: int = 10
+    low_memory: bool = False  # Keep generated prose on disk instead of in state.json
+    state_compression: Optional[str] = None  # none, gzip or zstd; unset keeps the current format
+    compact_state: bool = False  # Write state.json without indentation
+    schedule: Optional[str] = None  # order | priority | shortest | deadline
+    chapter_priorities: dict[str, int] = Field(default_factory=dict)  # Higher runs first
+    chapter_deadlines: dict[str, datetime] = Field(default_factory=dict)
+    token_budget: Optional[int] = None  # Per-book cap across all runs
+    cost_budget: Optional[float] = None
+    max_tokens_per_section: Optional[int] = None  # Output cap sent as max_tokens
+    context_window: Optional[int] = None  # Override the model's known context window
+    candidates: int = 1  # Drafts sampled per section; the best-scoring one is kept
+    candidate_models: list[str] = Field(default_factory=list)  # Rotated across drafts
+    candidate_chapters: list[str] = Field(default_factory=list)  # Empty means every chapter
+    judge_model: Optional[str] = None  # Score drafts with this model instead of locally
+    validators: list[str] = Field(default_factory=list)  # Opt-in checks from validation.py
+    validation_retries: int = 2  # Regenerations allowed for drafts that fail validation
+    dedupe_hints: bool = False  # Tell the next section which repeated passages to refer back to
+    dedupe_threshold: float = 0.5  # Paragraph similarity counted as a duplicate
+    glossary: bool = False  # Share terms defined in other chapters with each prompt
+    glossary_tokens: int = 600  # Prompt space allowed for glossary entries
+
+    @field_validator("chapter_priorities", "chapter_deadlines", mode="before")
+    @classmethod
+    def _chapter_keys_to_str(cls, value: Any) -> Any:
+        # YAML reads `3: 10` with an integer key
+        if isinstance(value, dict):
+            return {str(k): v for k, v in value.items()}
+        return value
+
+    @field_validator("candidate_chapters", mode="before")
+    @classmethod
+    def _chapter_ids_to_str(cls, value: Any) -> Any:
+        if isinstance(value, list):
+            return [str(v) for v in value]
+        return value
 
 
 class GenerationConfig(BaseModel):
@@ -128,3 +233,37 @@ class GenerationConfig(BaseModel):
     base_delay: float = 1.0  # Base delay for exponential backoff
     max_delay: float = 60.0  # Maximum delay cap
     max_concurrent_chapters: int = 5
+    hedge_enabled: bool = False
+    hedge_percentile: float = 0.9  # Hedge once a request exceeds this latency percentile
+    hedge_min_samples: int = 5  # Observed latencies required before hedging
+    hedge_model: Optional[str] = None  # Defaults to the primary model
+    hedge_budget: int = 10  # Max hedge requests per run
+    retry_budget: int = 50  # Max retries across all sections per run
+    breaker_threshold: int = 5  # Consecutive provider failures before pausing
+    breaker_cooldown: float = 30.0  # Seconds to pause once the breaker opens
+    low_memory: bool = False  # Store section prose on disk and stream it on demand
+    state_compression: Optional[str] = None
+    compact_state: bool = False
+    schedule: str = "order"  # Chapter scheduling policy, see scheduler.py
+    chapter_priorities: dict[str, int] = Field(default_factory=dict)
+    chapter_deadlines: dict[str, datetime] = Field(default_factory=dict)
+    book_token_budget: Optional[int] = None
+    book_cost_budget: Optional[float] = None
+    run_token_budget: Optional[int] = None
+    run_cost_budget: Optional[float] = None
+    expected_section_tokens: int = 1500  # Completion size assumed before any are observed
+    max_tokens: Optional[int] = None  # Per-request output cap, clamped to the window
+    context_window: Optional[int] = None  # Defaults to the model's entry in tokens.py
+    output_reserve_tokens: int = 16000  # Window space kept free for the response
+    max_continuations: int = 3  # Follow-ups when a response stops at the length limit
+    candidates: int = 1
+    candidate_models: list[str] = Field(default_factory=list)  # Defaults to [model]
+    candidate_chapters: list[str] = Field(default_factory=list)
+    judge_model: Optional[str] = None
+    validators: list[str] = Field(default_factory=list)
+    validation_retries: int = 2
+    worker_processes: int = 2  # For validation and extraction; 0 runs them inline
+    dedupe_hints: bool = False
+    dedupe_threshold: float = 0.5
+    glossary: bool = False
+    glossary_tokens: int = 600
@@ -1,28 +1,56 @@
 """OpenRouter API client with retry logic."""
 
-from typing import Optional
+import asyncio
+import time
+from typing import Any, Optional
 
 import httpx
-from tenacity import (
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential,
-)
 
-from .models import GenerationConfig
+from .hedging import HedgeStats, LatencyTracker
+from .models import GenerationConfig, GenerationResult, TokenUsage
+from .prompts import build_continuation_messages, stitch_continuation
+from .retry import CircuitBreaker, RetryBudget, RetryPolicy, parse_retry_after
+from .tokens import context_window, count_message_tokens
 
 
 class OpenRouterError(Exception):
     """Base exception for OpenRouter errors."""
 
-    pass
+    retryable = False
+
+    def __init__(self, message: str = "", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after  # Server-requested delay in seconds
+        self.retries = 0  # Retries made before this error was raised
 
 
 class RateLimitError(OpenRouterError):
     """Rate limit exceeded."""
 
-    pass
+    retryable = True
+
+
+class ServerError(OpenRouterError):
+    """Provider returned a 5xx response."""
+
+    retryable = True
+
+
+class NetworkError(OpenRouterError):
+    """Transport failure talking to the API."""
+
+    retryable = True
+
+    def __init__(self, message: str = "", request_sent: bool = True):
+        super().__init__(message)
+        # Connect failures never reached the provider, so cost nothing
+        self.request_sent = request_sent
+
+
+class RequestTimeoutError(OpenRouterError):
+    """Request was sent but no response arrived in time."""
+
+    retryable = True
 
 
 class APIError(OpenRouterError):
@@ -31,6 +59,14 @@ class APIError(OpenRouterError):
     pass
 
 
+class EmptyContentError(APIError):
+    """Response finished without any content."""
+
+    def __init__(self, message: str = "", finish_reason: Optional[str] = None):
+        super().__init__(message)
+        self.finish_reason = finish_reason
+
+
 class AuthenticationError(OpenRouterError):
     """Authentication failed."""
 
@@ -46,46 +82,219 @@ class OpenRouterClient:
         self.api_key = api_key
         self.config = config
         self.client = httpx.AsyncClient(timeout=120.0)
+        self.latency = LatencyTracker()
+        self.hedge_stats = HedgeStats(config.hedge_budget)
+        self.retry_policy = RetryPolicy(config.base_delay, config.max_delay)
+        self.retry_budget = RetryBudget(config.retry_budget)
+        self.breaker = CircuitBreaker(config.breaker_threshold, config.breaker_cooldown)
 
     async def generate(
         self,
-        messages: list[dict],
+        messages: list[dict[str, Any]],
         model: Optional[str] = None,
     ) -> str:
         """
         Generate completion with automatic retry logic.
-        Uses tenacity for exponential backoff.
+        Uses jittered exponential backoff driven by the generation config.
+        """
+        result = await self.generate_result(messages, model)
+        return result.content
+
+    async def generate_result(
+        self,
+        messages: list[dict[str, Any]],
+        model: Optional[str] = None,
+    ) -> GenerationResult:
+        """
+        Generate completion and return content with usage metadata.
+        Hedges slow requests when enabled in the generation config, and
+        continues responses cut off at the length limit.
         """
         model = model or self.config.model
 
         try:
-            response = await self._call_api_with_retry(messages, model)
-            return self._extract_content(response)
+            result = await self._generate_step(messages, model)
+            while (
+                result.finish_reason == "length"
+                and result.continuations < self.config.max_continuations
+            ):
+                result = await self._continue(messages, result)
+            return result
         except Exception as e:
             # Re-raise as OpenRouterError if not already
             if isinstance(e, OpenRouterError):
                 raise
             raise APIError(f"Unexpected error: {str(e)}") from e
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=60),
-        retry=retry_if_exception_type((RateLimitError, httpx.TimeoutException)),
-        reraise=True,
-    )
+    async def _generate_step(
+        self,
+        messages: list[dict[str, Any]],
+        model: str,
+    ) -> GenerationResult:
+        """Run one request, hedged if enabled."""
+        if self.config.hedge_enabled:
+            return await self._generate_hedged(messages, model)
+        return await self._generate_once(messages, model)
+
+    async def _continue(
+        self,
+        messages: list[dict[str, Any]],
+        partial: GenerationResult,
+    ) -> GenerationResult:
+        """Request the rest of a truncated response and stitch it on."""
+        try:
+            follow_up = await self._generate_step(
+                build_continuation_messages(messages, partial.content), partial.model
+            )
+        except EmptyContentError as e:
+            # Nothing came back to append; keep what was already written. A
+            # response cut off before any text still counts as truncated.
+            return partial.model_copy(
+                update={
+                    "finish_reason": "length" if e.finish_reason == "length" else "stop",
+                    "continuations": partial.continuations + 1,
+                }
+            )
+        return GenerationResult(
+            content=stitch_continuation(partial.content, follow_up.content),
+            model=partial.model,
+            finish_reason=follow_up.finish_reason,
+            usage=partial.usage.add(follow_up.usage),
+            latency=partial.latency + follow_up.latency,
+            hedged=partial.hedged or follow_up.hedged,
+            retries=partial.retries + follow_up.retries,
+            continuations=partial.continuations + 1,
+        )
+
+    async def _generate_once(
+        self,
+        messages: list[dict[str, Any]],
+        model: str,
+    ) -> GenerationResult:
+        """Run a single (retried) request and record its latency."""
+        start = time.monotonic()
+        # Cancelled requests (hedge losers) are left out of the latency window:
+        # their cut-short times would pull the percentile down
+        response, retries = await self._call_api_with_retry(messages, model)
+        latency = time.monotonic() - start
+        self.latency.record(model, latency)
+
+        content = self._extract_content(response)
+        choices = response.get("choices") or [{}]
+        return GenerationResult(
+            content=content,
+            model=model,
+            finish_reason=choices[0].get("finish_reason"),
+            usage=self._extract_usage(response),
+            latency=latency,
+            retries=retries,
+        )
+
+    async def _generate_hedged(
+        self,
+        messages: list[dict[str, Any]],
+        model: str,
+    ) -> GenerationResult:
+        """
+        Start the primary request and, if it outlives the model's observed
+        latency percentile, race a duplicate against it. The first successful
+        response wins and the other request is cancelled; the loser's spend
+        is added to the result's usage as hedge overhead.
+        """
+        threshold = self.latency.percentile(
+            model, self.config.hedge_percentile, self.config.hedge_min_samples
+        )
+        primary = asyncio.create_task(self._generate_once(messages, model))
+        hedge = None
+
+        # The finally also covers the caller being cancelled mid-race
+        try:
+            if threshold is None or self.hedge_stats.remaining <= 0:
+                return await primary
+
+            done, _ = await asyncio.wait({primary}, timeout=threshold)
+            if done or not self.hedge_stats.try_acquire():
+                return await primary
+
+            hedge_model = self.config.hedge_model or model
+            hedge = asyncio.create_task(self._generate_once(messages, hedge_model))
+            pending = {primary, hedge}
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [t for t in (primary, hedge) if t in done and t.exception() is None]
+                if succeeded:
+                    winner = succeeded[0]
+                    break
+                if not pending:
+                    # Both requests failed; result() re-raises the primary's error
+                    primary.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+        result = winner.result()
+        loser = hedge if winner is primary else primary
+        overhead = self._loser_usage(loser, result)
+        self.hedge_stats.hedge_tokens += overhead.total_tokens
+        result.usage = result.usage.add(overhead)
+        if winner is hedge:
+            self.hedge_stats.wins += 1
+            result.hedged = True
+        return result
+
+    @staticmethod
+    def _loser_usage(
+        loser: "asyncio.Task[GenerationResult]", winner: GenerationResult
+    ) -> TokenUsage:
+        """
+        Spend of the losing request in a hedged pair: its reported usage if it
+        finished, nothing if it failed, and otherwise the winner's usage as an
+        estimate, since the provider may bill a cancelled request in full.
+        """
+        if not loser.done():
+            return winner.usage.model_copy(update={"cached_tokens": 0})
+        if loser.cancelled() or loser.exception() is not None:
+            return TokenUsage()
+        return loser.result().usage
+
     async def _call_api_with_retry(
         self,
-        messages: list[dict],
+        messages: list[dict[str, Any]],
         model: str,
-    ) -> dict:
-        """Make single API call with retry wrapper."""
-        return await self._call_api(messages, model)
+    ) -> tuple[dict[str, Any], int]:
+        """
+        Make an API call, retrying transient failures.
+        Returns (response, retries). Raised errors carry their retry count.
+        """
+        retries = 0
+        while True:
+            is_probe = await self.breaker.acquire()
+            try:
+                return await self._call_api(messages, model), retries
+            except OpenRouterError as e:
+                e.retries = retries
+                if not e.retryable or retries >= self.config.max_retries:
+                    raise
+                # Connect failures never reached the provider; don't charge the budget
+                charge_budget = not (isinstance(e, NetworkError) and not e.request_sent)
+                if charge_budget and not self.retry_budget.try_spend():
+                    raise
+                delay = self.retry_policy.delay(retries, e.retry_after)
+            finally:
+                # A probe that was cancelled or failed without reaching the
+                # breaker must still free the slot, or every caller waits forever
+                if is_probe:
+                    self.breaker.abandon()
+
+            retries += 1
+            await asyncio.sleep(delay)
 
     async def _call_api(
         self,
-        messages: list[dict],
+        messages: list[dict[str, Any]],
         model: str,
-    ) -> dict:
+    ) -> dict[str, Any]:
         """Make a single API call to OpenRouter."""
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -94,13 +303,18 @@ class OpenRouterClient:
             "X-Title": "Non-Fiction Book Writer",
         }
 
-        payload = {
+        payload: dict[str, Any] = {
             "model": model,
             "messages": messages,
             "reasoning": {
                 "effort": "high"
-            }
+            },
+            # Ask OpenRouter to report credits charged in the usage block
+            "usage": {"include": True},
         }
+        max_tokens = self._max_tokens(messages, model)
+        if max_tokens is not None:
+            payload["max_tokens"] = max_tokens
 
         try:
             response = await self.client.post(
@@ -108,19 +322,35 @@ class OpenRouterClient:
                 headers=headers,
                 json=payload,
             )
-        except httpx.TimeoutException:
-            raise  # Let tenacity retry this
+        except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+            self.breaker.record_failure()
+            raise NetworkError(f"Connection failed: {e}", request_sent=False) from e
+        except httpx.TimeoutException as e:
+            self.breaker.record_failure()
+            raise RequestTimeoutError(f"Request timed out: {e}") from e
+        except httpx.TransportError as e:
+            self.breaker.record_failure()
+            raise NetworkError(f"Transport error: {e}") from e
 
         # Handle response status codes
+        if response.status_code >= 500:
+            # Server errors - retry, and count towards the circuit breaker
+            self.breaker.record_failure()
+            raise ServerError(
+                f"Server error: {response.status_code}",
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+            )
+
+        self.breaker.record_success()
         if response.status_code == 200:
             return response.json()
         elif response.status_code == 401:
             raise AuthenticationError("Invalid API key")
         elif response.status_code == 429:
-            raise RateLimitError("Rate limit exceeded")
-        elif response.status_code >= 500:
-            # Server errors - retry
-            raise RateLimitError(f"Server error: {response.status_code}")
+            raise RateLimitError(
+                "Rate limit exceeded",
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+            )
         else:
             # Client errors - don't retry
             try:
@@ -130,6 +360,17 @@ class OpenRouterClient:
                 error_msg = response.text
             raise APIError(f"API error ({response.status_code}): {error_msg}")
 
+    def _max_tokens(self, messages: list[dict[str, Any]], model: str) -> Optional[int]:
+        """Configured output cap, clamped to the room left in the model's window."""
+        if self.config.max_tokens is None:
+            return None
+        window = context_window(model, self.config.context_window)
+        room = window - count_message_tokens(messages, model)
+        if room <= 0:
+            # Prompt alone overflows; let the provider report it
+            return self.config.max_tokens
+        return min(self.config.max_tokens, room)
+
     def _extract_content(self, response: dict) -> str:
         """Extract generated content from API response."""
         try:
@@ -160,14 +401,26 @@ class OpenRouterClient:
             elif finish_reason == "error":
                 raise APIError("Model returned an error")
             elif finish_reason == "length":
-                raise APIError("Response truncated due to length limit")
+                raise EmptyContentError("Response truncated due to length limit", finish_reason)
 
-            raise APIError(
-                f"Empty content in response (finish_reason: {finish_reason})"
+            raise EmptyContentError(
+                f"Empty content in response (finish_reason: {finish_reason})", finish_reason
             )
         except KeyError as e:
             raise APIError(f"Unexpected response format: {e}")
 
+    def _extract_usage(self, response: dict) -> TokenUsage:
+        """Extract token usage from API response, if reported."""
+        usage = response.get("usage") or {}
+        prompt_details = usage.get("prompt_tokens_details") or {}
+        return TokenUsage(
+            prompt_tokens=usage.get("prompt_tokens") or 0,
+            completion_tokens=usage.get("completion_tokens") or 0,
+            total_tokens=usage.get("total_tokens") or 0,
+            cached_tokens=prompt_details.get("cached_tokens") or 0,
+            cost=usage.get("cost") or 0.0,
+        )
+
     async def close(self):
         """Close the HTTP client."""
         await self.client.aclose()
@@ -1,5 +1,6 @@
 """Parser for rubric markdown files."""
 
+import difflib
 import hashlib
 import re
 from pathlib import Path
@@ -9,13 +10,21 @@ from .models import BookOutline, ChapterOutline, SectionOutline
 
 def compute_rubric_hash(rubric_path: Path) -> str:
     """Compute SHA256 hash of rubric file for change detection."""
-    content = rubric_path.read_text(encoding="utf-8")
+    return compute_content_hash(rubric_path.read_text(encoding="utf-8"))
+
+
+def compute_content_hash(content: str) -> str:
+    """Compute SHA256 hash of rubric content."""
     return hashlib.sha256(content.encode()).hexdigest()
 
 
 def parse_rubric(rubric_path: Path) -> BookOutline:
     """Parse the complete rubric markdown into structured outline."""
-    content = rubric_path.read_text(encoding="utf-8")
+    return parse_rubric_text(rubric_path.read_text(encoding="utf-8"))
+
+
+def parse_rubric_text(content: str) -> BookOutline:
+    """Parse rubric markdown content into structured outline."""
     lines = content.split("\n")
 
     # Extract book title from first H1 or use default
@@ -82,6 +91,118 @@ def parse_rubric(rubric_path: Path) -> BookOutline:
     )
 
 
+def reparse_outline(outline: BookOutline, old_content: str, new_content: str) -> BookOutline:
+    """
+    Update an outline after a rubric edit, re-parsing only the chapters whose
+    line ranges (line_start/line_end) contain changed lines. Untouched
+    chapters are kept with their line numbers shifted. Falls back to a full
+    parse for structural edits (H1 lines) or edits outside any chapter.
+    """
+    old_lines = old_content.split("\n")
+    new_lines = new_content.split("\n")
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    opcodes = matcher.get_opcodes()
+    edits = [op for op in opcodes if op[0] != "equal"]
+
+    if not edits:
+        return outline
+
+    chapters = _all_chapters(outline)
+
+    for _, i1, i2, j1, j2 in edits:
+        touched = old_lines[i1:i2] + new_lines[j1:j2]
+        if any(line.startswith("# ") for line in touched):
+            return parse_rubric_text(new_content)
+        if not any(ch.line_start < i1 <= ch.line_end + 1 for ch in chapters):
+            return parse_rubric_text(new_content)
+
+    def map_line(line: int) -> int:
+        # Chapter headings are unchanged, so they always sit in an equal block
+        for tag, i1, i2, j1, _ in opcodes:
+            if tag == "equal" and i1 <= line < i2:
+                return j1 + (line - i1)
+        raise ValueError(f"Line {line} was edited")
+
+    def update(chapter: ChapterOutline) -> ChapterOutline:
+        new_start = map_line(chapter.line_start)
+        if any(chapter.line_start < i1 <= chapter.line_end + 1 for _, i1, _, _, _ in edits):
+            reparsed, _ = _parse_chapter(new_lines, new_start, chapter.id, chapter.number)
+            return reparsed
+
+        offset = new_start - chapter.line_start
+        return chapter.model_copy(
+            update={
+                "line_start": chapter.line_start + offset,
+                "line_end": chapter.line_end + offset,
+                "sections": [
+                    section.model_copy(
+                        update={
+                            "line_start": section.line_start + offset,
+                            "line_end": section.line_end + offset,
+                        }
+                    )
+                    for section in chapter.sections
+                ],
+            }
+        )
+
+    return outline.model_copy(
+        update={
+            "preface": update(outline.preface) if outline.preface else None,
+            "chapters": [update(ch) for ch in outline.chapters],
+            "appendices": [update(ap) for ap in outline.appendices],
+        }
+    )
+
+
+def diff_outlines(
+    old: BookOutline, new: BookOutline
+) -> tuple[dict[str, list[str]], list[str]]:
+    """
+    Compare two outlines, ignoring line numbers.
+
+    Returns (changed, removed): changed maps chapter ids to the section ids
+    whose outline changed (all sections if chapter-level fields changed or
+    the chapter is new); removed lists chapter ids no longer in the rubric.
+    """
+
+    section_keys = {"line_start", "line_end"}
+    old_chapters = {ch.id: ch for ch in _all_chapters(old)}
+    new_chapters = {ch.id: ch for ch in _all_chapters(new)}
+    changed: dict[str, list[str]] = {}
+
+    for chapter_id, chapter in new_chapters.items():
+        old_chapter = old_chapters.get(chapter_id)
+        if old_chapter is None or (old_chapter.title, old_chapter.goals) != (
+            chapter.title,
+            chapter.goals,
+        ):
+            changed[chapter_id] = [section.id for section in chapter.sections]
+            continue
+
+        old_sections = {
+            section.id: section.model_dump(exclude=section_keys)
+            for section in old_chapter.sections
+        }
+        section_ids = [
+            section.id
+            for section in chapter.sections
+            if old_sections.get(section.id) != section.model_dump(exclude=section_keys)
+        ]
+        reordered = [s.id for s in old_chapter.sections] != [s.id for s in chapter.sections]
+        if section_ids or reordered:
+            changed[chapter_id] = section_ids
+
+    removed = [chapter_id for chapter_id in old_chapters if chapter_id not in new_chapters]
+    return changed, removed
+
+
+def _all_chapters(outline: BookOutline) -> list[ChapterOutline]:
+    """Return preface, chapters and appendices in book order."""
+    preface = [outline.preface] if outline.preface else []
+    return preface + outline.chapters + outline.appendices
+
+
 def _parse_chapter(
     lines: list[str], start: int, chapter_id: str, chapter_num: int | None = None
 ) -> tuple[ChapterOutline, int]:
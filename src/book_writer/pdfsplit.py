@@ -0,0 +1,272 @@
+"""Chapter-split PDF builds: render chapters in parallel, cache them, merge at the end."""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from .converter import ConversionError, check_pdf_tools, get_pandoc_version, pdf_command
+from .export import chapter_title
+
+if TYPE_CHECKING:
+    from pypdf import PageObject
+
+CACHE_DIRNAME = "pdf_chapters"
+INDEX_FILENAME = "index.json"
+FRONT_KEY = "front_matter"  # Cache key of the title and contents pages
+SPLIT_VERSION = 2
+
+# Chapters are rendered without page numbers, so a render does not depend
+# on where the chapter lands; numbers are stamped in the footer at merge time
+_NO_NUMBERS = "\\pagestyle{empty}\n\\makeatletter\\let\\ps@plain\\ps@empty\\makeatother"
+FOOTER_FONT = "Times-Roman"
+FOOTER_SIZE = 11
+FOOTER_BASELINE = 42  # Points from the bottom edge: the 1in margin less LaTeX's footskip
+
+_ESCAPE_RE = re.compile(r"([!-/:-@\[-`{-~])")
+
+
+def _latex_block(command: str) -> str:
+    return f"```{{=latex}}\n{command}\n```\n\n"
+
+
+def _escape(text: str) -> str:
+    """Backslash-escape markdown punctuation in plain text."""
+    return _ESCAPE_RE.sub(r"\\\1", text)
+
+
+class ChapterCache:
+    """
+    One rendered PDF per chapter in output/pdf_chapters, with an index of
+    the content hash each was rendered from, its page count and its
+    bookmark outline.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.dir = cache_dir
+        self.index_path = cache_dir / INDEX_FILENAME
+        self.entries: dict[str, dict[str, Any]] = {}
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        if data.get("version") == SPLIT_VERSION:
+            self.entries = data.get("chapters", {})
+
+    def pdf_path(self, key: str) -> Path:
+        return self.dir / f"{key}.pdf"
+
+    def is_current(self, key: str, content_hash: str) -> bool:
+        """Whether the cached PDF was rendered from this content."""
+        entry = self.entries.get(key)
+        return (
+            entry is not None and entry["hash"] == content_hash and self.pdf_path(key).exists()
+        )
+
+    def prune(self, keep: set[str]) -> None:
+        """Drop chapters that are no longer in the book."""
+        for key in set(self.entries) - keep:
+            del self.entries[key]
+            self.pdf_path(key).unlink(missing_ok=True)
+
+    def save(self) -> None:
+        """Write the index atomically."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            mode="w", dir=self.dir, delete=False, suffix=".json", encoding="utf-8"
+        ) as f:
+            json.dump({"version": SPLIT_VERSION, "chapters": self.entries}, f, indent=2)
+            temp_path = Path(f.name)
+        temp_path.rename(self.index_path)
+
+
+def _read_outline(pdf_path: Path) -> tuple[int, list[list[Any]]]:
+    """Page count and [level, title, page index] bookmarks of a PDF."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(pdf_path)
+    outline: list[list[Any]] = []
+
+    def walk(items: list[Any], level: int) -> None:
+        for item in items:
+            if isinstance(item, list):
+                walk(item, level + 1)
+            else:
+                outline.append([level, item.title, reader.get_destination_page_number(item)])
+
+    walk(reader.outline, 1)
+    return len(reader.pages), outline
+
+
+def _render(markdown: str, output_pdf: Path, *options: str) -> None:
+    """Render markdown (passed on stdin) to output_pdf atomically."""
+    output_pdf.parent.mkdir(parents=True, exist_ok=True)
+    temp_pdf = output_pdf.with_name(f".{output_pdf.stem}.tmp.pdf")
+    try:
+        subprocess.run(
+            [*pdf_command(temp_pdf, toc=False), *options],
+            input=markdown,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        temp_pdf.unlink(missing_ok=True)
+        error_msg = e.stderr or e.stdout or "Unknown error"
+        raise ConversionError(f"PDF conversion of {output_pdf.stem} failed: {error_msg}")
+    temp_pdf.rename(output_pdf)
+
+
+def _render_chapter(chapter_file: Path, output_pdf: Path) -> None:
+    markdown = _latex_block(_NO_NUMBERS) + chapter_file.read_text(encoding="utf-8")
+    _render(markdown, output_pdf, "-V", "classoption=openany")
+
+
+def _stamp_number(page: "PageObject", number: int) -> None:
+    """Draw a page number centred in the footer of a merged page."""
+    from pypdf import PageObject
+    from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+    box = page.mediabox
+    text = str(number)
+    # Digits are half an em wide in Times
+    x = float(box.left) + (float(box.width) - len(text) * FOOTER_SIZE / 2) / 2
+    y = float(box.bottom) + FOOTER_BASELINE
+
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject(f"/{FOOTER_FONT}"),
+        }
+    )
+    content = DecodedStreamObject()
+    content.set_data(f"BT /F1 {FOOTER_SIZE} Tf {x:.2f} {y:.2f} Td ({text}) Tj ET".encode())
+    stamp = PageObject.create_blank_page(width=box.width, height=box.height)
+    stamp[NameObject("/Resources")] = DictionaryObject(
+        {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+    )
+    stamp[NameObject("/Contents")] = content
+    page.merge_page(stamp)
+
+
+def _contents_markdown(entries: list[tuple[int, str, int]]) -> str:
+    """Contents page listing (level, title, page) entries with dot leaders."""
+    lines = [_latex_block("\\pagestyle{plain}\n\\pagenumbering{roman}"), "# Contents {-}\n\n"]
+    for level, title, page in entries:
+        indent = "\\hspace{1.5em}" * (level - 1)
+        lines.append(f"{indent}{_escape(title)}\\dotfill {page}\\\n")
+    return "".join(lines)
+
+
+def build_split_pdf(
+    chapter_files: list[Path],
+    title: str,
+    output_pdf: Path,
+    cache_dir: Optional[Path] = None,
+    workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[str], None]] = None,
+) -> Path:
+    """
+    Render each chapter to its own PDF in parallel and merge them behind a
+    title and contents front matter, numbered in roman.
+
+    Chapter PDFs are rendered without page numbers and cached by content
+    hash, so an edit re-renders only that chapter; the numbers are stamped
+    on while merging. Requires Pandoc, LaTeX and the pypdf package.
+    """
+    check_pdf_tools()
+    try:
+        from pypdf import PdfWriter
+        from pypdf.constants import PageLabelStyle
+    except ImportError:
+        raise ConversionError(
+            "Split PDF builds require the pypdf package "
+            "(pip install 'business-book-writer[pdf]')"
+        ) from None
+
+    cache = ChapterCache(cache_dir or output_pdf.parent / CACHE_DIRNAME)
+    keys = [path.stem for path in chapter_files]
+    cache.prune(set(keys) | {FRONT_KEY})
+    version = get_pandoc_version() or ""
+    hashes = {
+        path.stem: hashlib.sha256(version.encode("utf-8") + path.read_bytes()).hexdigest()
+        for path in chapter_files
+    }
+
+    def render(path: Path) -> tuple[str, int, list[list[Any]]]:
+        key = path.stem
+        _render_chapter(path, cache.pdf_path(key))
+        return key, *_read_outline(cache.pdf_path(key))
+
+    stale = [path for path in chapter_files if not cache.is_current(path.stem, hashes[path.stem])]
+    if stale:
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            futures = [pool.submit(render, path) for path in stale]
+            try:
+                for future in as_completed(futures):
+                    key, pages, outline = future.result()
+                    cache.entries[key] = {"hash": hashes[key], "pages": pages, "outline": outline}
+                    if progress_callback:
+                        progress_callback(f"Rendered {key}: {pages} pages")
+            finally:
+                # An interrupted or failed build keeps the renders that finished
+                cache.save()
+
+    # Front matter: title page and contents, from each chapter's bookmarks
+    starts, page = {}, 1
+    for key in keys:
+        starts[key] = page
+        page += cache.entries[key]["pages"]
+    contents: list[tuple[int, str, int]] = []
+    for path in chapter_files:
+        outline = cache.entries[path.stem]["outline"] or [[1, chapter_title(path), 0]]
+        contents.extend(
+            (level, text, starts[path.stem] + page)
+            for level, text, page in outline
+            if level <= 2
+        )
+    front_markdown = _contents_markdown(contents)
+    front_hash = hashlib.sha256(
+        f"{version}\0{title}\0{front_markdown}".encode("utf-8")
+    ).hexdigest()
+    if not cache.is_current(FRONT_KEY, front_hash):
+        _render(front_markdown, cache.pdf_path(FRONT_KEY), "-M", f"title={title}")
+        pages, _ = _read_outline(cache.pdf_path(FRONT_KEY))
+        cache.entries[FRONT_KEY] = {"hash": front_hash, "pages": pages, "outline": []}
+        cache.save()
+    front_pdf = cache.pdf_path(FRONT_KEY)
+    front_pages = cache.entries[FRONT_KEY]["pages"]
+
+    writer = PdfWriter()
+    writer.append(front_pdf, import_outline=False)
+    offset = front_pages
+    for path in chapter_files:
+        entry = cache.entries[path.stem]
+        writer.append(cache.pdf_path(path.stem), import_outline=False)
+        parents: dict[int, Any] = {}
+        for level, text, page in entry["outline"] or [[1, chapter_title(path), 0]]:
+            parents[level] = writer.add_outline_item(
+                text, offset + page, parent=parents.get(level - 1)
+            )
+        offset += entry["pages"]
+
+    for index in range(front_pages, offset):
+        _stamp_number(writer.pages[index], index - front_pages + 1)
+
+    # Viewer page labels match the printed numbers
+    if front_pages:
+        writer.set_page_label(0, front_pages - 1, style=PageLabelStyle.LOWERCASE_ROMAN)
+    if offset > front_pages:
+        writer.set_page_label(front_pages, offset - 1, style=PageLabelStyle.DECIMAL, start=1)
+
+    temp_pdf = output_pdf.with_name(f".{output_pdf.stem}.tmp.pdf")
+    with open(temp_pdf, "wb") as f:
+        writer.write(f)
+    temp_pdf.rename(output_pdf)
+    return output_pdf
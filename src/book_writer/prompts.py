@@ -1,6 +1,14 @@
 """Prompt templates for LLM generation."""
 
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any, Optional
+
 from .models import ChapterOutline, SectionOutline
+from .tokens import MESSAGE_OVERHEAD_TOKENS, count_tokens
+
+if TYPE_CHECKING:
+    from .dedupe import DuplicateMatch
 
 SYSTEM_PROMPT = """You are an expert author writing a book titled "{book_title}".
 
@@ -26,18 +34,54 @@ IMPORTANT CONTENT RULES:
 - The final result should be lean but complete
 """
 
-SECTION_PROMPT = """## Current Task
-Write the content for section "{section_title}" of {chapter_type} {chapter_id}: {chapter_title}.
+# User messages are assembled stable-prefix first (chapter context, then
+# previously written sections in order) so providers can reuse cached
+# prefixes across a chapter's sections. Section-specific text comes last.
+CHAPTER_CONTEXT_PROMPT = """## Chapter Context
+You are writing {chapter_type} {chapter_id}: {chapter_title}.
 
 ## Chapter Goals
 {chapter_goals}
+"""
+
+PREVIOUS_SECTIONS_HEADER = """
+## Previously Written Sections in This Chapter
+"""
+
+PREVIOUS_SECTION_TEMPLATE = """
+### {title}
+
+{content}
+"""
+
+PREVIOUS_SECTION_SEPARATOR = "\n---\n"
+
+GLOSSARY_HEADER = """
+## Established Terms
+Other chapters of the book define these; use them consistently and don't redefine them:
+"""
+
+GLOSSARY_ENTRY_TEMPLATE = "- **{term}** (chapter {chapter_id}): {definition}\n"
+
+COVERED_HEADER = """
+## Already Covered Elsewhere
+The previous section repeated these passages from other chapters. Refer back to
+them briefly instead of retelling them:
+"""
+
+COVERED_ENTRY_TEMPLATE = '- Section {section_id}: "{snippet}"\n'
+
+OMITTED_SECTIONS_NOTE = """
+({count} earlier sections omitted to fit the context window)
+"""
+
+SECTION_PROMPT = """
+## Current Task
+Write the content for section "{section_title}" of {chapter_type} {chapter_id}: {chapter_title}.
 
 ## Section Outline (what to cover)
 {section_outline}
 
-## Previously Written Sections in This Chapter
-{previous_sections}
-
 ## Instructions
 1. Write ONLY this section's content based on the outline above
 2. Build naturally on the previous sections (if any)
@@ -50,14 +94,12 @@ Write the content for section "{section_title}" of {chapter_type} {chapter_id}:
 Begin writing the section content now:
 """
 
-FIRST_SECTION_PROMPT = """## Current Task
+FIRST_SECTION_PROMPT = """
+## Current Task
 Write the content for section "{section_title}" of {chapter_type} {chapter_id}: {chapter_title}.
 
 This is the FIRST section of the chapter, so establish the chapter's tone and themes.
 
-## Chapter Goals
-{chapter_goals}
-
 ## Section Outline (what to cover)
 {section_outline}
 
@@ -71,52 +113,355 @@ This is the FIRST section of the chapter, so establish the chapter's tone and th
 Begin writing the section content now:
 """
 
+# Model prefixes whose OpenRouter providers honour explicit cache_control
+# breakpoints. Other providers cache stable prefixes automatically.
+CACHE_CONTROL_MODEL_PREFIXES = ("anthropic/", "google/gemini")
 
-def build_section_prompt(
-    section: SectionOutline,
-    chapter: ChapterOutline,
-    book_title: str,
-    previous_sections: list[tuple[str, str]],  # [(section_title, content), ...]
-) -> list[dict]:
-    """Build the complete messages array for section generation."""
-    system_msg = SYSTEM_PROMPT.format(book_title=book_title)
 
-    # Determine chapter type
+def supports_cache_control(model: str) -> bool:
+    """Check whether a model accepts explicit cache_control breakpoints."""
+    return model.startswith(CACHE_CONTROL_MODEL_PREFIXES)
+
+
+def prompt_hash(messages: list[dict[str, Any]]) -> str:
+    """Short digest of a messages array, recorded with each revision."""
+    payload = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def get_chapter_display(chapter: ChapterOutline) -> tuple[str, str]:
+    """Return (chapter_type, display_id) for prompt text."""
     if chapter.id == "preface":
-        chapter_type = "Preface"
-        chapter_display_id = ""
+        return "Preface", ""
     elif chapter.id.startswith("appendix_"):
-        chapter_type = "Appendix"
-        chapter_display_id = chapter.id.replace("appendix_", "").upper()
-    else:
-        chapter_type = "Chapter"
-        chapter_display_id = chapter.id
-
-    if not previous_sections:
-        user_msg = FIRST_SECTION_PROMPT.format(
-            section_title=section.title,
-            chapter_type=chapter_type,
-            chapter_id=chapter_display_id,
+        return "Appendix", chapter.id.replace("appendix_", "").upper()
+    return "Chapter", chapter.id
+
+
+class ChapterPromptBuilder:
+    """
+    Builds section prompts for one chapter, appending each finished section
+    to the prefix instead of re-rendering the whole chapter per call.
+
+    The system prompt and chapter context are rendered once. Each previous
+    section is formatted, token-counted and hashed once when it is added,
+    so the prompt-building work across a chapter grows linearly.
+
+    Prompts are ordered so everything but the final task block is a stable,
+    append-only prefix. With cache_control, content is sent as text parts
+    with ephemeral cache breakpoints after the system prompt and after the
+    last previously written section. With max_prompt_tokens, the oldest
+    previous sections are dropped until the prompt fits.
+    """
+
+    def __init__(
+        self,
+        chapter: ChapterOutline,
+        book_title: str,
+        cache_control: bool = False,
+        max_prompt_tokens: Optional[int] = None,
+        model: Optional[str] = None,
+    ):
+        self.chapter = chapter
+        self.cache_control = cache_control
+        self.max_prompt_tokens = max_prompt_tokens
+        self.model = model
+
+        self.chapter_type, self.chapter_display_id = get_chapter_display(chapter)
+        self.system_msg = SYSTEM_PROMPT.format(book_title=book_title)
+        self.context_msg = CHAPTER_CONTEXT_PROMPT.format(
+            chapter_type=self.chapter_type,
+            chapter_id=self.chapter_display_id,
             chapter_title=chapter.title,
             chapter_goals=chapter.goals or "Not specified",
-            section_outline=section.outline_content,
-        )
-    else:
-        # Format previous sections
-        prev_text = "\n\n---\n\n".join(
-            [f"### {title}\n\n{content}" for title, content in previous_sections]
         )
-        user_msg = SECTION_PROMPT.format(
+
+        self._sections: list[str] = []  # Formatted previous sections
+        self._sizes: list[int] = []  # Token count of each, plus its separator
+        self._digest = hashlib.sha256()
+        for text in (self.system_msg, self.context_msg):
+            self._digest.update(text.encode("utf-8"))
+        self._fixed_tokens: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    @property
+    def sections(self) -> list[str]:
+        """Formatted text of the previous sections added so far."""
+        return list(self._sections)
+
+    def add_section(self, title: str, content: str) -> None:
+        """Append a finished section to the chapter's prefix."""
+        text = PREVIOUS_SECTION_TEMPLATE.format(title=title, content=content)
+        self._sections.append(text)
+        self._digest.update(text.encode("utf-8"))
+        if self.max_prompt_tokens is not None:
+            self._sizes.append(
+                count_tokens(text, self.model)
+                + count_tokens(PREVIOUS_SECTION_SEPARATOR, self.model)
+            )
+
+    def _omitted(self, task_msg: str) -> int:
+        """Number of oldest sections to drop so the prompt fits."""
+        if self.max_prompt_tokens is None or not self._sections:
+            return 0
+
+        if self._fixed_tokens is None:
+            self._fixed_tokens = (
+                sum(
+                    count_tokens(text, self.model)
+                    for text in (
+                        self.system_msg,
+                        self.context_msg,
+                        PREVIOUS_SECTIONS_HEADER,
+                        OMITTED_SECTIONS_NOTE,
+                    )
+                )
+                + 2 * MESSAGE_OVERHEAD_TOKENS
+            )
+
+        total = self._fixed_tokens + count_tokens(task_msg, self.model) + sum(self._sizes)
+        omitted = 0
+        while omitted < len(self._sizes) and total > self.max_prompt_tokens:
+            total -= self._sizes[omitted]
+            omitted += 1
+        return omitted
+
+    def prefix_parts(self, omitted: int = 0) -> list[str]:
+        """Text parts of the user message's stable prefix."""
+        parts = [self.context_msg]
+        if not self._sections:
+            return parts
+
+        parts.append(PREVIOUS_SECTIONS_HEADER)
+        if omitted:
+            parts.append(OMITTED_SECTIONS_NOTE.format(count=omitted))
+        for i, text in enumerate(self._sections[omitted:]):
+            if i > 0:
+                parts.append(PREVIOUS_SECTION_SEPARATOR)
+            parts.append(text)
+        return parts
+
+    def prefix_key(self, omitted: int = 0) -> str:
+        """SHA-256 identifying the stable prefix, for caching layers."""
+        if not omitted:
+            return self._digest.hexdigest()
+
+        digest = hashlib.sha256(self.system_msg.encode("utf-8"))
+        for text in self.prefix_parts(omitted):
+            digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def task_message(self, section: SectionOutline) -> str:
+        """Section-specific task block that follows the prefix."""
+        task_template = SECTION_PROMPT if self._sections else FIRST_SECTION_PROMPT
+        return task_template.format(
             section_title=section.title,
-            chapter_type=chapter_type,
-            chapter_id=chapter_display_id,
-            chapter_title=chapter.title,
-            chapter_goals=chapter.goals or "Not specified",
+            chapter_type=self.chapter_type,
+            chapter_id=self.chapter_display_id,
+            chapter_title=self.chapter.title,
             section_outline=section.outline_content,
-            previous_sections=prev_text,
         )
 
+    def build(
+        self,
+        section: SectionOutline,
+        glossary: Optional[str] = None,
+        covered: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Build the complete messages array for generating section. Glossary
+        and already-covered blocks go after the stable prefix, ahead of the
+        task.
+        """
+        task_msg = self.task_message(section)
+        task_msg = (glossary or "") + (covered or "") + task_msg
+        prefix_parts = self.prefix_parts(self._omitted(task_msg))
+
+        if not self.cache_control:
+            return [
+                {"role": "system", "content": self.system_msg},
+                {"role": "user", "content": "".join(prefix_parts) + task_msg},
+            ]
+
+        user_parts: list[dict[str, Any]] = [{"type": "text", "text": text} for text in prefix_parts]
+        user_parts[-1]["cache_control"] = {"type": "ephemeral"}
+        user_parts.append({"type": "text", "text": task_msg})
+
+        return [
+            {
+                "role": "system",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": self.system_msg,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ],
+            },
+            {"role": "user", "content": user_parts},
+        ]
+
+
+def format_glossary(entries: list[dict[str, Any]]) -> str:
+    """Render glossary entries as a prompt block."""
+    lines = [
+        GLOSSARY_ENTRY_TEMPLATE.format(
+            term=entry["term"],
+            chapter_id=entry["chapter_id"],
+            definition=entry["definition"],
+        )
+        for entry in entries
+    ]
+    return GLOSSARY_HEADER + "".join(lines)
+
+
+def format_covered(matches: list["DuplicateMatch"]) -> str:
+    """Render DuplicateMatch results as an already-covered prompt block."""
+    lines = [
+        COVERED_ENTRY_TEMPLATE.format(section_id=match.section_id, snippet=match.snippet)
+        for match in matches
+    ]
+    return COVERED_HEADER + "".join(lines)
+
+
+def build_section_prompt(
+    section: SectionOutline,
+    chapter: ChapterOutline,
+    book_title: str,
+    previous_sections: list[tuple[str, str]],  # [(section_title, content), ...]
+    cache_control: bool = False,
+    max_prompt_tokens: Optional[int] = None,
+    model: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """
+    Build the complete messages array for section generation.
+    One-off wrapper around ChapterPromptBuilder; see it for the layout.
+    """
+    builder = ChapterPromptBuilder(chapter, book_title, cache_control, max_prompt_tokens, model)
+    for title, content in previous_sections:
+        builder.add_section(title, content)
+    return builder.build(section)
+
+
+CONTINUATION_PROMPT = """Your previous response was cut off by the output length limit.
+Continue writing from exactly where it stopped. Do not repeat any text that
+was already written and do not add any preamble or commentary."""
+
+
+def build_continuation_messages(
+    messages: list[dict[str, Any]], partial: str
+) -> list[dict[str, Any]]:
+    """Extend a prompt with the truncated output and a request to continue it."""
+    return messages + [
+        {"role": "assistant", "content": partial},
+        {"role": "user", "content": CONTINUATION_PROMPT},
+    ]
+
+
+def _collapse_whitespace(text: str) -> tuple[str, list[int]]:
+    """
+    text without leading whitespace and with each whitespace run collapsed to
+    one space, plus for each kept character the index in text just past it.
+    """
+    chars: list[str] = []
+    ends: list[int] = []
+    space = False
+    for i, char in enumerate(text):
+        if char.isspace():
+            space = bool(chars)
+            continue
+        if space:
+            chars.append(" ")
+            ends.append(i)
+            space = False
+        chars.append(char)
+        ends.append(i + 1)
+    return "".join(chars), ends
+
+
+def stitch_continuation(
+    partial: str,
+    continuation: str,
+    min_overlap: int = 8,
+    max_overlap: int = 200,
+) -> str:
+    """
+    Append a continuation to truncated output, dropping any text the model
+    repeated from the end of the partial output. Overlaps are compared with
+    whitespace collapsed, as models often re-wrap the text they repeat;
+    overlaps shorter than min_overlap are treated as coincidence and kept.
+    An empty continuation leaves the partial output unchanged.
+    """
+    if not continuation.strip():
+        return partial
+
+    tail = " ".join(partial[-max_overlap:].split())
+    head, ends = _collapse_whitespace(continuation)
+    for size in range(min(len(tail), len(head)), min_overlap - 1, -1):
+        if head.startswith(tail[-size:]):
+            return partial + continuation[ends[size - 1] :]
+    return partial + continuation
+
+
+JUDGE_PROMPT = """You are reviewing {count} candidate drafts of section "{section_title}" \
+of {chapter_type} {chapter_id}: {chapter_title}.
+
+## Section Outline (what the section should cover)
+{section_outline}
+
+{candidates}
+
+Score each draft from 1 to 10 for coverage of the outline, clarity, accuracy
+and flow. Respond with JSON only, in draft order: {{"scores": [7, 9, ...]}}
+"""
+
+JUDGE_CANDIDATE_TEMPLATE = """## Draft {number}
+
+{content}
+"""
+
+
+def build_judge_prompt(
+    section: SectionOutline,
+    chapter: ChapterOutline,
+    candidates: list[str],
+) -> list[dict[str, Any]]:
+    """Build the messages asking a judge model to score candidate drafts."""
+    chapter_type, chapter_display_id = get_chapter_display(chapter)
+    drafts = "\n".join(
+        JUDGE_CANDIDATE_TEMPLATE.format(number=i, content=content)
+        for i, content in enumerate(candidates, 1)
+    )
     return [
-        {"role": "system", "content": system_msg},
-        {"role": "user", "content": user_msg},
+        {
+            "role": "user",
+            "content": JUDGE_PROMPT.format(
+                count=len(candidates),
+                section_title=section.title,
+                chapter_type=chapter_type,
+                chapter_id=chapter_display_id,
+                chapter_title=chapter.title,
+                section_outline=section.outline_content,
+                candidates=drafts,
+            ),
+        }
+    ]
+
+
+VALIDATION_RETRY_PROMPT = """Your previous draft of this section was rejected for these problems:
+{problems}
+
+Write the section again from the start, fixing these problems and following
+all of the original instructions."""
+
+
+def build_validation_retry_messages(
+    messages: list[dict[str, Any]], problems: list[str]
+) -> list[dict[str, Any]]:
+    """Extend a prompt with the validation problems found in a rejected draft."""
+    problem_list = "\n".join(f"- {problem}" for problem in problems)
+    return messages + [
+        {"role": "user", "content": VALIDATION_RETRY_PROMPT.format(problems=problem_list)}
     ]
@@ -0,0 +1,206 @@
+"""Staged publish pipeline: assemble book.md, then convert to each format in parallel."""
+
+import hashlib
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from pydantic import BaseModel
+
+from .converter import (
+    ConversionError,
+    convert_to_epub,
+    convert_to_html,
+    convert_to_pdf,
+    get_pandoc_version,
+)
+from .export import EXPORT_VERSION, export_epub, export_html
+from .generator import combine_chapters, list_chapter_files
+from .models import BookOutline
+from .pdfsplit import SPLIT_VERSION, build_split_pdf
+
+MANIFEST_FILENAME = "publish.json"
+MANIFEST_VERSION = 1
+
+# Output format -> (converter, output filename)
+FORMATS: dict[str, tuple[Callable[[Path, Path], Path], str]] = {
+    "pdf": (convert_to_pdf, "book.pdf"),
+    "epub": (convert_to_epub, "book.epub"),
+    "html": (convert_to_html, "book.html"),
+}
+
+# Built-in exporters, which render the chapter files without Pandoc
+BUILTIN_FORMATS: dict[str, Callable[[list[Path], str, Path], Path]] = {
+    "epub": export_epub,
+    "html": export_html,
+}
+
+ENGINES = ("pandoc", "builtin")
+
+
+class StageResult(BaseModel):
+    """Outcome of one publish stage."""
+
+    stage: str
+    status: str  # "built", "skipped" or "failed"
+    path: Optional[Path] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+def _hash_files(paths: list[Path], *extra: str) -> str:
+    digest = hashlib.sha256()
+    for value in extra:
+        digest.update(value.encode("utf-8"))
+        digest.update(b"\0")
+    for path in paths:
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class PublishManifest:
+    """
+    Inputs hash and output path of each stage's last successful build,
+    stored as publish.json in the output directory.
+    """
+
+    def __init__(self, output_dir: Path):
+        self.path = output_dir / MANIFEST_FILENAME
+        self.stages: dict[str, dict[str, str]] = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        if data.get("version") == MANIFEST_VERSION:
+            self.stages = data.get("stages", {})
+
+    def is_current(self, stage: str, inputs_hash: str) -> bool:
+        """Whether the stage was last built from these inputs and its output is intact."""
+        entry = self.stages.get(stage)
+        if entry is None or entry["inputs"] != inputs_hash:
+            return False
+        output = self.path.parent / entry["output"]
+        return output.exists() and _hash_files([output]) == entry["output_hash"]
+
+    def record(self, stage: str, inputs_hash: str, output: Path) -> None:
+        """Record a successful build and save the manifest."""
+        self.stages[stage] = {
+            "inputs": inputs_hash,
+            "output": output.relative_to(self.path.parent).as_posix(),
+            "output_hash": _hash_files([output]),
+            "built_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.save()
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            dir=self.path.parent,
+            delete=False,
+            suffix=".json",
+            encoding="utf-8",
+        ) as f:
+            json.dump({"version": MANIFEST_VERSION, "stages": self.stages}, f, indent=2)
+            temp_path = Path(f.name)
+        temp_path.rename(self.path)
+
+
+def publish(
+    output_dir: Path,
+    outline: BookOutline,
+    formats: list[str],
+    force: bool = False,
+    progress_callback: Optional[Callable[[StageResult], None]] = None,
+    engine: str = "pandoc",
+    split_pdf: bool = False,
+) -> list[StageResult]:
+    """
+    Assemble book.md from the chapter files, then build each format
+    concurrently. Stages whose inputs match the manifest are skipped
+    unless force is set; failed stages are retried on the next run.
+
+    engine="builtin" renders EPUB and HTML straight from the chapter files
+    without Pandoc; it cannot build PDF. split_pdf renders the PDF one
+    chapter at a time (see pdfsplit.build_split_pdf).
+    """
+    manifest = PublishManifest(output_dir)
+    results = []
+
+    def report(result: StageResult) -> None:
+        results.append(result)
+        if progress_callback:
+            progress_callback(result)
+
+    # Stage 1: assemble
+    started = time.perf_counter()
+    book_md = output_dir / "book.md"
+    chapter_files = list_chapter_files(output_dir)
+    inputs = _hash_files(chapter_files, outline.title)
+    if not force and manifest.is_current("assemble", inputs):
+        report(StageResult(stage="assemble", status="skipped", path=book_md))
+    else:
+        book_md = combine_chapters(output_dir, outline)
+        manifest.record("assemble", inputs, book_md)
+        report(
+            StageResult(
+                stage="assemble",
+                status="built",
+                path=book_md,
+                seconds=time.perf_counter() - started,
+            )
+        )
+
+    # Stage 2: formats, in parallel; pandoc and the built-in exporter both do
+    # their work in subprocesses, so threads suffice
+    if engine == "builtin":
+        book_hash = _hash_files(chapter_files, outline.title, engine, EXPORT_VERSION)
+    else:
+        book_hash = _hash_files([book_md], get_pandoc_version() or "")
+    inputs_hashes = {name: book_hash for name in formats}
+    if split_pdf and engine != "builtin" and "pdf" in formats:
+        inputs_hashes["pdf"] = _hash_files(
+            chapter_files, outline.title, f"split{SPLIT_VERSION}", get_pandoc_version() or ""
+        )
+
+    pending = []
+    for name in formats:
+        if not force and manifest.is_current(name, inputs_hashes[name]):
+            report(StageResult(stage=name, status="skipped", path=output_dir / FORMATS[name][1]))
+        else:
+            pending.append(name)
+
+    def build(name: str) -> StageResult:
+        converter, filename = FORMATS[name]
+        started = time.perf_counter()
+        try:
+            if engine != "builtin" and name == "pdf" and split_pdf:
+                path = build_split_pdf(chapter_files, outline.title, output_dir / filename)
+            elif engine != "builtin":
+                path = converter(book_md, output_dir / filename)
+            elif name in BUILTIN_FORMATS:
+                path = BUILTIN_FORMATS[name](chapter_files, outline.title, output_dir / filename)
+            else:
+                raise ConversionError(f"The builtin engine cannot build {name}; use pandoc")
+        except ConversionError as e:
+            return StageResult(stage=name, status="failed", error=str(e))
+        return StageResult(
+            stage=name, status="built", path=path, seconds=time.perf_counter() - started
+        )
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+            futures = [pool.submit(build, name) for name in pending]
+            for future in as_completed(futures):
+                result = future.result()
+                # Recorded as each finishes, so an interrupted run keeps its progress
+                if result.status == "built" and result.path is not None:
+                    manifest.record(result.stage, inputs_hashes[result.stage], result.path)
+                report(result)
+
+    return results
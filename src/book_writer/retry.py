@@ -0,0 +1,152 @@
+"""Retry policy, per-run retry budget and circuit breaker for API calls."""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, honouring Retry-After hints."""
+
+    def __init__(self, base_delay: float, max_delay: float):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait before retry number attempt + 1 (attempt starts at 0).
+        A server-provided Retry-After is used as a floor; both are capped at
+        max_delay.
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2**attempt))
+        delay = random.uniform(min(self.base_delay, ceiling), ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return min(delay, self.max_delay)
+
+
+class RetryBudget:
+    """Caps the total number of retries across all sections in a run."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.spent = 0
+
+    @property
+    def remaining(self) -> int:
+        """Retries still allowed in this run."""
+        return max(0, self.total - self.spent)
+
+    def try_spend(self) -> bool:
+        """Consume one retry. Returns False if the budget is exhausted."""
+        if self.remaining <= 0:
+            return False
+        self.spent += 1
+        return True
+
+
+class CircuitBreaker:
+    """
+    Shared breaker that pauses all callers while the provider is down.
+
+    After threshold consecutive provider failures the breaker opens and
+    callers wait out the cooldown instead of failing. Then a single probe
+    request is let through: success closes the breaker, failure reopens it
+    with a doubled cooldown (capped at max_cooldown).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold: int, cooldown: float, max_cooldown: float = 300.0):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._cooldown = cooldown
+        self._opened_until = 0.0
+        self._probing = False
+        self._probe_done = asyncio.Event()
+
+    async def acquire(self) -> bool:
+        """Wait until a request may be sent. Returns True for the probe request."""
+        while True:
+            if self.state == self.CLOSED:
+                return False
+
+            if self.state == self.OPEN:
+                remaining = self._opened_until - time.monotonic()
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+                    continue
+                self.state = self.HALF_OPEN
+
+            if not self._probing:
+                self._probing = True
+                self._probe_done.clear()
+                return True
+
+            await self._probe_done.wait()
+
+    def record_success(self) -> None:
+        """Record that the provider answered (any non-outage response)."""
+        self.failures = 0
+        if self.state != self.CLOSED:
+            self.state = self.CLOSED
+            self._cooldown = self.base_cooldown
+            self._end_probe()
+
+    def record_failure(self) -> None:
+        """Record a provider outage signal (5xx, network failure or timeout)."""
+        self.failures += 1
+        if self.state == self.HALF_OPEN:
+            self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+            self._open()
+        elif self.state == self.CLOSED and self.failures >= self.threshold:
+            self._open()
+
+    def abandon(self) -> None:
+        """
+        Release the probe slot when the probe ended without recording a
+        success or failure (cancelled, or an error the breaker never saw).
+        A no-op once the probe's result has been recorded.
+        """
+        if self.state == self.HALF_OPEN:
+            self._end_probe()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.trips += 1
+        self.failures = 0
+        self._opened_until = time.monotonic() + self._cooldown
+        self._end_probe()
+
+    def _end_probe(self) -> None:
+        self._probing = False
+        self._probe_done.set()
@@ -0,0 +1,67 @@
+"""Content-addressed store for section revisions."""
+
+import difflib
+import hashlib
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Optional
+
+REVISIONS_DIRNAME = "revisions"
+
+
+class RevisionStore:
+    """
+    Section prose stored once per distinct text, zlib-compressed, under
+    revisions/<hash[:2]>/<hash>.z in the output directory.
+
+    Regenerating a section to identical text, or reverting to an earlier
+    revision, adds no new object.
+    """
+
+    def __init__(self, output_dir: Path):
+        self.root = output_dir / REVISIONS_DIRNAME
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """Key under which content is stored."""
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _path(self, content_hash: str) -> Path:
+        return self.root / content_hash[:2] / f"{content_hash}.z"
+
+    def put(self, content: str) -> str:
+        """Store content if new and return its hash."""
+        content_hash = self.content_hash(content)
+        path = self._path(content_hash)
+        if path.exists():
+            return content_hash
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False, suffix=".z") as f:
+            f.write(zlib.compress(content.encode("utf-8"), 9))
+            temp_path = Path(f.name)
+        temp_path.rename(path)
+        return content_hash
+
+    def get(self, content_hash: str) -> Optional[str]:
+        """Return stored content, or None if the object is missing."""
+        try:
+            return zlib.decompress(self._path(content_hash).read_bytes()).decode("utf-8")
+        except (OSError, zlib.error):
+            return None
+
+
+def diff_revisions(
+    old: str, new: str, old_label: str = "old", new_label: str = "new", context: int = 3
+) -> str:
+    """Unified line diff between two revisions' text."""
+    return "".join(
+        difflib.unified_diff(
+            old.splitlines(keepends=True),
+            new.splitlines(keepends=True),
+            fromfile=old_label,
+            tofile=new_label,
+            n=context,
+        )
+    )
@@ -0,0 +1,116 @@
+"""Chapter scheduling policies and completion-time projection."""
+
+import heapq
+import statistics
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from .models import BookState, GenerationConfig, SectionStatus
+
+SCHEDULE_POLICIES = ("order", "priority", "shortest", "deadline")
+
+DEFAULT_SECTION_SECONDS = 60.0
+
+
+def estimate_section_seconds(
+    state: BookState, default: float = DEFAULT_SECTION_SECONDS
+) -> float:
+    """Median observed generation time of completed sections in the state."""
+    durations = [
+        (section.completed_at - section.started_at).total_seconds()
+        for chapter in state.chapters.values()
+        for section in chapter.sections.values()
+        if section.status == SectionStatus.COMPLETED
+        and section.started_at
+        and section.completed_at
+        and section.completed_at >= section.started_at
+    ]
+    if not durations:
+        return default
+    return statistics.median(durations)
+
+
+def _local_naive(value: datetime) -> datetime:
+    """Convert aware datetimes to naive local time, matching datetime.now()."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+class ChapterScheduler:
+    """Orders chapters for generation and projects when each will finish."""
+
+    def __init__(
+        self,
+        config: GenerationConfig,
+        state: BookState,
+        section_seconds: Optional[float] = None,
+    ):
+        if config.schedule not in SCHEDULE_POLICIES:
+            raise ValueError(
+                f"Unknown schedule '{config.schedule}', expected one of {SCHEDULE_POLICIES}"
+            )
+        self.config = config
+        self.state = state
+        self.section_seconds = section_seconds or estimate_section_seconds(state)
+
+    def remaining_sections(self, chapter_id: str) -> int:
+        """Number of sections in a chapter that still need generating."""
+        chapter_state = self.state.chapters.get(chapter_id)
+        if not chapter_state:
+            return 0
+        return sum(
+            1
+            for section in chapter_state.sections.values()
+            if section.status != SectionStatus.COMPLETED
+        )
+
+    def remaining_seconds(self, chapter_id: str) -> float:
+        """Estimated time to finish a chapter (its sections run sequentially)."""
+        return self.remaining_sections(chapter_id) * self.section_seconds
+
+    def deadline(self, chapter_id: str) -> Optional[datetime]:
+        """Configured deadline for a chapter, as naive local time."""
+        deadline = self.config.chapter_deadlines.get(chapter_id)
+        return _local_naive(deadline) if deadline else None
+
+    def order(self, chapter_ids: list[str]) -> list[str]:
+        """Return chapter ids in the order they should acquire a worker slot."""
+        position = {chapter_id: i for i, chapter_id in enumerate(chapter_ids)}
+        policy = self.config.schedule
+
+        priorities = self.config.chapter_priorities
+
+        def key(chapter_id: str) -> tuple[Any, ...]:
+            if policy == "priority":
+                return (-priorities.get(chapter_id, 0), position[chapter_id])
+            if policy == "shortest":
+                return (self.remaining_sections(chapter_id), position[chapter_id])
+            if policy == "deadline":
+                deadline = self.deadline(chapter_id)
+                return (deadline is None, deadline or datetime.max, position[chapter_id])
+            return (position[chapter_id],)
+
+        return sorted(chapter_ids, key=key)
+
+    def project(
+        self,
+        chapter_ids: list[str],
+        start: Optional[datetime] = None,
+    ) -> dict[str, datetime]:
+        """
+        Project the completion time of each chapter, assuming chapters take
+        worker slots in the given order, max_concurrent_chapters at a time.
+        """
+        start = start or datetime.now()
+        slots = [0.0] * max(1, self.config.max_concurrent_chapters)
+        heapq.heapify(slots)
+
+        projections = {}
+        for chapter_id in chapter_ids:
+            slot_free = heapq.heappop(slots)
+            finish = slot_free + self.remaining_seconds(chapter_id)
+            heapq.heappush(slots, finish)
+            projections[chapter_id] = start + timedelta(seconds=finish)
+
+        return projections
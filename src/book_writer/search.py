@@ -0,0 +1,203 @@
+"""Full-text search over generated section content, backed by SQLite FTS5."""
+
+import hashlib
+import re
+import sqlite3
+from pathlib import Path
+from typing import Callable, Optional
+
+from pydantic import BaseModel
+
+from .models import BookState, SectionState, SectionStatus
+
+SEARCH_FILENAME = "search.db"
+SEARCH_VERSION = 1
+
+SNIPPET_TOKENS = 16  # Words of context around matches in a snippet
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS sections (
+    key TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    rowid_ref INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS content USING fts5(
+    chapter_id UNINDEXED,
+    section_id UNINDEXED,
+    body,
+    tokenize = 'porter unicode61'
+);
+"""
+
+_TERM_RE = re.compile(r"\w+\*?")
+
+
+class SearchHit(BaseModel):
+    """A section matching a search query."""
+
+    book: Optional[str] = None  # Book directory name when searching several books
+    chapter_id: str
+    section_id: str
+    snippet: str
+    rank: float  # bm25 score; lower is a better match
+
+
+def fts_query(query: str) -> str:
+    """
+    Turn a plain query into an FTS5 expression.
+
+    Words are ANDed together; a trailing * keeps prefix matching and a
+    double-quoted span is searched as a phrase.
+    """
+    parts = []
+    for phrase, words in re.findall(r'"([^"]*)"|([^"]+)', query):
+        if phrase:
+            terms = _TERM_RE.findall(phrase.replace("*", ""))
+            if terms:
+                parts.append('"' + " ".join(terms) + '"')
+        for term in _TERM_RE.findall(words):
+            if term.endswith("*"):
+                parts.append(f'"{term[:-1]}"*')
+            else:
+                parts.append(f'"{term}"')
+    return " ".join(parts)
+
+
+class SearchIndex:
+    """
+    Inverted index of completed sections, stored as search.db next to
+    state.json.
+
+    StateManager keeps it current as sections complete or are reset;
+    sync() rebuilds it from state for books generated before it existed.
+    """
+
+    def __init__(self, output_dir: Path, read_only: bool = False):
+        self.path = output_dir / SEARCH_FILENAME
+        self.read_only = read_only  # Skips schema setup, for searching many books
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None and self.read_only:
+            self._conn = sqlite3.connect(f"{self.path.as_uri()}?mode=ro", uri=True)
+        elif self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.executescript(_SCHEMA)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or int(row[0]) != SEARCH_VERSION:
+                conn.executescript("DELETE FROM sections; DELETE FROM content;")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(SEARCH_VERSION),)
+                )
+                conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _remove(self, key: str) -> bool:
+        row = self.conn.execute("SELECT rowid_ref FROM sections WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False
+        self.conn.execute("DELETE FROM content WHERE rowid = ?", (row[0],))
+        self.conn.execute("DELETE FROM sections WHERE key = ?", (key,))
+        return True
+
+    def remove_section(self, chapter_id: str, section_id: str) -> bool:
+        """Drop a section from the index. Returns True if it was present."""
+        with self.conn:
+            return self._remove(f"{chapter_id}:{section_id}")
+
+    def _update(self, chapter_id: str, section_id: str, content: str) -> bool:
+        key = f"{chapter_id}:{section_id}"
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        row = self.conn.execute("SELECT hash FROM sections WHERE key = ?", (key,)).fetchone()
+        if row is not None and row[0] == content_hash:
+            return False
+
+        self._remove(key)
+        cursor = self.conn.execute(
+            "INSERT INTO content (chapter_id, section_id, body) VALUES (?, ?, ?)",
+            (chapter_id, section_id, content),
+        )
+        self.conn.execute(
+            "INSERT INTO sections VALUES (?, ?, ?)", (key, content_hash, cursor.lastrowid)
+        )
+        return True
+
+    def update_section(self, chapter_id: str, section_id: str, content: str) -> bool:
+        """(Re)index a section. Returns False if its content was already indexed."""
+        with self.conn:
+            return self._update(chapter_id, section_id, content)
+
+    def sync(
+        self, state: BookState, get_content: Callable[[SectionState], Optional[str]]
+    ) -> int:
+        """
+        Bring the index in line with the completed sections in state.
+        get_content maps a SectionState to its prose. Returns the number of
+        sections added, changed or removed.
+        """
+        changed = 0
+        live = set()
+        with self.conn:
+            for chapter_id, chapter_state in state.chapters.items():
+                for section_id, section_state in chapter_state.sections.items():
+                    if section_state.status != SectionStatus.COMPLETED:
+                        continue
+                    content = get_content(section_state)
+                    if not content:
+                        continue
+                    live.add(f"{chapter_id}:{section_id}")
+                    changed += self._update(chapter_id, section_id, content)
+
+            keys = [row[0] for row in self.conn.execute("SELECT key FROM sections")]
+            for key in keys:
+                if key not in live:
+                    changed += self._remove(key)
+        return changed
+
+    def search(self, query: str, limit: int = 20) -> list[SearchHit]:
+        """Sections matching query, best first, with highlighted snippets."""
+        expression = fts_query(query)
+        if not expression:
+            return []
+
+        rows = self.conn.execute(
+            "SELECT chapter_id, section_id, "
+            f"snippet(content, 2, '[', ']', '...', {SNIPPET_TOKENS}), bm25(content) "
+            "FROM content WHERE content MATCH ? ORDER BY bm25(content) LIMIT ?",
+            (expression, limit),
+        ).fetchall()
+        return [
+            SearchHit(
+                chapter_id=chapter_id,
+                section_id=section_id,
+                snippet=" ".join(snippet.split()),
+                rank=rank,
+            )
+            for chapter_id, section_id, snippet, rank in rows
+        ]
+
+
+def search_books(book_dirs: list[Path], query: str, limit: int = 20) -> list[SearchHit]:
+    """Search the indexes of several books, best matches first."""
+    hits = []
+    for book_dir in book_dirs:
+        if not (book_dir / "output" / SEARCH_FILENAME).exists():
+            continue
+        index = SearchIndex(book_dir / "output", read_only=True)
+        try:
+            for hit in index.search(query, limit):
+                hit.book = book_dir.name
+                hits.append(hit)
+        finally:
+            index.close()
+    return sorted(hits, key=lambda hit: hit.rank)[:limit]
@@ -0,0 +1,17 @@
+"""Environment-backed application settings."""
+
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """Application settings loaded from environment."""
+
+    openrouter_api_key: str = ""
+    default_model: str = "anthropic/claude-sonnet-4"
+    max_retries: int = 3
+    max_concurrent_chapters: int = 5
+
+    class Config:
+        env_file = ".env"
+        env_prefix = ""
+        extra = "ignore"
@@ -1,59 +1,176 @@
 """State management for book generation with resume capability."""
 
 import json
-import tempfile
+import weakref
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from .models import (
     BookOutline,
     BookState,
+    CandidateRecord,
     ChapterState,
     ChapterStatus,
+    SectionRevision,
     SectionState,
     SectionStatus,
 )
+from .revisions import RevisionStore
+from .search import SearchIndex
+from .storage import (
+    COMPRESSION_METHODS,
+    STATE_FILENAME,
+    find_state_file,
+    method_for,
+    read_text,
+    state_files,
+    with_suffix,
+    write_text,
+)
+from .summary import read_summary, write_summary
 
 
 class StateManager:
     """Manages persistent state for book generation."""
 
-    def __init__(self, output_dir: Path):
+    def __init__(
+        self,
+        output_dir: Path,
+        low_memory: bool = False,
+        compression: Optional[str] = None,
+        compact: bool = False,
+    ):
         self.output_dir = output_dir
-        self.state_file = output_dir / "state.json"
+        self.state_file = output_dir / STATE_FILENAME
+        self.sections_dir = output_dir / "sections"
+        self.low_memory = low_memory
+        # "none", "gzip" or "zstd"; None keeps the format already on disk
+        self.compression = compression
+        self.compact = compact  # Write state without indentation
+        self.search = SearchIndex(output_dir)
+        self.revisions = RevisionStore(output_dir)
+        # Serialized chapters from the last save, reused for unchanged chapters
+        self._chapter_json: dict[str, str] = {}
+        # (state, indent) the fragments belong to; a weak reference, as an
+        # id() can be reused by a state loaded after the old one is freed
+        self._serialized: Optional[tuple[weakref.ref[BookState], Optional[int]]] = None
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
     def load_state(self) -> Optional[BookState]:
         """Load existing state from disk, return None if not found."""
-        if not self.state_file.exists():
+        state_file = find_state_file(self.output_dir)
+        if state_file is None:
             return None
 
         try:
-            data = json.loads(self.state_file.read_text(encoding="utf-8"))
-            return BookState.model_validate(data)
-        except (json.JSONDecodeError, ValueError) as e:
+            # Validating straight from JSON skips building intermediate dicts
+            return BookState.model_validate_json(read_text(state_file))
+        except (OSError, ValueError) as e:
             # Log error and return None to trigger reinitialization
             print(f"Warning: Could not load state file: {e}")
             return None
 
-    def save_state(self, state: BookState) -> None:
-        """Atomically save state to disk (write to temp, rename)."""
+    def save_state(self, state: BookState, changed: Optional[set[str]] = None) -> None:
+        """
+        Atomically save state to disk (write to temp, rename).
+        With changed, only those chapters are re-serialized; the others
+        reuse their JSON from the previous save of the same state object.
+        """
         state.updated_at = datetime.now()
 
-        # Write to temp file first, then rename for atomicity
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            dir=self.output_dir,
-            delete=False,
-            suffix=".json",
-            encoding="utf-8",
-        ) as f:
-            f.write(state.model_dump_json(indent=2))
-            temp_path = Path(f.name)
-
-        # Atomic rename
-        temp_path.rename(self.state_file)
+        data = self._serialize(state, changed)
+        written = write_text(self.state_file, data, self._compression())
+
+        # Drop copies in other formats so readers can't pick up a stale one
+        for path in state_files(self.output_dir):
+            if path != written:
+                path.unlink(missing_ok=True)
+
+        # Refresh the sidecar summary; a crash before this leaves it stale,
+        # which readers detect and fall back to a full load
+        self._write_summary(state)
+
+    def _serialize(self, state: BookState, changed: Optional[set[str]]) -> str:
+        """Build the state JSON from per-chapter fragments."""
+        indent = None if self.compact else 2
+        if (
+            changed is None
+            or self._serialized is None
+            or self._serialized[0]() is not state
+            or self._serialized[1] != indent
+        ):
+            self._chapter_json = {}
+            self._serialized = (weakref.ref(state), indent)
+
+        chapter_json = {}
+        for chapter_id, chapter_state in state.chapters.items():
+            fragment = self._chapter_json.get(chapter_id)
+            if fragment is None or (changed is not None and chapter_id in changed):
+                fragment = chapter_state.model_dump_json(indent=indent)
+                if indent:
+                    fragment = fragment.replace("\n", "\n    ")
+            chapter_json[chapter_id] = fragment
+        self._chapter_json = chapter_json
+
+        # Splice the fragments into the top-level object with a single join,
+        # so the (possibly large) chapter strings are copied only once
+        head = state.model_dump_json(indent=indent, exclude={"chapters"})
+        if indent:
+            parts = [head[:-2], ',\n  "chapters": {']
+            separator, entry, tail = ",", "\n    {}: ", "\n  }\n}"
+        else:
+            parts = [head[:-1], ',"chapters":{']
+            separator, entry, tail = ",", "{}:", "}}"
+        for i, (chapter_id, fragment) in enumerate(chapter_json.items()):
+            if i:
+                parts.append(separator)
+            parts.append(entry.format(json.dumps(chapter_id)))
+            parts.append(fragment)
+        parts.append(tail)
+        return "".join(parts)
+
+    def _compression(self) -> Optional[str]:
+        """Method for new writes: the configured one, else the current state file's."""
+        if self.compression is not None:
+            return self.compression
+        state_file = find_state_file(self.output_dir)
+        return method_for(state_file) if state_file else None
+
+    def load_summary(self) -> Optional[dict[str, Any]]:
+        """
+        Return the compact progress summary, rebuilding it from the full
+        state if it is missing or stale. Returns None if there is no state.
+        """
+        summary = read_summary(self.output_dir)
+        if summary is not None:
+            return summary
+
+        state = self.load_state()
+        if state is None:
+            return None
+        return self._write_summary(state)
+
+    def _write_summary(self, state: BookState) -> dict[str, Any]:
+        """Build the summary for a state and write it next to state.json."""
+        chapters = {}
+        for chapter_id, chapter_state in state.chapters.items():
+            chapters[chapter_id] = {
+                "status": chapter_state.status.value,
+                **self.get_chapter_progress(state, chapter_id),
+            }
+
+        return write_summary(
+            self.output_dir,
+            {
+                "model": state.model,
+                "rubric_hash": state.rubric_hash,
+                "created_at": state.created_at.isoformat(sep=" "),
+                "updated_at": state.updated_at.isoformat(sep=" "),
+                "chapters": chapters,
+                "overall": self.get_overall_progress(state),
+            },
+        )
 
     def initialize_state(
         self, outline: BookOutline, model: str, rubric_hash: str
@@ -84,6 +201,7 @@ class StateManager:
         )
 
         self.save_state(state)
+        self._sync_search(state)
         return state
 
     def _create_chapter_state(self, chapter) -> ChapterState:
@@ -103,8 +221,65 @@ class StateManager:
         content: Optional[str] = None,
         error: Optional[str] = None,
         token_count: Optional[int] = None,
+        cached_tokens: Optional[int] = None,
+        retries: int = 0,
+        prompt_tokens: Optional[int] = None,
+        cost: Optional[float] = None,
+        candidates: Optional[list[CandidateRecord]] = None,
+        model: Optional[str] = None,
+        prompt_hash: Optional[str] = None,
     ) -> BookState:
         """Update section state and persist immediately."""
+        self._apply_section_update(
+            state,
+            chapter_id,
+            section_id,
+            status,
+            content=content,
+            error=error,
+            token_count=token_count,
+            cached_tokens=cached_tokens,
+            retries=retries,
+            prompt_tokens=prompt_tokens,
+            cost=cost,
+            candidates=candidates,
+            model=model,
+            prompt_hash=prompt_hash,
+        )
+
+        # Persist immediately
+        self.save_state(state, {chapter_id})
+        return state
+
+    def update_sections(self, state: BookState, updates: list[dict[str, Any]]) -> BookState:
+        """
+        Apply several section updates and persist once.
+        Each update holds the keyword arguments accepted by update_section.
+        """
+        for update in updates:
+            self._apply_section_update(state, **update)
+
+        self.save_state(state, {update["chapter_id"] for update in updates})
+        return state
+
+    def _apply_section_update(
+        self,
+        state: BookState,
+        chapter_id: str,
+        section_id: str,
+        status: SectionStatus,
+        content: Optional[str] = None,
+        error: Optional[str] = None,
+        token_count: Optional[int] = None,
+        cached_tokens: Optional[int] = None,
+        retries: int = 0,
+        prompt_tokens: Optional[int] = None,
+        cost: Optional[float] = None,
+        candidates: Optional[list[CandidateRecord]] = None,
+        model: Optional[str] = None,
+        prompt_hash: Optional[str] = None,
+    ) -> None:
+        """Update section and chapter status in memory without saving."""
         if chapter_id not in state.chapters:
             raise ValueError(f"Chapter {chapter_id} not found in state")
 
@@ -116,24 +291,183 @@ class StateManager:
 
         # Update section state
         section_state.status = status
+        section_state.retry_count += retries
 
         if status == SectionStatus.IN_PROGRESS:
             section_state.started_at = datetime.now()
         elif status == SectionStatus.COMPLETED:
+            if content is not None:
+                self._add_revision(
+                    section_state,
+                    content,
+                    model=model,
+                    token_count=token_count,
+                    prompt_tokens=prompt_tokens,
+                    cost=cost,
+                    prompt_hash=prompt_hash,
+                )
             section_state.completed_at = datetime.now()
-            section_state.generated_content = content
+            self._set_section_content(chapter_id, section_state, content)
             section_state.token_count = token_count
+            section_state.cached_tokens = cached_tokens
+            section_state.prompt_tokens = prompt_tokens
+            section_state.cost = cost
+            section_state.candidates = candidates or []
+            if content is not None:
+                self.search.update_section(chapter_id, section_id, content)
         elif status == SectionStatus.FAILED:
             section_state.last_error = error
             section_state.retry_count += 1
+            if self.get_section_content(section_state):
+                # A requeued section failed to regenerate; its text stays current
+                section_state.status = SectionStatus.COMPLETED
+        elif error is not None:
+            # Requeued, e.g. after failing validation
+            section_state.last_error = error
+
+        if section_state.status != SectionStatus.COMPLETED and self.search.path.exists():
+            self.search.remove_section(chapter_id, section_id)
+
+        # Book-wide usage counters for budgets
+        state.tokens_used += token_count or 0
+        state.cost_used += cost or 0.0
 
         # Update chapter status
         self._update_chapter_status(chapter_state)
 
-        # Persist immediately
+    def _set_section_content(
+        self, chapter_id: str, section_state: SectionState, content: Optional[str]
+    ) -> None:
+        """Hold a section's prose in state, or on disk in low-memory mode."""
+        if self.low_memory and content is not None:
+            section_state.content_path = self._store_section_content(
+                chapter_id, section_state.section_id, content
+            )
+            section_state.generated_content = None
+        else:
+            section_state.generated_content = content
+            section_state.content_path = None
+
+    def _add_revision(
+        self, section_state: SectionState, content: str, **metadata: Any
+    ) -> None:
+        """Keep content as the section's next revision, unless it matches the latest."""
+        content_hash = self.revisions.put(content)
+        if not section_state.revisions:
+            previous = self.get_section_content(section_state)
+            if previous and previous != content:
+                self._backfill_revision(section_state, previous)
+        elif section_state.revisions[-1].content_hash == content_hash:
+            return
+
+        section_state.revisions.append(
+            SectionRevision(
+                number=len(section_state.revisions) + 1,
+                content_hash=content_hash,
+                created_at=datetime.now(),
+                **metadata,
+            )
+        )
+
+    def _backfill_revision(self, section_state: SectionState, content: str) -> None:
+        """Record prose completed before revisions were kept as revision 1."""
+        section_state.revisions.append(
+            SectionRevision(
+                number=1,
+                content_hash=self.revisions.put(content),
+                created_at=section_state.completed_at or datetime.now(),
+                token_count=section_state.token_count,
+                prompt_tokens=section_state.prompt_tokens,
+                cost=section_state.cost,
+            )
+        )
+
+    def get_revision_content(self, section_state: SectionState, number: int) -> str:
+        """Return the text of one of a section's revisions."""
+        for revision in section_state.revisions:
+            if revision.number == number:
+                content = self.revisions.get(revision.content_hash)
+                if content is None:
+                    raise ValueError(f"Revision {number} content is missing from the store")
+                return content
+        raise ValueError(f"Section {section_state.section_id} has no revision {number}")
+
+    def revert_section(
+        self, state: BookState, chapter_id: str, section_id: str, number: int
+    ) -> BookState:
+        """
+        Make an earlier revision the section's current content. The revert
+        is recorded as a new revision, so history is never rewritten.
+        """
+        if chapter_id not in state.chapters:
+            raise ValueError(f"Chapter {chapter_id} not found in state")
+        chapter_state = state.chapters[chapter_id]
+        if section_id not in chapter_state.sections:
+            raise ValueError(f"Section {section_id} not found in chapter {chapter_id}")
+
+        section_state = chapter_state.sections[section_id]
+        content = self.get_revision_content(section_state, number)
+        source = next(r for r in section_state.revisions if r.number == number)
+
+        section_state.revisions.append(
+            source.model_copy(
+                update={
+                    "number": len(section_state.revisions) + 1,
+                    "created_at": datetime.now(),
+                    "reverted_from": number,
+                }
+            )
+        )
+        section_state.status = SectionStatus.COMPLETED
+        section_state.completed_at = datetime.now()
+        section_state.last_error = None
+        self._set_section_content(chapter_id, section_state, content)
+        section_state.token_count = source.token_count
+        section_state.prompt_tokens = source.prompt_tokens
+        section_state.cost = source.cost
+        self.search.update_section(chapter_id, section_id, content)
+
+        self._update_chapter_status(chapter_state)
         self.save_state(state)
         return state
 
+    def _sync_search(self, state: BookState) -> None:
+        """Drop sections that state no longer has as completed from the search index."""
+        if self.search.path.exists():
+            self.search.sync(state, self.get_section_content)
+
+    def get_section_content(self, section_state: SectionState) -> Optional[str]:
+        """Return a section's prose, reading it from disk if stored there."""
+        if section_state.generated_content is not None:
+            return section_state.generated_content
+
+        if section_state.content_path:
+            path = self.output_dir / section_state.content_path
+            if path.exists():
+                return read_text(path)
+
+        return None
+
+    def _store_section_content(self, chapter_id: str, section_id: str, content: str) -> str:
+        """Write section prose to the sections directory, return its relative path."""
+        path = self.sections_dir / chapter_id / f"{section_id}.md"
+        written = write_text(path, content, self._compression())
+        for method in COMPRESSION_METHODS:
+            if with_suffix(path, method) != written:
+                with_suffix(path, method).unlink(missing_ok=True)
+        return written.relative_to(self.output_dir).as_posix()
+
+    def store_candidate(
+        self, chapter_id: str, section_id: str, index: int, content: str
+    ) -> str:
+        """Write a candidate draft to the candidates directory, return its relative path."""
+        chapter_dir = self.output_dir / "candidates" / chapter_id
+        chapter_dir.mkdir(parents=True, exist_ok=True)
+
+        path = chapter_dir / f"{section_id}.{index}.md"
+        path.write_text(content, encoding="utf-8")
+        return path.relative_to(self.output_dir).as_posix()
+
     def _update_chapter_status(self, chapter_state: ChapterState) -> None:
         """Recalculate chapter status based on section states."""
         statuses = [s.status for s in chapter_state.sections.values()]
@@ -167,10 +501,105 @@ class StateManager:
             self.save_state(state)
         return state
 
+    def apply_outline_changes(
+        self,
+        state: BookState,
+        outline: BookOutline,
+        changed: dict[str, list[str]],
+        removed: list[str],
+        rubric_hash: str,
+    ) -> BookState:
+        """
+        Sync state with an edited rubric without reinitializing it.
+
+        Removed chapters are dropped; for changed chapters, sections are
+        added/removed to match the outline and the listed sections are reset
+        to PENDING. The new rubric hash is recorded so later runs resume.
+        """
+        chapters = {
+            chapter.id: chapter
+            for chapter in [outline.preface, *outline.chapters, *outline.appendices]
+            if chapter is not None
+        }
+
+        for chapter_id in removed:
+            state.chapters.pop(chapter_id, None)
+
+        for chapter_id, section_ids in changed.items():
+            chapter = chapters[chapter_id]
+            chapter_state = state.chapters.get(chapter_id)
+            if chapter_state is None:
+                state.chapters[chapter_id] = self._create_chapter_state(chapter)
+                continue
+
+            existing = chapter_state.sections
+            chapter_state.sections = {
+                section.id: existing.get(section.id) or SectionState(section_id=section.id)
+                for section in chapter.sections
+            }
+            for section_id in section_ids:
+                # Reset for regeneration, keeping the section's history
+                previous = existing.get(section_id)
+                chapter_state.sections[section_id] = SectionState(
+                    section_id=section_id,
+                    revisions=previous.revisions if previous else [],
+                )
+
+            self._update_chapter_status(chapter_state)
+
+        state.rubric_hash = rubric_hash
+        self.save_state(state)
+        self._sync_search(state)
+        return state
+
     def should_reinitialize(self, state: BookState, rubric_hash: str) -> bool:
         """Check if rubric changed, requiring new state."""
         return state.rubric_hash != rubric_hash
 
+    def downstream_sections(
+        self, state: BookState, chapter_id: str, section_ids: list[str]
+    ) -> list[str]:
+        """
+        Completed sections after the earliest of section_ids in the chapter.
+        They were generated with those sections in their prompt context.
+        """
+        sections = list(state.chapters[chapter_id].sections.items())
+        positions = [i for i, (section_id, _) in enumerate(sections) if section_id in section_ids]
+        if not positions:
+            return []
+        return [
+            section_id
+            for section_id, section_state in sections[min(positions) + 1 :]
+            if section_id not in section_ids and section_state.status == SectionStatus.COMPLETED
+        ]
+
+    def requeue_sections(self, state: BookState, sections: list[tuple[str, str]]) -> BookState:
+        """
+        Reset (chapter_id, section_id) pairs to PENDING for regeneration.
+
+        Their current prose is kept (and recorded as a revision if it
+        predates revision history) until a replacement completes; if
+        regeneration fails the section returns to COMPLETED with it.
+        """
+        for chapter_id, section_id in sections:
+            section_state = state.chapters[chapter_id].sections[section_id]
+            content = self.get_section_content(section_state)
+            if content and not section_state.revisions:
+                self._backfill_revision(section_state, content)
+
+        self.update_sections(
+            state,
+            [
+                {
+                    "chapter_id": chapter_id,
+                    "section_id": section_id,
+                    "status": SectionStatus.PENDING,
+                }
+                for chapter_id, section_id in sections
+            ],
+        )
+        return state
+
     def reset_failed_sections(self, state: BookState) -> BookState:
         """Reset all failed sections to pending for retry."""
         for chapter_state in state.chapters.values():
@@ -185,7 +614,7 @@ class StateManager:
         self.save_state(state)
         return state
 
-    def get_chapter_progress(self, state: BookState, chapter_id: str) -> dict:
+    def get_chapter_progress(self, state: BookState, chapter_id: str) -> dict[str, Any]:
         """Get progress summary for a chapter."""
         if chapter_id not in state.chapters:
             return {"total": 0, "completed": 0, "failed": 0, "pending": 0}
@@ -201,16 +630,18 @@ class StateManager:
             "in_progress": sum(1 for s in statuses if s == SectionStatus.IN_PROGRESS),
         }
 
-    def get_overall_progress(self, state: BookState) -> dict:
+    def get_overall_progress(self, state: BookState) -> dict[str, Any]:
         """Get overall progress summary."""
         total_sections = 0
         completed = 0
         failed = 0
         pending = 0
+        cached_tokens = 0
 
         for chapter_state in state.chapters.values():
             for section_state in chapter_state.sections.values():
                 total_sections += 1
+                cached_tokens += section_state.cached_tokens or 0
                 if section_state.status == SectionStatus.COMPLETED:
                     completed += 1
                 elif section_state.status == SectionStatus.FAILED:
@@ -225,4 +656,5 @@ class StateManager:
             "failed": failed,
             "pending": pending,
             "in_progress": total_sections - completed - failed - pending,
+            "cached_tokens": cached_tokens,
         }
@@ -0,0 +1,109 @@
+"""Optional compression for state.json and stored section prose."""
+
+import gzip
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Optional
+
+STATE_FILENAME = "state.json"
+
+# Compression methods and the suffix added to compressed files
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+COMPRESSION_METHODS = ("none", *COMPRESSION_SUFFIXES)
+
+# State is rewritten after every section, so favour speed over ratio
+GZIP_LEVEL = 1
+ZSTD_LEVEL = 3
+
+
+def check_compression(method: Optional[str]) -> None:
+    """Raise ValueError for an unknown method or a missing zstandard package."""
+    if method is None:
+        return
+    if method not in COMPRESSION_METHODS:
+        raise ValueError(
+            f"Unknown compression '{method}', expected one of {list(COMPRESSION_METHODS)}"
+        )
+    if method == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            raise ValueError("zstd compression requires the zstandard package") from None
+
+
+def method_for(path: Path) -> Optional[str]:
+    """Compression method implied by a file's suffix, or None if uncompressed."""
+    for method, suffix in COMPRESSION_SUFFIXES.items():
+        if path.name.endswith(suffix):
+            return method
+    return None
+
+
+def with_suffix(path: Path, method: Optional[str]) -> Path:
+    """Path for an uncompressed file name once compressed with method."""
+    return path.with_name(path.name + COMPRESSION_SUFFIXES.get(method or "none", ""))
+
+
+def compress(data: bytes, method: Optional[str]) -> bytes:
+    """Compress data with method ("none" or None leaves it as is)."""
+    if method == "gzip":
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if method == "zstd":
+        import zstandard
+
+        compressed: bytes = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        return compressed
+    return data
+
+
+def decompress(data: bytes, method: Optional[str]) -> bytes:
+    """Reverse compress(); raises ValueError for corrupt or unreadable data."""
+    if method == "gzip":
+        try:
+            return gzip.decompress(data)
+        except (EOFError, OSError, zlib.error) as e:
+            raise ValueError(f"Corrupt gzip data: {e}") from e
+    if method == "zstd":
+        check_compression(method)
+        import zstandard
+
+        try:
+            decompressed: bytes = zstandard.ZstdDecompressor().decompress(data)
+            return decompressed
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Corrupt zstd data: {e}") from e
+    return data
+
+
+def read_text(path: Path) -> str:
+    """Read a text file, decompressing it according to its suffix."""
+    return decompress(path.read_bytes(), method_for(path)).decode("utf-8")
+
+
+def write_text(path: Path, text: str, method: Optional[str] = None) -> Path:
+    """
+    Atomically write text (write to temp, rename), compressed with method.
+    path is the uncompressed name; returns the path actually written.
+    """
+    target = with_suffix(path, method)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=target.parent, delete=False, suffix=".tmp") as f:
+        f.write(compress(text.encode("utf-8"), method))
+        temp_path = Path(f.name)
+    temp_path.rename(target)
+    return target
+
+
+def state_files(output_dir: Path) -> list[Path]:
+    """Existing state files in any format, most recently written first."""
+    base = output_dir / STATE_FILENAME
+    paths = [with_suffix(base, method) for method in COMPRESSION_METHODS]
+    existing = [path for path in paths if path.exists()]
+    return sorted(existing, key=lambda path: path.stat().st_mtime_ns, reverse=True)
+
+
+def find_state_file(output_dir: Path) -> Optional[Path]:
+    """The current state file (plain or compressed), or None if there is none."""
+    files = state_files(output_dir)
+    return files[0] if files else None
@@ -0,0 +1,71 @@
+"""Compact progress summary kept next to state.json.
+
+Reading the summary needs only the json module, so `status` and `list`
+can report progress without loading and validating the full state.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+from .storage import find_state_file
+
+SUMMARY_FILENAME = "summary.json"
+SUMMARY_VERSION = 1
+
+
+def read_summary(output_dir: Path) -> Optional[dict[str, Any]]:
+    """
+    Return the summary if it was written for the current state file.
+    Returns None when missing, unreadable or stale.
+    """
+    summary_file = output_dir / SUMMARY_FILENAME
+    state_file = find_state_file(output_dir)
+    if state_file is None:
+        return None
+
+    try:
+        summary: dict[str, Any] = json.loads(summary_file.read_text(encoding="utf-8"))
+        stat = state_file.stat()
+    except (OSError, ValueError):
+        return None
+
+    if (
+        summary.get("version") != SUMMARY_VERSION
+        or summary.get("state_mtime_ns") != stat.st_mtime_ns
+        or summary.get("state_size") != stat.st_size
+    ):
+        return None
+
+    return summary
+
+
+def write_summary(output_dir: Path, summary: dict[str, Any]) -> dict[str, Any]:
+    """
+    Stamp the summary with the current state file's mtime and size, then
+    write it atomically. Must be called after the state file is replaced.
+    """
+    state_file = find_state_file(output_dir)
+    if state_file is None:
+        raise FileNotFoundError(f"No state file in {output_dir}")
+    stat = state_file.stat()
+    summary = {
+        **summary,
+        "version": SUMMARY_VERSION,
+        "state_mtime_ns": stat.st_mtime_ns,
+        "state_size": stat.st_size,
+    }
+
+    with tempfile.NamedTemporaryFile(
+        mode="w",
+        dir=output_dir,
+        delete=False,
+        suffix=".json",
+        encoding="utf-8",
+    ) as f:
+        f.write(json.dumps(summary))  # One write; json.dump streams many small ones
+        temp_path = Path(f.name)
+
+    temp_path.rename(output_dir / SUMMARY_FILENAME)
+    return summary
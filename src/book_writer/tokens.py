@@ -0,0 +1,156 @@
+"""Local token counting with pluggable tokenizers and per-model context windows."""
+
+import hashlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+# Rough characters-per-token ratio for English prose
+CHARS_PER_TOKEN = 4
+
+# Tokens added per chat message for role and framing
+MESSAGE_OVERHEAD_TOKENS = 4
+
+DEFAULT_CONTEXT_WINDOW = 128_000
+
+# Context windows by model prefix; the longest matching prefix wins.
+# Override per book with context_window in config.yaml.
+CONTEXT_WINDOWS = {
+    "anthropic/": 200_000,
+    "google/gemini": 1_000_000,
+    "openai/gpt-4.1": 1_000_000,
+    "openai/": 128_000,
+    "deepseek/": 64_000,
+}
+
+
+class Tokenizer(ABC):
+    """Counts tokens in text for one family of models."""
+
+    name = "base"
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """Return the number of tokens in text."""
+
+
+class HeuristicTokenizer(Tokenizer):
+    """Dependency-free estimate from character length."""
+
+    name = "heuristic"
+
+    def __init__(self, chars_per_token: int = CHARS_PER_TOKEN):
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        return len(text) // self.chars_per_token + 1
+
+
+class TiktokenTokenizer(Tokenizer):
+    """Exact counts for OpenAI-family models (requires the tiktoken package)."""
+
+    def __init__(self, encoding: str = "o200k_base"):
+        import tiktoken
+
+        self.name = f"tiktoken:{encoding}"
+        self._encoding = tiktoken.get_encoding(encoding)
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+TokenizerFactory = Callable[[], Tokenizer]
+
+_FACTORIES: dict[str, TokenizerFactory] = {
+    "openai/": TiktokenTokenizer,
+}
+_TOKENIZERS: dict[str, Tokenizer] = {}
+_HEURISTIC = HeuristicTokenizer()
+
+
+def register_tokenizer(model_prefix: str, factory: TokenizerFactory) -> None:
+    """Use factory's tokenizer for models starting with model_prefix."""
+    _FACTORIES[model_prefix] = factory
+    _TOKENIZERS.clear()
+
+
+def _longest_prefix(model: str, table: dict[str, Any]) -> Optional[str]:
+    matches = [prefix for prefix in table if model.startswith(prefix)]
+    return max(matches, key=len) if matches else None
+
+
+def get_tokenizer(model: Optional[str] = None) -> Tokenizer:
+    """
+    Tokenizer for a model. Falls back to the heuristic when no tokenizer is
+    registered for the model or its package is not installed.
+    """
+    if not model:
+        return _HEURISTIC
+    if model not in _TOKENIZERS:
+        prefix = _longest_prefix(model, _FACTORIES)
+        tokenizer: Tokenizer = _HEURISTIC
+        if prefix is not None:
+            try:
+                tokenizer = _FACTORIES[prefix]()
+            except ImportError:
+                pass
+        _TOKENIZERS[model] = tokenizer
+    return _TOKENIZERS[model]
+
+
+class TokenCache:
+    """LRU cache of token counts keyed by tokenizer and text digest."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._counts: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def count(self, text: str, tokenizer: Tokenizer) -> int:
+        # Short strings are cheaper to count than to hash
+        if len(text) < 256:
+            return tokenizer.count(text)
+
+        key = (tokenizer.name, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest())
+        cached = self._counts.get(key)
+        if cached is not None:
+            self._counts.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        count = tokenizer.count(text)
+        self._counts[key] = count
+        if len(self._counts) > self.max_entries:
+            self._counts.popitem(last=False)
+        return count
+
+
+_cache = TokenCache()
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Count tokens in text for a model, cached per text hash."""
+    return _cache.count(text, get_tokenizer(model))
+
+
+def count_message_tokens(messages: list[dict[str, Any]], model: Optional[str] = None) -> int:
+    """Count prompt tokens for a messages array (plain or text-part content)."""
+    total = 0
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            total += sum(count_tokens(part.get("text", ""), model) for part in content)
+        else:
+            total += count_tokens(content, model)
+        total += MESSAGE_OVERHEAD_TOKENS
+    return total
+
+
+def context_window(model: str, override: Optional[int] = None) -> int:
+    """Context window size in tokens for a model."""
+    if override:
+        return override
+    prefix = _longest_prefix(model, CONTEXT_WINDOWS)
+    return CONTEXT_WINDOWS[prefix] if prefix is not None else DEFAULT_CONTEXT_WINDOW
@@ -0,0 +1,176 @@
+"""Post-generation checks on section content, run in a worker process pool."""
+
+import re
+from typing import Callable, Optional
+
+from pydantic import BaseModel, Field
+
+from .workers import WorkerPool
+
+
+class ValidationContext(BaseModel):
+    """What a validator knows about the section being checked."""
+
+    section_id: str
+    section_title: str
+    outline_content: str
+    previous_sections: list[str] = Field(default_factory=list)  # Earlier sections' text
+
+
+# A validator returns a problem description, or None if the content passes.
+# Validators run in worker processes, so they must be module-level functions.
+Validator = Callable[[str, ValidationContext], Optional[str]]
+
+# Content shorter than this many words per outline word is flagged
+MIN_WORDS_PER_OUTLINE_WORD = 1
+MIN_SECTION_WORDS = 100
+
+SHINGLE_SIZE = 8  # Words per n-gram for overlap checks
+MAX_OVERLAP = 0.2  # Share of shingles allowed to repeat earlier sections
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _normalize_title(text: str) -> str:
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def check_heading(content: str, context: ValidationContext) -> Optional[str]:
+    """Flag content that opens by restating the section heading."""
+    first_line = content.lstrip().split("\n", 1)[0]
+    if not first_line.startswith("#"):
+        return None
+
+    heading = _normalize_title(first_line)
+    title = _normalize_title(context.section_title)
+    section_id = _normalize_title(context.section_id)
+    if title and (heading.endswith(title) or heading.startswith(section_id + " ")):
+        return "Starts by repeating the section heading"
+    return None
+
+
+def check_length(content: str, context: ValidationContext) -> Optional[str]:
+    """Flag content that is far too short for its outline."""
+    outline_words = len(_WORD_RE.findall(context.outline_content))
+    minimum = max(MIN_SECTION_WORDS, MIN_WORDS_PER_OUTLINE_WORD * outline_words)
+    words = len(_WORD_RE.findall(content))
+    if words < minimum:
+        return f"Too short: {words} words for an outline of {outline_words} words"
+    return None
+
+
+def check_markdown(content: str, context: ValidationContext) -> Optional[str]:
+    """Flag broken markdown: unclosed code fences, bad headings, stray bold."""
+    problems = []
+    in_fence = False
+    for line in content.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        if re.match(r"#{1,6}[^#\s]", stripped):
+            problems.append(f"heading without a space: {stripped[:40]!r}")
+        elif re.match(r"#\s", stripped):
+            problems.append("top-level '#' heading inside a section")
+
+    if in_fence:
+        problems.append("unclosed code fence")
+
+    for paragraph in re.split(r"\n\s*\n", content):
+        if paragraph.lstrip().startswith("```"):
+            continue
+        if paragraph.count("**") % 2:
+            problems.append(f"unbalanced bold markers near {paragraph.strip()[:40]!r}")
+            break
+
+    if problems:
+        return "Markdown problems: " + "; ".join(problems[:3])
+    return None
+
+
+def _shingles(text: str) -> set[int]:
+    words = _WORD_RE.findall(text.lower())
+    return {
+        hash(tuple(words[i : i + SHINGLE_SIZE]))
+        for i in range(max(0, len(words) - SHINGLE_SIZE + 1))
+    }
+
+
+def check_repetition(content: str, context: ValidationContext) -> Optional[str]:
+    """Flag duplicate paragraphs and heavy n-gram overlap with earlier sections."""
+    seen = set()
+    for paragraph in re.split(r"\n\s*\n", content):
+        key = _normalize_title(paragraph)
+        if len(key) < 80:
+            continue
+        if key in seen:
+            return "Contains a duplicated paragraph"
+        seen.add(key)
+
+    shingles = _shingles(content)
+    if not shingles or not context.previous_sections:
+        return None
+
+    previous = set()
+    for text in context.previous_sections:
+        previous |= _shingles(text)
+    overlap = len(shingles & previous) / len(shingles)
+    if overlap > MAX_OVERLAP:
+        return f"Repeats earlier sections ({overlap:.0%} of {SHINGLE_SIZE}-word phrases)"
+    return None
+
+
+VALIDATORS: dict[str, Validator] = {
+    "heading": check_heading,
+    "length": check_length,
+    "markdown": check_markdown,
+    "repetition": check_repetition,
+}
+
+
+def register_validator(name: str, validator: Validator) -> None:
+    """Make a validator available by name in the validators config list."""
+    VALIDATORS[name] = validator
+
+
+def run_validators(
+    content: str,
+    context: ValidationContext,
+    names: list[str],
+    validators: Optional[dict[str, Validator]] = None,
+) -> list[str]:
+    """
+    Run the named validators and return their problem descriptions.
+    validators defaults to the registry; pass it explicitly when running in a
+    worker process, where validators registered in the parent are unknown.
+    """
+    registry = VALIDATORS if validators is None else validators
+    problems = []
+    for name in names:
+        if name not in registry:
+            raise ValueError(f"Unknown validator '{name}', expected one of {list(registry)}")
+        problem = registry[name](content, context)
+        if problem:
+            problems.append(f"{name}: {problem}")
+    return problems
+
+
+class ValidationPipeline:
+    """Runs the configured validators on a worker pool."""
+
+    def __init__(self, names: list[str], workers: WorkerPool):
+        self.names = names
+        self.workers = workers
+
+    async def validate(self, content: str, context: ValidationContext) -> list[str]:
+        """Return the problems found in content (empty if it passes)."""
+        if not self.names:
+            return []
+        # Resolved here so validators registered at runtime reach the workers
+        validators = {name: VALIDATORS[name] for name in self.names if name in VALIDATORS}
+        problems: list[str] = await self.workers.run(
+            run_validators, content, context, self.names, validators
+        )
+        return problems
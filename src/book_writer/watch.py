@@ -0,0 +1,58 @@
+"""Rubric file watching for incremental regeneration."""
+
+import asyncio
+import time
+from pathlib import Path
+
+
+class RubricWatcher:
+    """
+    Polls a rubric file and reports debounced content changes.
+
+    Editors often write a file several times per save (temp file, rename,
+    metadata touch), so a change is only reported once the file's mtime and
+    size have been stable for the debounce interval.
+    """
+
+    def __init__(self, path: Path, poll_interval: float = 0.5, debounce: float = 1.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.content = path.read_text(encoding="utf-8")
+        self._signature = self._stat()
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            # Mid-save by an editor that replaces the file
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    async def wait_for_change(self) -> tuple[str, str]:
+        """Block until the rubric content changes. Returns (old, new) content."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            signature = self._stat()
+            if signature == self._signature:
+                continue
+
+            # Wait for the file to settle
+            settled_at = time.monotonic()
+            while time.monotonic() - settled_at < self.debounce:
+                await asyncio.sleep(self.poll_interval)
+                current = self._stat()
+                if current != signature:
+                    signature = current
+                    settled_at = time.monotonic()
+
+            if signature is None:
+                continue
+            self._signature = signature
+
+            content = self.path.read_text(encoding="utf-8")
+            if content == self.content:
+                continue
+
+            old_content, self.content = self.content, content
+            return old_content, content
@@ -0,0 +1,35 @@
+"""Process pool for CPU-bound work on generated text, kept off the event loop."""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class WorkerPool:
+    """
+    Runs module-level functions in worker processes.
+
+    The pool is created on first use and released by close(), so a
+    long-lived generator only holds processes while a run is active.
+    With workers == 0 functions run inline.
+    """
+
+    def __init__(self, workers: int = 2):
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func(*args) in a worker process and return its result."""
+        if self.workers <= 0:
+            return func(*args)
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, func, *args)
+
+    def close(self) -> None:
+        """Shut down the worker processes, if any were started."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,48 @@
+"""Shared fixtures: a small outline and a scripted stand-in for the API client."""
+
+from pathlib import Path
+
+import pytest
+
+from book_writer.models import BookOutline, GenerationResult, TokenUsage
+from book_writer.parser import parse_rubric
+
+RUBRIC = """# Test Book
+
+# Chapter 1: Basics
+
+## Intro
+- Explain the basics
+
+## Details
+- Go deeper
+
+# Chapter 2: More
+
+## Overview
+- Summarise
+"""
+
+
+class FakeClient:
+    """Returns scripted drafts in place of OpenRouter responses."""
+
+    def __init__(self, content: str = "Generated prose.", tokens: int = 10):
+        self.content = content
+        self.tokens = tokens
+        self.calls: list[list[dict]] = []
+
+    async def generate_result(self, messages: list[dict], model=None) -> GenerationResult:
+        self.calls.append(messages)
+        return GenerationResult(
+            content=self.content,
+            model=model or "test/model",
+            usage=TokenUsage(total_tokens=self.tokens),
+        )
+
+
+@pytest.fixture
+def outline(tmp_path: Path) -> BookOutline:
+    rubric = tmp_path / "rubric.md"
+    rubric.write_text(RUBRIC, encoding="utf-8")
+    return parse_rubric(rubric)
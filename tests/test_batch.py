@@ -0,0 +1,118 @@
+"""Tests for batch backends and batch-mode book generation."""
+
+import pytest
+
+from book_writer.batch import (
+    BatchBackend,
+    BatchError,
+    BatchRequest,
+    BatchResult,
+    FileBatchBackend,
+)
+from book_writer.generator import BookGenerator
+from book_writer.models import GenerationConfig, GenerationResult, SectionStatus, TokenUsage
+from book_writer.state import StateManager
+
+
+class FakeBackend(BatchBackend):
+    """Finishes each job on its second poll; sections in errors fail."""
+
+    def __init__(self, errors: frozenset = frozenset()):
+        self.errors = errors
+        self.jobs: list[list[str]] = []
+        self.polls = 0
+
+    async def submit(self, requests: list[BatchRequest]) -> str:
+        self.jobs.append([request.custom_id for request in requests])
+        return str(len(self.jobs) - 1)
+
+    async def poll(self, job_id: str) -> bool:
+        self.polls += 1
+        return self.polls % 2 == 0
+
+    async def fetch_results(self, job_id: str) -> list[BatchResult]:
+        results = []
+        for custom_id in self.jobs[int(job_id)]:
+            if custom_id.split(":")[1] in self.errors:
+                results.append(BatchResult(custom_id=custom_id, error="provider error"))
+            else:
+                generated = GenerationResult(
+                    content=f"Prose for {custom_id}.",
+                    model="test/model",
+                    usage=TokenUsage(total_tokens=10),
+                )
+                results.append(BatchResult(custom_id=custom_id, result=generated))
+        return results
+
+
+async def _generate(outline, tmp_path, backend):
+    output_dir = tmp_path / "output"
+    state_manager = StateManager(output_dir)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    config = GenerationConfig(worker_processes=0)
+    generator = BookGenerator(outline, None, state_manager, config, output_dir)
+    return await generator.generate_book_batch(state, backend, poll_interval=0)
+
+
+async def test_batch_rounds_submit_the_next_section_of_each_chapter(outline, tmp_path):
+    backend = FakeBackend()
+    state = await _generate(outline, tmp_path, backend)
+
+    assert backend.jobs == [["1:1.intro", "2:2.overview"], ["1:1.details"]]
+    assert backend.polls == 4
+    section_state = state.chapters["1"].sections["1.details"]
+    assert section_state.status == SectionStatus.COMPLETED
+    assert section_state.generated_content == "Prose for 1:1.details."
+    assert (tmp_path / "output" / "chapters" / "chapter_01.md").exists()
+
+
+async def test_batch_failure_stops_only_its_chapter(outline, tmp_path):
+    backend = FakeBackend(errors=frozenset({"1.intro"}))
+    state = await _generate(outline, tmp_path, backend)
+
+    assert backend.jobs == [["1:1.intro", "2:2.overview"]]
+    sections = state.chapters["1"].sections
+    assert sections["1.intro"].status == SectionStatus.FAILED
+    assert sections["1.intro"].last_error == "provider error"
+    assert sections["1.details"].status == SectionStatus.PENDING
+    assert state.chapters["2"].sections["2.overview"].status == SectionStatus.COMPLETED
+
+
+async def test_file_backend_runs_worker_and_records_errors(tmp_path):
+    async def worker(request):
+        if request.custom_id == "1:1.bad":
+            raise RuntimeError("worker failed")
+        return GenerationResult(content="Done.", model=request.model)
+
+    backend = FileBatchBackend(tmp_path / "batches", worker=worker)
+    requests = [
+        BatchRequest(custom_id=custom_id, model="test/model", messages=[])
+        for custom_id in ("1:1.good", "1:1.bad")
+    ]
+    job_id = await backend.submit(requests)
+
+    with pytest.raises(BatchError, match="no results yet"):
+        await backend.fetch_results(job_id)
+    assert await backend.poll(job_id)
+
+    results = {result.custom_id: result for result in await backend.fetch_results(job_id)}
+    assert results["1:1.good"].result.content == "Done."
+    assert results["1:1.bad"].error == "worker failed"
+
+
+async def test_file_backend_waits_for_external_results(tmp_path):
+    backend = FileBatchBackend(tmp_path / "batches")
+    job_id = await backend.submit([BatchRequest(custom_id="1:1.a", model="m", messages=[])])
+
+    assert not await backend.poll(job_id)
+    with pytest.raises(BatchError, match="Unknown batch job"):
+        await backend.poll("missing")
+
+
+def test_batch_backend_requires_every_method():
+    class Incomplete(BatchBackend):
+        async def submit(self, requests):
+            return "job"
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,32 @@
+"""Tests for the preflight estimate and budget governor."""
+
+from book_writer.budget import BudgetGovernor, estimate_book
+from book_writer.models import GenerationConfig, SectionStatus, TokenUsage
+from book_writer.state import StateManager
+
+
+def test_estimate_reads_low_memory_content(outline, tmp_path):
+    prose = "A long generated section. " * 200
+    estimates = []
+    for low_memory in (False, True):
+        state_manager = StateManager(tmp_path / str(low_memory), low_memory=low_memory)
+        state = state_manager.initialize_state(outline, "test/model", "hash")
+        state_manager.update_section(
+            state, "1", "1.intro", status=SectionStatus.COMPLETED, content=prose
+        )
+        estimates.append(estimate_book(outline, state, 100, state_manager=state_manager))
+
+    # Prose kept on disk is counted in later prompts just like inline prose
+    assert estimates[0] == estimates[1]
+    assert estimates[1]["remaining_sections"] == 2
+
+
+def test_governor_refuses_over_budget(outline, tmp_path):
+    state = StateManager(tmp_path).initialize_state(outline, "test/model", "hash")
+    governor = BudgetGovernor(GenerationConfig(run_token_budget=100), state)
+    assert governor.try_admit(60)
+    assert not governor.try_admit(60)
+
+    governor.record(60, TokenUsage(total_tokens=30))
+    assert governor.try_admit(60)
+    assert governor.summary()["refused"] == 1
@@ -0,0 +1,131 @@
+"""Tests for candidate draft scoring and best-of-n section generation."""
+
+import pytest
+
+from book_writer.candidates import parse_judge_scores, score_candidate
+from book_writer.generator import BookGenerator
+from book_writer.models import (
+    GenerationConfig,
+    GenerationResult,
+    SectionOutline,
+    SectionStatus,
+    TokenUsage,
+)
+from book_writer.openrouter import APIError
+from book_writer.state import StateManager
+
+SECTION = SectionOutline(
+    id="1.cash",
+    title="Cash Flow",
+    outline_content="- Explain working capital\n- Describe liquidity forecasts",
+)
+
+# Covers every outline term at full length
+GOOD = "We explain working capital, then describe liquidity forecasts. " + "More detail. " * 150
+
+
+class ModelClient:
+    """Answers each model with its own scripted content; missing models fail."""
+
+    def __init__(self, contents: dict[str, str]):
+        self.contents = contents
+        self.models: list[str] = []
+
+    async def generate_result(self, messages, model=None) -> GenerationResult:
+        self.models.append(model)
+        if model not in self.contents:
+            raise APIError(f"{model} unavailable")
+        return GenerationResult(
+            content=self.contents[model], model=model, usage=TokenUsage(total_tokens=10)
+        )
+
+
+def test_score_rewards_coverage_and_length():
+    assert score_candidate(GOOD, SECTION) == pytest.approx(1.0)
+    assert score_candidate("Working capital.", SECTION) < 0.5
+    assert score_candidate("Unrelated text. " * 150, SECTION) == pytest.approx(0.4)
+
+
+@pytest.mark.parametrize(
+    "content, finish_reason, penalty",
+    [
+        (GOOD, "length", 0.3),
+        ("As an AI, I cannot write this. " + GOOD, None, 0.5),
+        ("# Cash Flow\n\n" + GOOD, None, 0.1),
+    ],
+)
+def test_score_penalties(content, finish_reason, penalty):
+    assert score_candidate(content, SECTION, finish_reason) == pytest.approx(1.0 - penalty)
+
+
+@pytest.mark.parametrize(
+    "response, expected",
+    [
+        ('Scores: {"scores": [7, 12, 0]}', [0.7, 1.0, 0.0]),
+        ('{"scores": [7, 8]}', None),
+        ('{"scores": ["high", 8, 9]}', None),
+        ("No verdict", None),
+    ],
+)
+def test_parse_judge_scores(response, expected):
+    assert parse_judge_scores(response, 3) == expected
+
+
+async def _generate(outline, tmp_path, client, **options):
+    output_dir = tmp_path / "output"
+    state_manager = StateManager(output_dir)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    config = GenerationConfig(candidates=2, worker_processes=0, **options)
+    generator = BookGenerator(outline, client, state_manager, config, output_dir)
+    state = await generator.generate_book(state, chapters_to_process=["2"])
+    return state.chapters["2"].sections["2.overview"], output_dir
+
+
+async def test_best_scoring_candidate_is_kept(outline, tmp_path):
+    client = ModelClient({"short": "Summarise.", "long": "Summarise it all. " * 100})
+    section_state, output_dir = await _generate(
+        outline, tmp_path, client, candidate_models=["short", "long"]
+    )
+
+    assert section_state.status == SectionStatus.COMPLETED
+    assert section_state.generated_content == "Summarise it all. " * 100
+    assert [record.selected for record in section_state.candidates] == [False, True]
+    assert section_state.token_count == 20
+    for record in section_state.candidates:
+        assert (output_dir / record.content_path).exists()
+
+
+async def test_judge_scores_override_local_scores(outline, tmp_path):
+    client = ModelClient(
+        {
+            "short": "Summarise.",
+            "long": "Summarise it all. " * 100,
+            "judge": '{"scores": [9, 2]}',
+        }
+    )
+    section_state, _ = await _generate(
+        outline, tmp_path, client, candidate_models=["short", "long"], judge_model="judge"
+    )
+
+    assert client.models[-1] == "judge"
+    assert section_state.generated_content == "Summarise."
+    assert [record.score for record in section_state.candidates] == [0.9, 0.2]
+
+
+async def test_failed_candidates_are_recorded(outline, tmp_path):
+    client = ModelClient({"working": "Summarise."})
+    section_state, _ = await _generate(
+        outline,
+        tmp_path,
+        client,
+        candidate_models=["working", "broken"],
+        # An unavailable judge falls back to local scoring
+        judge_model="missing-judge",
+    )
+
+    assert section_state.status == SectionStatus.COMPLETED
+    assert section_state.generated_content == "Summarise."
+    broken = section_state.candidates[1]
+    assert broken.model == "broken"
+    assert "unavailable" in broken.error
+    assert not broken.selected
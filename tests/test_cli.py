@@ -0,0 +1,153 @@
+"""Tests for CLI commands."""
+
+import subprocess
+import sys
+
+from click.testing import CliRunner
+
+from book_writer.cli import cli
+from book_writer.models import SectionStatus
+from book_writer.openrouter import APIError, OpenRouterClient
+from book_writer.state import StateManager
+from book_writer.storage import find_state_file
+
+from .conftest import RUBRIC
+
+
+def _book(tmp_path, config: str):
+    book = tmp_path / "book"
+    book.mkdir()
+    (book / "rubric.md").write_text(RUBRIC, encoding="utf-8")
+    (book / "config.yaml").write_text(config, encoding="utf-8")
+    return book
+
+
+def test_revert_uses_the_book_storage_settings(outline, tmp_path):
+    book = _book(tmp_path, "low_memory: true\nstate_compression: gzip\n")
+    state_manager = StateManager(book / "output", low_memory=True, compression="gzip")
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    for content in ("First draft.", "Second draft."):
+        state_manager.update_section(
+            state, "1", "1.intro", status=SectionStatus.COMPLETED, content=content
+        )
+
+    result = CliRunner().invoke(cli, ["revert", str(book), "1.intro", "1"])
+    assert result.exit_code == 0, result.output
+
+    assert find_state_file(book / "output").name == "state.json.gz"
+    state = state_manager.load_state()
+    section_state = state.chapters["1"].sections["1.intro"]
+    # Low-memory books keep the reverted prose on disk, not in state
+    assert section_state.generated_content is None
+    assert state_manager.get_section_content(section_state) == "First draft."
+
+
+def test_history_lists_revisions(outline, tmp_path):
+    book = _book(tmp_path, "low_memory: true\n")
+    state_manager = StateManager(book / "output", low_memory=True)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    state_manager.update_section(
+        state, "1", "1.intro", status=SectionStatus.COMPLETED, content="First draft."
+    )
+
+    result = CliRunner().invoke(cli, ["history", str(book), "1.intro", "--show", "1"])
+    assert result.exit_code == 0, result.output
+    assert "First draft." in result.output
+
+
+def test_regenerate_reports_api_failures(outline, tmp_path, monkeypatch):
+    book = _book(tmp_path, "")
+    state_manager = StateManager(book / "output")
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    state_manager.update_section(
+        state, "1", "1.intro", status=SectionStatus.COMPLETED, content="First draft."
+    )
+
+    async def generate_result(self, messages, model=None):
+        raise APIError("provider unavailable")
+
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setattr(OpenRouterClient, "generate_result", generate_result)
+    result = CliRunner().invoke(cli, ["regenerate", str(book), "1.intro", "--no-downstream"])
+    assert result.exit_code == 0, result.output
+
+    assert "Sections regenerated: 0/1" in result.output
+    assert "Not regenerated: 1.intro" in result.output
+    # The failed attempt leaves the previous text in place
+    section_state = state_manager.load_state().chapters["1"].sections["1.intro"]
+    assert state_manager.get_section_content(section_state) == "First draft."
+
+
+def test_dedupe_prints_snippets_verbatim(outline, tmp_path):
+    book = _book(tmp_path, "")
+    state_manager = StateManager(book / "output")
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    # Square brackets would otherwise be read as (here unbalanced) console markup
+    paragraph = (
+        "Arrays like a[/i] hold values in order, and most languages index them from zero, "
+        "so the first element sits at position zero and the last one at the length minus "
+        "one, which is a frequent source of off-by-one mistakes in loops over the array."
+    )
+    for chapter_id, section_id in (("1", "1.intro"), ("2", "2.overview")):
+        state_manager.update_section(
+            state, chapter_id, section_id, status=SectionStatus.COMPLETED, content=paragraph
+        )
+
+    result = CliRunner().invoke(cli, ["dedupe", str(book)])
+    assert result.exit_code == 0, result.output
+    assert "a[/i]" in result.output
+
+
+def test_run_token_budget_option_name():
+    # --max-tokens read like the per-request completion limit
+    for command in ("generate", "resume", "regenerate"):
+        result = CliRunner().invoke(cli, [command, "--help"])
+        assert "--token-budget" in result.output
+        assert "--max-tokens" not in result.output
+
+
+HEAVY_MODULES = {"httpx", "pydantic", "pydantic_settings", "yaml"}
+# Importing the CLI takes ~35 ms; pydantic alone would add ~150 ms
+CLI_IMPORT_BUDGET_US = 100_000
+
+
+def _import_times(*args: str) -> tuple[str, dict[str, int]]:
+    """Run the CLI in a fresh interpreter, so modules other tests imported
+    don't count; returns its output and each module's cumulative import time."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "book_writer", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return result.stdout, times
+
+
+def test_help_skips_heavy_imports():
+    output, times = _import_times("--help")
+    assert "Usage:" in output
+    assert not {name.split(".")[0] for name in times} & (HEAVY_MODULES | {"rich"})
+    assert times["book_writer.cli"] < CLI_IMPORT_BUDGET_US
+
+
+def test_status_and_list_skip_heavy_imports(outline, tmp_path):
+    book = _book(tmp_path, 'title: "Fast Start"\n')
+    state_manager = StateManager(book / "output")
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    state_manager.update_section(
+        state, "1", "1.intro", status=SectionStatus.COMPLETED, content="Done."
+    )
+
+    for args, expected in (
+        (["status", str(book)], "Fast Start"),
+        (["list", str(tmp_path)], "1/3"),
+    ):
+        output, times = _import_times(*args)
+        assert expected in output
+        assert not {name.split(".")[0] for name in times} & HEAVY_MODULES
@@ -0,0 +1,82 @@
+"""Tests for the near-duplicate index and the prompt hints it drives."""
+
+from book_writer.dedupe import DedupeIndex, minhash, similarity, split_paragraphs
+from book_writer.generator import BookGenerator
+from book_writer.models import GenerationConfig, SectionStatus
+from book_writer.state import StateManager
+
+from .conftest import FakeClient
+
+ANECDOTE = (
+    "In 1998 a small retailer in Ohio discovered that its best customers were the ones "
+    "who complained the most, because every complaint was a chance to fix a process and "
+    "keep a buyer who would otherwise have quietly left for a competitor down the road, "
+    "and the owner began tracking complaints as carefully as sales."
+)
+OTHER = (
+    "Interest rates shape almost every decision a company makes about borrowing, hiring "
+    "and expansion, since the cost of money sets the bar any new project must clear before "
+    "it is worth doing at all, which is why finance teams watch central banks so closely "
+    "and revise their plans whenever the outlook for rates changes."
+)
+
+
+def test_split_paragraphs_skips_headings_code_and_fragments():
+    content = f"## Heading\n\n{ANECDOTE}\n\nToo short.\n\n```\ncode\n```\n\n{OTHER}"
+    assert split_paragraphs(content) == [ANECDOTE, OTHER]
+
+
+def test_minhash_similarity():
+    assert similarity(minhash(ANECDOTE), minhash(ANECDOTE)) == 1.0
+    assert similarity(minhash(ANECDOTE), minhash(OTHER)) < 0.2
+    assert minhash("two words") is None
+
+
+def test_query_finds_repeats_in_other_chapters(tmp_path):
+    index = DedupeIndex(tmp_path)
+    assert index.update_section("1", "1.a", ANECDOTE)
+    assert not index.update_section("1", "1.a", ANECDOTE)
+    index.update_section("2", "2.a", OTHER)
+
+    matches = index.query(ANECDOTE.replace("Ohio", "Iowa"), 0.5)
+    assert [(m.chapter_id, m.section_id) for m in matches] == [("1", "1.a")]
+    assert index.query(ANECDOTE, 0.5, exclude_chapter="1") == []
+
+
+def test_save_load_and_remove(tmp_path):
+    index = DedupeIndex(tmp_path)
+    index.update_section("1", "1.a", ANECDOTE)
+    index.save()
+
+    reloaded = DedupeIndex(tmp_path)
+    assert reloaded.query(ANECDOTE, 0.5)
+    assert reloaded.remove_section("1", "1.a")
+    assert reloaded.query(ANECDOTE, 0.5) == []
+
+
+async def test_repeats_become_hints_not_failures(outline, tmp_path):
+    output_dir = tmp_path / "output"
+    state_manager = StateManager(output_dir)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    # Chapter 2 already tells the anecdote
+    state_manager.update_section(
+        state, "2", "2.overview", status=SectionStatus.COMPLETED, content=ANECDOTE
+    )
+    config = GenerationConfig(dedupe_hints=True, worker_processes=0)
+    client = FakeClient(content=ANECDOTE)
+    generator = BookGenerator(outline, client, state_manager, config, output_dir)
+
+    state = await generator.generate_book(state, chapters_to_process=["1"])
+
+    # Both sections complete on their first draft
+    assert len(client.calls) == 2
+    assert all(
+        section_state.status == SectionStatus.COMPLETED
+        for section_state in state.chapters["1"].sections.values()
+    )
+    # The second section's prompt points at the passage the first repeated
+    first, second = (str(messages) for messages in client.calls)
+    assert "Already Covered Elsewhere" not in first
+    assert "Already Covered Elsewhere" in second and "2.overview" in second
+    # Saved once the chapter was written
+    assert DedupeIndex(output_dir).query(ANECDOTE, 0.5, exclude_chapter="2")
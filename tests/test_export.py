@@ -0,0 +1,61 @@
+"""Tests for the built-in EPUB and HTML exporter."""
+
+import zipfile
+from xml.etree import ElementTree
+
+from book_writer.export import (
+    chapter_anchor,
+    chapter_title,
+    export_epub,
+    export_html,
+    render_chapter,
+)
+
+CHAPTER = """# Chapter 1: Basics
+
+Some *prose* with raw HTML<br> and an <span>unclosed tag.
+
+## 1.1 Detail
+
+| a | b |
+|---|---|
+| 1 | 2 |
+"""
+
+
+def _chapters(tmp_path):
+    path = tmp_path / "chapter_01.md"
+    path.write_text(CHAPTER, encoding="utf-8")
+    return [path]
+
+
+def test_render_chapter_escapes_raw_html_and_adds_heading_ids(tmp_path):
+    (path,) = _chapters(tmp_path)
+    body = render_chapter(str(path))
+    assert '<h1 id="ch-chapter_01">' in body
+    assert '<h2 id="ch-chapter_01-2">' in body
+    assert "&lt;br&gt;" in body and "<span>" not in body
+    assert chapter_title(path) == "Chapter 1: Basics"
+
+
+def test_heading_ids_are_valid_for_any_file_name(tmp_path):
+    # XHTML ids may not start with a digit or contain spaces
+    assert chapter_anchor(tmp_path / "01 intro.md") == "ch-01-intro"
+
+
+def test_epub_documents_are_well_formed(tmp_path):
+    epub_path = export_epub(_chapters(tmp_path), "Test & Book", tmp_path / "book.epub", workers=1)
+    with zipfile.ZipFile(epub_path) as epub:
+        names = epub.namelist()
+        assert names[0] == "mimetype"
+        assert epub.getinfo("mimetype").compress_type == zipfile.ZIP_STORED
+        for name in names:
+            if name.endswith((".xhtml", ".opf", ".xml")):
+                ElementTree.fromstring(epub.read(name))
+
+
+def test_html_has_toc_and_chapters(tmp_path):
+    html_path = export_html(_chapters(tmp_path), "Test Book", tmp_path / "book.html", workers=1)
+    text = html_path.read_text(encoding="utf-8")
+    assert '<a href="#ch-chapter_01">Chapter 1: Basics</a>' in text
+    assert "<table>" in text
@@ -0,0 +1,50 @@
+"""Tests for section generation error handling."""
+
+from book_writer.generator import BookGenerator
+from book_writer.models import GenerationConfig, SectionStatus
+from book_writer.state import StateManager
+from book_writer.validation import register_validator
+
+from .conftest import FakeClient
+
+
+def always_fails(content, context):
+    return "always fails"
+
+
+def test_validators_are_opt_in():
+    assert GenerationConfig().validators == []
+
+
+async def test_unknown_validator_marks_section_failed(outline, tmp_path):
+    output_dir = tmp_path / "output"
+    state_manager = StateManager(output_dir)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    config = GenerationConfig(validators=["missing"], worker_processes=0)
+    generator = BookGenerator(outline, FakeClient(), state_manager, config, output_dir)
+
+    state = await generator.generate_book(state)
+
+    # Each chapter stops at its first failed section
+    for chapter_id, section_id in (("1", "1.intro"), ("2", "2.overview")):
+        section_state = state.chapters[chapter_id].sections[section_id]
+        assert section_state.status == SectionStatus.FAILED
+        assert "Unknown validator 'missing'" in section_state.last_error
+
+
+async def test_registered_validator_reaches_worker_processes(outline, tmp_path):
+    register_validator("always_fails", always_fails)
+    output_dir = tmp_path / "output"
+    state_manager = StateManager(output_dir)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    config = GenerationConfig(
+        validators=["always_fails"], validation_retries=0, worker_processes=1
+    )
+    client = FakeClient()
+    generator = BookGenerator(outline, client, state_manager, config, output_dir)
+
+    state = await generator.generate_book(state, chapters_to_process=["2"])
+
+    section_state = state.chapters["2"].sections["2.overview"]
+    assert section_state.status == SectionStatus.FAILED
+    assert "always_fails: always fails" in section_state.last_error
@@ -0,0 +1,103 @@
+"""Tests for term extraction and the book-wide glossary index."""
+
+from book_writer.glossary import GlossaryIndex, extract_terms
+from book_writer.models import (
+    BookOutline,
+    ChapterOutline,
+    SectionOutline,
+    SectionStatus,
+)
+from book_writer.prompts import format_glossary
+from book_writer.state import StateManager
+
+PROSE = (
+    "A **gross margin** is revenue less the cost of goods sold. Liquidity is "
+    "judged by a measure known as working capital.\n\n"
+    "The Federal Reserve sets rates. When Prices rise, firms adjust.\n\n"
+    "# A Heading With **bold** text"
+)
+
+
+def _terms(content: str) -> dict[str, dict]:
+    return {entry["term"]: entry for entry in extract_terms(content)}
+
+
+def test_extract_definitions_and_entities():
+    terms = _terms(PROSE)
+    assert terms["gross margin"]["kind"] == "definition"
+    assert terms["gross margin"]["definition"].startswith("A gross margin is revenue")
+    assert terms["working capital"]["kind"] == "definition"
+    assert terms["Federal Reserve"]["kind"] == "entity"
+    # Phrase openers are not names, and headings are skipped
+    assert "When Prices" not in terms
+    assert "bold" not in terms
+
+
+def _state(tmp_path, sections: int):
+    chapters = [
+        ChapterOutline(
+            id=str(c),
+            number=c,
+            title=f"Chapter {c}",
+            sections=[
+                SectionOutline(id=f"{c}.{i}", title=f"Section {i}", outline_content="")
+                for i in range(1, sections + 1)
+            ],
+        )
+        for c in (1, 2)
+    ]
+    outline = BookOutline(title="Book", chapters=chapters)
+    state_manager = StateManager(tmp_path)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    for chapter_state in state.chapters.values():
+        for section_state in chapter_state.sections.values():
+            section_state.status = SectionStatus.COMPLETED
+    return state
+
+
+def test_earliest_definition_follows_outline_order(tmp_path):
+    state = _state(tmp_path, sections=10)
+    index = GlossaryIndex(tmp_path)
+    # "1.10" sorts before "1.2" as a string but comes later in the book
+    for section_id, sentence in (("1.10", "late"), ("1.2", "early")):
+        content = f"The **burn rate** is the {sentence} definition."
+        index.set_terms("1", section_id, content, extract_terms(content))
+    index.prune(state)
+
+    assert index.entries()["burn rate"]["definition"] == "The burn rate is the early definition."
+
+
+def test_relevant_excludes_own_chapter_and_fits_budget(tmp_path):
+    state = _state(tmp_path, sections=2)
+    index = GlossaryIndex(tmp_path)
+    index.set_terms("1", "1.1", PROSE, extract_terms(PROSE))
+    content = "The **unit economics** of a product decide its fate."
+    index.set_terms("2", "2.1", content, extract_terms(content))
+    index.prune(state)
+    index.save()
+
+    outline_text = "Cover gross margin, working capital and unit economics"
+    reloaded = GlossaryIndex(tmp_path)
+    reloaded.prune(state)
+    terms = [entry["term"] for entry in reloaded.relevant(outline_text, 1000, "2")]
+    assert sorted(terms) == ["gross margin", "working capital"]
+    assert len(reloaded.relevant(outline_text, 30, "2")) == 1
+    assert reloaded.relevant(outline_text, 1000, "1")[0]["term"] == "unit economics"
+
+
+def test_prune_drops_sections_no_longer_completed(tmp_path):
+    state = _state(tmp_path, sections=2)
+    index = GlossaryIndex(tmp_path)
+    index.set_terms("1", "1.1", PROSE, extract_terms(PROSE))
+    state.chapters["1"].sections["1.1"].status = SectionStatus.PENDING
+
+    assert index.prune(state) == 1
+    assert index.entries() == {}
+
+
+def test_format_glossary_does_not_claim_earlier_chapters():
+    block = format_glossary(
+        [{"term": "burn rate", "chapter_id": "3", "definition": "Cash spent per month."}]
+    )
+    assert "Earlier chapters" not in block
+    assert "- **burn rate** (chapter 3): Cash spent per month." in block
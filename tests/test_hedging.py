@@ -0,0 +1,89 @@
+"""Tests for hedged requests: overhead accounting, latency samples and cancellation."""
+
+import asyncio
+
+from book_writer.hedging import LatencyTracker
+from book_writer.models import GenerationConfig
+from book_writer.openrouter import OpenRouterClient
+
+DELAYS = {"primary": 0.5, "fast": 0.0, "slow": 1.0}
+
+
+def _response(model: str) -> dict:
+    return {
+        "choices": [{"message": {"content": f"from {model}"}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+    }
+
+
+def _client(hedge_model: str = "fast") -> tuple[OpenRouterClient, list[str]]:
+    config = GenerationConfig(
+        hedge_enabled=True, hedge_min_samples=1, hedge_model=hedge_model, max_retries=0
+    )
+    client = OpenRouterClient("test-key", config)
+    client.latency.record("primary", 0.01)
+    calls = []
+
+    async def call_api(messages, model):
+        calls.append(model)
+        await asyncio.sleep(DELAYS[model])
+        return _response(model)
+
+    client._call_api = call_api
+    return client, calls
+
+
+async def test_hedge_win_charges_the_cancelled_primary():
+    client, calls = _client()
+    result = await client.generate_result([], "primary")
+
+    assert calls == ["primary", "fast"]
+    assert result.hedged and result.content == "from fast"
+    # The cancelled primary is estimated at the winner's spend
+    assert result.usage.total_tokens == 300
+    assert client.hedge_stats.wins == 1
+    assert client.hedge_stats.hedge_tokens == 150
+    await client.close()
+
+
+async def test_cancelled_loser_stays_out_of_latency_window():
+    client, _ = _client()
+    await client.generate_result([], "primary")
+    await asyncio.sleep(0.01)
+
+    assert client.latency.count("primary") == 1
+    assert client.latency.count("fast") == 1
+    await client.close()
+
+
+async def test_primary_win_charges_the_hedge():
+    client, _ = _client(hedge_model="slow")
+    result = await client.generate_result([], "primary")
+
+    assert not result.hedged and result.content == "from primary"
+    assert result.usage.total_tokens == 300
+    assert client.hedge_stats.wins == 0
+    await client.close()
+
+
+async def test_caller_cancellation_cancels_the_primary():
+    client, _ = _client()
+    client.latency = LatencyTracker()
+    client.latency.record("primary", 10.0)
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def call_api(messages, model):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    client._call_api = call_api
+    caller = asyncio.create_task(client.generate_result([], "primary"))
+    await started.wait()
+    caller.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1.0)
+    await client.close()
@@ -0,0 +1,75 @@
+"""Tests for response handling: usage reporting and continuing cut-off responses."""
+
+from book_writer.models import GenerationConfig
+from book_writer.openrouter import OpenRouterClient
+
+
+def _client(responses: list[dict]) -> OpenRouterClient:
+    client = OpenRouterClient("test-key", GenerationConfig(max_continuations=2))
+
+    async def call_api(messages, model):
+        return responses.pop(0)
+
+    client._call_api = call_api
+    return client
+
+
+def _response(content, finish_reason: str) -> dict:
+    return {
+        "choices": [{"message": {"content": content}, "finish_reason": finish_reason}],
+        "usage": {"total_tokens": 10},
+    }
+
+
+async def test_prompt_cache_hits_are_recorded():
+    response = _response("Prose.", "stop")
+    response["usage"] = {
+        "prompt_tokens": 1000,
+        "completion_tokens": 50,
+        "total_tokens": 1050,
+        "prompt_tokens_details": {"cached_tokens": 800},
+    }
+    client = _client([response])
+    result = await client.generate_result([], "model")
+    assert result.usage.cached_tokens == 800
+    assert result.usage.prompt_tokens == 1000
+    await client.close()
+
+
+async def test_continuation_is_stitched_on():
+    client = _client(
+        [
+            _response("The first half of the section ends here", "length"),
+            _response("section ends here and the second half follows.", "stop"),
+        ]
+    )
+    result = await client.generate_result([], "model")
+    assert result.content == (
+        "The first half of the section ends here and the second half follows."
+    )
+    assert result.continuations == 1
+    assert result.usage.total_tokens == 20
+    await client.close()
+
+
+async def test_empty_continuation_keeps_partial_text():
+    client = _client([_response("Everything written so far.", "length"), _response("", "stop")])
+    result = await client.generate_result([], "model")
+    assert result.content == "Everything written so far."
+    assert result.finish_reason == "stop"
+    await client.close()
+
+
+async def test_continuation_cut_off_before_any_text_stays_truncated():
+    client = _client(
+        [
+            _response("Everything written so far.", "length"),
+            _response(None, "length"),
+            _response(None, "length"),
+        ]
+    )
+    result = await client.generate_result([], "model")
+    assert result.content == "Everything written so far."
+    assert result.finish_reason == "length"
+    assert result.continuations == 2
+    await client.close()
@@ -0,0 +1,83 @@
+"""Tests for chapter-split PDF builds, with Pandoc replaced by pypdf blank pages."""
+
+import pytest
+
+pypdf = pytest.importorskip("pypdf")
+
+from book_writer import pdfsplit  # noqa: E402
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Fake renderer: one page per non-empty line, recording what was rendered."""
+    rendered = []
+
+    def fake_render(markdown, output_pdf, *options):
+        output_pdf.parent.mkdir(parents=True, exist_ok=True)
+        writer = pypdf.PdfWriter()
+        body = markdown.split("```\n\n", 1)[-1]
+        for _ in [line for line in body.splitlines() if line.strip()] or [""]:
+            writer.add_blank_page(width=612, height=792)
+        with open(output_pdf, "wb") as f:
+            writer.write(f)
+        rendered.append((output_pdf.stem, markdown))
+
+    monkeypatch.setattr(pdfsplit, "_render", fake_render)
+    monkeypatch.setattr(pdfsplit, "check_pdf_tools", lambda: None)
+    monkeypatch.setattr(pdfsplit, "get_pandoc_version", lambda: "3.1")
+    return rendered
+
+
+def _chapters(tmp_path, pages):
+    paths = []
+    for i, count in enumerate(pages, 1):
+        path = tmp_path / f"chapter_{i:02d}.md"
+        path.write_text(f"# Chapter {i}\n" + "text\n" * (count - 1), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def _rendered_chapters(renders):
+    return sorted(stem for stem, _ in renders if stem != pdfsplit.FRONT_KEY)
+
+
+def test_fresh_build_renders_each_chapter_once(tmp_path, renders):
+    chapters = _chapters(tmp_path, [3, 2, 4])
+    output = pdfsplit.build_split_pdf(chapters, "Book", tmp_path / "book.pdf", workers=2)
+
+    assert _rendered_chapters(renders) == ["chapter_01", "chapter_02", "chapter_03"]
+    chapter_markdown = dict(renders)["chapter_01"]
+    assert "\\pagestyle{empty}" in chapter_markdown
+    assert "setcounter{page}" not in chapter_markdown
+
+    reader = pypdf.PdfReader(output)
+    front_pages = len(reader.pages) - 9
+    assert reader.pages[front_pages].extract_text().strip() == "1"
+    assert reader.pages[-1].extract_text().strip() == "9"
+
+    # The contents page lists each chapter's starting page
+    contents = dict(renders)[pdfsplit.FRONT_KEY]
+    assert "Chapter 2\\dotfill 4" in contents
+    assert "Chapter 3\\dotfill 6" in contents
+
+
+def test_longer_chapter_rerenders_only_itself(tmp_path, renders):
+    chapters = _chapters(tmp_path, [3, 2, 4])
+    pdfsplit.build_split_pdf(chapters, "Book", tmp_path / "book.pdf")
+    renders.clear()
+
+    chapters[0].write_text("# Chapter 1\n" + "text\n" * 5, encoding="utf-8")
+    output = pdfsplit.build_split_pdf(chapters, "Book", tmp_path / "book.pdf")
+
+    assert _rendered_chapters(renders) == ["chapter_01"]
+    assert "Chapter 3\\dotfill 9" in dict(renders)[pdfsplit.FRONT_KEY]
+    assert pypdf.PdfReader(output).pages[-1].extract_text().strip() == "12"
+
+
+def test_unchanged_book_renders_nothing(tmp_path, renders):
+    chapters = _chapters(tmp_path, [2, 2])
+    pdfsplit.build_split_pdf(chapters, "Book", tmp_path / "book.pdf")
+    renders.clear()
+
+    pdfsplit.build_split_pdf(chapters, "Book", tmp_path / "book.pdf")
+    assert renders == []
@@ -0,0 +1,109 @@
+"""Tests for prompt construction."""
+
+import pytest
+
+from book_writer.models import ChapterOutline, SectionOutline
+from book_writer.prompts import (
+    ChapterPromptBuilder,
+    build_section_prompt,
+    stitch_continuation,
+    supports_cache_control,
+)
+
+
+@pytest.fixture
+def chapter() -> ChapterOutline:
+    sections = [
+        SectionOutline(id=f"1.{i}", title=f"Section {i}", outline_content=f"Cover point {i}")
+        for i in range(6)
+    ]
+    return ChapterOutline(id="1", title="Chapter", sections=sections)
+
+
+@pytest.mark.parametrize("max_prompt_tokens", [None, 1500])
+def test_builder_matches_one_off_prompts(chapter, max_prompt_tokens):
+    options = {"cache_control": True, "max_prompt_tokens": max_prompt_tokens}
+    builder = ChapterPromptBuilder(chapter, "Book", **options)
+    previous: list[tuple[str, str]] = []
+    for i, section in enumerate(chapter.sections):
+        # With a token cap, later prompts drop their oldest sections
+        expected = build_section_prompt(section, chapter, "Book", previous, **options)
+        assert builder.build(section) == expected
+
+        content = f"Text of section {i}. " * 60
+        builder.add_section(section.title, content)
+        previous.append((section.title, content))
+
+
+def test_builder_trims_oldest_sections(chapter):
+    builder = ChapterPromptBuilder(chapter, "Book", max_prompt_tokens=1500)
+    for i, section in enumerate(chapter.sections[:5]):
+        builder.add_section(section.title, f"Text of section {i}. " * 60)
+
+    prompt = builder.build(chapter.sections[5])[-1]["content"]
+    assert "earlier sections omitted" in prompt
+    assert "Text of section 0." not in prompt
+    assert "Text of section 4." in prompt
+
+
+def test_cache_control_marks_the_stable_prefix(chapter):
+    builder = ChapterPromptBuilder(chapter, "Book", cache_control=True)
+    builder.add_section(chapter.sections[0].title, "Text of section 0.")
+    system, user = builder.build(chapter.sections[1])
+
+    assert system["content"][0]["cache_control"] == {"type": "ephemeral"}
+    *prefix, task = user["content"]
+    # The breakpoint closes the prefix; the per-section task follows it
+    assert prefix[-1]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in task
+    assert "Cover point 1" in task["text"]
+
+    # The next section's prompt starts with the same cached text
+    builder.add_section(chapter.sections[1].title, "Text of section 1.")
+    _, next_user = builder.build(chapter.sections[2])
+    next_texts = [part["text"] for part in next_user["content"]]
+    assert next_texts[: len(prefix)] == [part["text"] for part in prefix]
+
+
+def test_plain_prompts_have_no_cache_control(chapter):
+    system, user = ChapterPromptBuilder(chapter, "Book").build(chapter.sections[0])
+    assert isinstance(system["content"], str)
+    assert isinstance(user["content"], str)
+
+
+@pytest.mark.parametrize(
+    "model, expected",
+    [
+        ("anthropic/claude-sonnet-4", True),
+        ("google/gemini-2.5-pro", True),
+        ("openai/gpt-4o", False),
+    ],
+)
+def test_cache_control_only_for_supporting_models(model, expected):
+    assert supports_cache_control(model) is expected
+
+
+def test_stitch_drops_repeated_overlap():
+    partial = "Cash flow matters because it pays the bills. Profit, by contrast,"
+    continuation = "Profit, by contrast, is an accounting measure."
+    assert stitch_continuation(partial, continuation) == (
+        "Cash flow matters because it pays the bills. Profit, by contrast, "
+        "is an accounting measure."
+    )
+
+
+def test_stitch_compares_overlap_with_normalised_whitespace():
+    partial = "The firm raised prices\nacross its core  product lines"
+    continuation = "across its core product\nlines, and volumes held."
+    assert stitch_continuation(partial, continuation) == (
+        "The firm raised prices\nacross its core  product lines, and volumes held."
+    )
+
+
+def test_stitch_keeps_short_coincidental_overlap():
+    assert stitch_continuation("It grew by", " by then") == "It grew by by then"
+
+
+def test_stitch_empty_continuation_keeps_partial():
+    assert stitch_continuation("Partial text.", "") == "Partial text."
+    assert stitch_continuation("Partial text.", " \n ") == "Partial text."
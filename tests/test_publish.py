@@ -0,0 +1,44 @@
+"""Tests for the publish manifest and staged builds."""
+
+from book_writer.publish import PublishManifest, publish
+
+
+def test_manifest_tracks_inputs_and_output(tmp_path):
+    output = tmp_path / "book.html"
+    output.write_text("<html></html>", encoding="utf-8")
+
+    manifest = PublishManifest(tmp_path)
+    assert not manifest.is_current("html", "inputs-1")
+    manifest.record("html", "inputs-1", output)
+
+    reloaded = PublishManifest(tmp_path)
+    assert reloaded.is_current("html", "inputs-1")
+    assert not reloaded.is_current("html", "inputs-2")
+
+    # An output edited or removed outside the pipeline is rebuilt
+    output.write_text("<html>edited</html>", encoding="utf-8")
+    assert not reloaded.is_current("html", "inputs-1")
+    output.unlink()
+    assert not reloaded.is_current("html", "inputs-1")
+
+
+def test_manifest_ignores_other_versions(tmp_path):
+    (tmp_path / "publish.json").write_text('{"version": 0, "stages": {"html": {}}}')
+    assert PublishManifest(tmp_path).stages == {}
+
+
+def test_publish_skips_unchanged_stages(outline, tmp_path):
+    chapters = tmp_path / "chapters"
+    chapters.mkdir()
+    chapter = chapters / "chapter_01.md"
+    chapter.write_text("# Chapter 1: Basics\n\nText.\n", encoding="utf-8")
+
+    def statuses():
+        results = publish(tmp_path, outline, ["html", "epub"], engine="builtin")
+        return {result.stage: result.status for result in results}
+
+    assert statuses() == {"assemble": "built", "html": "built", "epub": "built"}
+    assert statuses() == {"assemble": "skipped", "html": "skipped", "epub": "skipped"}
+
+    chapter.write_text("# Chapter 1: Basics\n\nRevised.\n", encoding="utf-8")
+    assert statuses() == {"assemble": "built", "html": "built", "epub": "built"}
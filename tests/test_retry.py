@@ -0,0 +1,127 @@
+"""Tests for the retry policy, retry budget and circuit breaker."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from book_writer.models import GenerationConfig
+from book_writer.openrouter import APIError, OpenRouterClient, RequestTimeoutError
+from book_writer.retry import CircuitBreaker, RetryBudget, RetryPolicy, parse_retry_after
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_retry_policy_delay_is_capped_and_honours_retry_after():
+    policy = RetryPolicy(base_delay=1.0, max_delay=10.0)
+    for attempt in range(8):
+        assert 1.0 <= policy.delay(attempt) <= 10.0
+    assert policy.delay(0, retry_after=5.0) >= 5.0
+    assert policy.delay(0, retry_after=60.0) == 10.0
+
+
+def test_retry_budget():
+    budget = RetryBudget(2)
+    assert budget.try_spend()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    assert budget.remaining == 0
+
+
+async def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(threshold=2, cooldown=60.0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.trips == 1
+
+
+async def test_breaker_success_resets_failures():
+    breaker = CircuitBreaker(threshold=2, cooldown=60.0)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_breaker_probe_success_closes():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.0)
+    breaker.record_failure()
+    assert await breaker.acquire() is True
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert await breaker.acquire() is False
+
+
+async def test_breaker_probe_failure_reopens_with_longer_cooldown():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.01, max_cooldown=1.0)
+    breaker.record_failure()
+    await asyncio.sleep(0.02)
+    assert await breaker.acquire() is True
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.trips == 2
+    assert breaker._cooldown == pytest.approx(0.02)
+
+
+async def test_breaker_waiters_block_until_probe_released():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.0)
+    breaker.record_failure()
+    assert await breaker.acquire() is True
+
+    waiter = asyncio.create_task(breaker.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    # Abandoning the probe hands the slot to a waiter
+    breaker.abandon()
+    assert await asyncio.wait_for(waiter, 1.0) is True
+
+
+def _client(**overrides) -> OpenRouterClient:
+    config = GenerationConfig(
+        base_delay=0.0, max_delay=0.0, breaker_threshold=1, breaker_cooldown=0.0, **overrides
+    )
+    return OpenRouterClient("test-key", config)
+
+
+async def test_probe_released_after_error_the_breaker_never_saw():
+    client = _client(max_retries=0)
+    client.breaker.record_failure()
+
+    async def fail(messages, model):
+        raise APIError("bad request")
+
+    client._call_api = fail
+    with pytest.raises(APIError):
+        await client._call_api_with_retry([], "model")
+
+    # The next caller becomes the probe instead of waiting forever
+    assert await asyncio.wait_for(client.breaker.acquire(), 1.0) is True
+    await client.client.aclose()
+
+
+async def test_request_timeout_counts_as_breaker_failure():
+    client = _client(max_retries=0)
+
+    def timeout(request):
+        raise httpx.ReadTimeout("slow", request=request)
+
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(timeout))
+    with pytest.raises(RequestTimeoutError):
+        await client._call_api_with_retry([], "model")
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # The timed-out probe reopens the breaker and frees the slot for the next one
+    with pytest.raises(RequestTimeoutError):
+        await asyncio.wait_for(client._call_api_with_retry([], "model"), 1.0)
+    assert client.breaker.trips == 2
+    await client.client.aclose()
@@ -0,0 +1,139 @@
+"""Tests for chapter scheduling policies, projections and concurrency limits."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from book_writer.generator import BookGenerator
+from book_writer.models import GenerationConfig, GenerationResult, TokenUsage
+from book_writer.parser import parse_rubric_text
+from book_writer.scheduler import ChapterScheduler
+from book_writer.state import StateManager
+
+# Chapters of three, one and two sections
+RUBRIC = """# Scheduling
+
+# Chapter 1: Long
+
+## A
+- a
+
+## B
+- b
+
+## C
+- c
+
+# Chapter 2: Short
+
+## D
+- d
+
+# Chapter 3: Medium
+
+## E
+- e
+
+## F
+- f
+"""
+
+
+class SlowClient:
+    """Takes a moment per request and records the peak number in flight."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate_result(self, messages, model=None) -> GenerationResult:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return GenerationResult(
+            content="Prose.", model="test/model", usage=TokenUsage(total_tokens=10)
+        )
+
+
+@pytest.fixture
+def outline():
+    return parse_rubric_text(RUBRIC)
+
+
+@pytest.fixture
+def state(outline, tmp_path):
+    return StateManager(tmp_path).initialize_state(outline, "test/model", "hash")
+
+
+@pytest.mark.parametrize(
+    "options, expected",
+    [
+        ({"schedule": "order"}, ["1", "2", "3"]),
+        ({"schedule": "priority", "chapter_priorities": {"3": 5, "2": 1}}, ["3", "2", "1"]),
+        ({"schedule": "shortest"}, ["2", "3", "1"]),
+        # Chapters without a deadline go last
+        (
+            {
+                "schedule": "deadline",
+                "chapter_deadlines": {
+                    "1": datetime.now() + timedelta(days=7),
+                    "2": datetime.now() + timedelta(days=1),
+                },
+            },
+            ["2", "1", "3"],
+        ),
+    ],
+)
+def test_order_by_policy(state, options, expected):
+    scheduler = ChapterScheduler(GenerationConfig(**options), state)
+    assert scheduler.order(["1", "2", "3"]) == expected
+
+
+def test_unknown_policy_is_rejected(state):
+    with pytest.raises(ValueError, match="Unknown schedule"):
+        ChapterScheduler(GenerationConfig(schedule="random"), state)
+
+
+def test_projection_fills_free_slots(state):
+    config = GenerationConfig(max_concurrent_chapters=2)
+    scheduler = ChapterScheduler(config, state, section_seconds=10)
+    start = datetime(2026, 1, 1)
+
+    finish = {
+        chapter_id: (eta - start).total_seconds()
+        for chapter_id, eta in scheduler.project(["1", "2", "3"], start).items()
+    }
+    # Chapter 3 takes chapter 2's slot once it frees up at 10s
+    assert finish == {"1": 30, "2": 10, "3": 30}
+
+
+async def test_chapters_start_in_scheduled_order(outline, state, tmp_path):
+    config = GenerationConfig(
+        schedule="priority",
+        chapter_priorities={"3": 5},
+        max_concurrent_chapters=1,
+        worker_processes=0,
+    )
+    started = []
+
+    def progress(chapter_id, section_id, status, message=None):
+        if status == "started":
+            started.append(chapter_id)
+
+    generator = BookGenerator(
+        outline, SlowClient(), StateManager(tmp_path), config, tmp_path, progress
+    )
+    await generator.generate_book(state)
+    assert started == ["3", "1", "2"]
+
+
+async def test_concurrent_chapters_are_capped(outline, state, tmp_path):
+    config = GenerationConfig(max_concurrent_chapters=2, worker_processes=0)
+    client = SlowClient()
+    generator = BookGenerator(outline, client, StateManager(tmp_path), config, tmp_path)
+
+    state = await generator.generate_book(state)
+    assert client.peak == 2
+    assert StateManager(tmp_path).get_overall_progress(state)["completed"] == 6
@@ -0,0 +1,66 @@
+"""Tests for the full-text search index over generated sections."""
+
+import pytest
+
+from book_writer.models import SectionStatus
+from book_writer.search import SearchIndex, fts_query, search_books
+from book_writer.state import StateManager
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SearchIndex(tmp_path)
+    index.update_section("1", "1.intro", "Working capital funds daily operations.")
+    index.update_section("1", "1.details", "Liquidity forecasts guide treasury decisions.")
+    yield index
+    index.close()
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("working capital", '"working" "capital"'),
+        ("forecast*", '"forecast"*'),
+        ('"working capital" funds', '"working capital" "funds"'),
+        ("()", ""),
+    ],
+)
+def test_fts_query(query, expected):
+    assert fts_query(query) == expected
+
+
+def test_query_matches_stems_and_highlights(index):
+    hits = index.search("forecasting")
+
+    assert [hit.section_id for hit in hits] == ["1.details"]
+    assert "[forecasts]" in hits[0].snippet
+    assert index.search("") == []
+
+
+def test_update_replaces_section_content(index):
+    assert not index.update_section("1", "1.intro", "Working capital funds daily operations.")
+    assert index.update_section("1", "1.intro", "Inventory turnover matters.")
+
+    assert index.search("capital") == []
+    assert [hit.section_id for hit in index.search("inventory")] == ["1.intro"]
+
+
+def test_remove_section(index):
+    assert index.remove_section("1", "1.details")
+    assert not index.remove_section("1", "1.details")
+    assert index.search("liquidity") == []
+
+
+def test_state_keeps_index_current(outline, tmp_path):
+    output_dir = tmp_path / "book" / "output"
+    state_manager = StateManager(output_dir)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    state_manager.update_section(
+        state, "2", "2.overview", SectionStatus.COMPLETED, content="A summary of ledgers."
+    )
+
+    hits = search_books([tmp_path / "book"], "ledger")
+    assert [(hit.book, hit.section_id) for hit in hits] == [("book", "2.overview")]
+
+    state_manager.requeue_sections(state, [("2", "2.overview")])
+    assert search_books([tmp_path / "book"], "ledger") == []
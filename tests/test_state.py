@@ -0,0 +1,141 @@
+"""Tests for state persistence and section bookkeeping."""
+
+import gc
+import json
+import os
+
+import pytest
+
+from book_writer.generator import write_chapter_file
+from book_writer.models import SectionStatus
+from book_writer.state import StateManager
+from book_writer.summary import read_summary
+
+
+def _completed(state_manager, state, chapter_id, section_id, content):
+    state_manager.update_section(
+        state, chapter_id, section_id, status=SectionStatus.COMPLETED, content=content
+    )
+
+
+def test_requeue_keeps_content_until_replaced(outline, tmp_path):
+    state_manager = StateManager(tmp_path)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    _completed(state_manager, state, "1", "1.intro", "Original text.")
+
+    state_manager.requeue_sections(state, [("1", "1.intro")])
+    section_state = state.chapters["1"].sections["1.intro"]
+    assert section_state.status == SectionStatus.PENDING
+    assert state_manager.get_section_content(section_state) == "Original text."
+
+    # The chapter file still shows the text while regeneration is pending
+    path = write_chapter_file(tmp_path, outline.chapters[0], state.chapters["1"], state_manager)
+    assert "Original text." in path.read_text(encoding="utf-8")
+
+    _completed(state_manager, state, "1", "1.intro", "New text.")
+    assert state_manager.get_section_content(section_state) == "New text."
+    assert [revision.number for revision in section_state.revisions] == [1, 2]
+
+
+def test_failed_regeneration_restores_previous_text(outline, tmp_path):
+    state_manager = StateManager(tmp_path, low_memory=True)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    _completed(state_manager, state, "1", "1.intro", "Original text.")
+
+    state_manager.requeue_sections(state, [("1", "1.intro")])
+    state_manager.update_section(
+        state, "1", "1.intro", status=SectionStatus.FAILED, error="provider down"
+    )
+
+    section_state = state.chapters["1"].sections["1.intro"]
+    assert section_state.status == SectionStatus.COMPLETED
+    assert section_state.last_error == "provider down"
+    assert state_manager.get_section_content(section_state) == "Original text."
+    path = write_chapter_file(tmp_path, outline.chapters[0], state.chapters["1"], state_manager)
+    assert "Generation failed" not in path.read_text(encoding="utf-8")
+
+
+def test_requeue_records_legacy_content_as_revision(outline, tmp_path):
+    state_manager = StateManager(tmp_path)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    section_state = state.chapters["1"].sections["1.intro"]
+    # Completed before revision history existed
+    section_state.status = SectionStatus.COMPLETED
+    section_state.generated_content = "Legacy text."
+
+    state_manager.requeue_sections(state, [("1", "1.intro")])
+
+    assert len(section_state.revisions) == 1
+    assert state_manager.get_revision_content(section_state, 1) == "Legacy text."
+
+
+def test_low_memory_keeps_prose_out_of_state(outline, tmp_path):
+    state_manager = StateManager(tmp_path, low_memory=True)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    _completed(state_manager, state, "1", "1.intro", "Prose kept on disk.")
+
+    assert "Prose kept on disk." not in (tmp_path / "state.json").read_text(encoding="utf-8")
+    section_state = state_manager.load_state().chapters["1"].sections["1.intro"]
+    assert section_state.generated_content is None
+    assert state_manager.get_section_content(section_state) == "Prose kept on disk."
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_fragment_splice_matches_full_dump(outline, tmp_path, compact):
+    state_manager = StateManager(tmp_path, compact=compact)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    _completed(state_manager, state, "1", "1.intro", "First.")
+    _completed(state_manager, state, "2", "2.overview", "Second.")
+
+    # Only chapter 1 is re-serialized; chapter 2 reuses its cached fragment
+    _completed(state_manager, state, "1", "1.details", "Third.")
+    written = (tmp_path / "state.json").read_text(encoding="utf-8")
+    assert json.loads(written) == json.loads(state.model_dump_json())
+    assert ("\n" in written) is not compact
+
+
+def test_fragments_are_not_reused_across_state_objects(outline, tmp_path):
+    state_manager = StateManager(tmp_path)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    _completed(state_manager, state, "2", "2.overview", "Cached text.")
+
+    other = state_manager.load_state()
+    other.chapters["2"].sections["2.overview"].generated_content = "Edited elsewhere."
+    del state
+    gc.collect()
+
+    state_manager.save_state(other, changed={"1"})
+    assert state_manager.load_state().model_dump() == other.model_dump()
+
+
+def test_summary_tracks_saves(outline, tmp_path):
+    state_manager = StateManager(tmp_path)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    state_manager.update_section(
+        state, "1", "1.intro", status=SectionStatus.COMPLETED, content="Done."
+    )
+
+    summary = read_summary(tmp_path)
+    assert summary["overall"]["completed"] == 1
+    assert summary["chapters"]["1"]["completed"] == 1
+
+
+@pytest.mark.parametrize("edit", ["touch", "resize"])
+def test_summary_is_stale_after_state_changes(outline, tmp_path, edit):
+    state_manager = StateManager(tmp_path)
+    state_manager.initialize_state(outline, "test/model", "hash")
+    state_file = tmp_path / "state.json"
+    assert read_summary(tmp_path) is not None
+
+    # Another writer (or a crash before the summary was refreshed); each
+    # edit changes only the mtime or only the size
+    stat = state_file.stat()
+    mtime_ns = stat.st_mtime_ns + 1_000_000 if edit == "touch" else stat.st_mtime_ns
+    if edit == "resize":
+        state_file.write_text(state_file.read_text(encoding="utf-8") + " ", encoding="utf-8")
+    os.utime(state_file, ns=(stat.st_atime_ns, mtime_ns))
+    assert read_summary(tmp_path) is None
+
+    # load_summary falls back to the full state and rewrites the summary
+    assert state_manager.load_summary()["overall"]["total_sections"] == 3
+    assert read_summary(tmp_path) is not None
@@ -0,0 +1,82 @@
+"""Tests for compressed state and prose storage."""
+
+import pytest
+
+from book_writer.models import SectionStatus
+from book_writer.state import StateManager
+from book_writer.storage import (
+    check_compression,
+    compress,
+    decompress,
+    find_state_file,
+    method_for,
+    read_text,
+    write_text,
+)
+
+
+def _methods() -> list:
+    methods = [None, "none", "gzip"]
+    try:
+        check_compression("zstd")
+        methods.append("zstd")
+    except ValueError:
+        pass
+    return methods
+
+
+@pytest.mark.parametrize("method", _methods())
+def test_round_trip(tmp_path, method):
+    text = "Prose with unicode — “quotes” and ümlauts.\n" * 50
+    assert decompress(compress(text.encode("utf-8"), method), method).decode("utf-8") == text
+
+    written = write_text(tmp_path / "section.md", text, method)
+    assert method_for(written) == (None if method in (None, "none") else method)
+    assert read_text(written) == text
+
+
+@pytest.mark.parametrize("name", ["state.json.gz", "state.json.zst"])
+def test_corrupt_state_file_loads_as_missing(outline, tmp_path, name):
+    # A zstd file also lands here when zstandard isn't installed
+    data = compress(b'{"title": "Truncated"}' * 20, "gzip")
+    (tmp_path / name).write_bytes(data[: len(data) // 2])
+
+    with pytest.raises(ValueError):
+        read_text(tmp_path / name)
+    assert StateManager(tmp_path).load_state() is None
+
+
+def test_check_compression_rejects_unknown_method():
+    with pytest.raises(ValueError, match="Unknown compression"):
+        check_compression("lz4")
+
+
+def test_state_switches_format_and_drops_old_file(outline, tmp_path):
+    state_manager = StateManager(tmp_path)
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    assert find_state_file(tmp_path).name == "state.json"
+
+    state_manager.compression = "gzip"
+    state_manager.update_section(
+        state, "1", "1.intro", status=SectionStatus.COMPLETED, content="Compressed."
+    )
+    assert sorted(path.name for path in tmp_path.glob("state.json*")) == ["state.json.gz"]
+
+    # With no configured method, writes keep the format already on disk
+    reader = StateManager(tmp_path)
+    loaded = reader.load_state()
+    assert loaded.model_dump() == state.model_dump()
+    reader.save_state(loaded)
+    assert find_state_file(tmp_path).name == "state.json.gz"
+
+
+def test_low_memory_prose_is_compressed(outline, tmp_path):
+    state_manager = StateManager(tmp_path, low_memory=True, compression="gzip")
+    state = state_manager.initialize_state(outline, "test/model", "hash")
+    state_manager.update_section(
+        state, "1", "1.intro", status=SectionStatus.COMPLETED, content="On disk."
+    )
+
+    section_state = state.chapters["1"].sections["1.intro"]
+    assert section_state.content_path.endswith(".gz")
+    assert state_manager.get_section_content(section_state) == "On disk."
@@ -0,0 +1,98 @@
+"""Tests for local token counting, tokenizer lookup and context windows."""
+
+import pytest
+
+from book_writer import tokens
+from book_writer.tokens import (
+    DEFAULT_CONTEXT_WINDOW,
+    MESSAGE_OVERHEAD_TOKENS,
+    HeuristicTokenizer,
+    TokenCache,
+    Tokenizer,
+    context_window,
+    count_message_tokens,
+    count_tokens,
+    get_tokenizer,
+    register_tokenizer,
+)
+
+
+class WordTokenizer(Tokenizer):
+    """One token per whitespace-separated word, counting each call."""
+
+    name = "words"
+
+    def __init__(self):
+        self.calls = 0
+
+    def count(self, text: str) -> int:
+        self.calls += 1
+        return len(text.split())
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    """Keep tokenizer registrations made by a test out of the others."""
+    monkeypatch.setattr(tokens, "_FACTORIES", dict(tokens._FACTORIES))
+    monkeypatch.setattr(tokens, "_TOKENIZERS", {})
+
+
+def test_heuristic_counts_characters():
+    assert HeuristicTokenizer().count("x" * 400) == 101
+    assert count_tokens("x" * 400) == 101
+
+
+def test_registered_tokenizer_by_longest_prefix():
+    words = WordTokenizer()
+    register_tokenizer("custom/", HeuristicTokenizer)
+    register_tokenizer("custom/words", lambda: words)
+
+    assert get_tokenizer("custom/words-large") is words
+    assert isinstance(get_tokenizer("custom/other"), HeuristicTokenizer)
+    assert count_tokens("three short words", "custom/words-large") == 3
+
+
+def test_missing_tokenizer_package_falls_back_to_heuristic():
+    def unavailable():
+        raise ImportError("tokenizer package not installed")
+
+    register_tokenizer("missing/", unavailable)
+    assert isinstance(get_tokenizer("missing/model"), HeuristicTokenizer)
+    assert isinstance(get_tokenizer("unknown/model"), HeuristicTokenizer)
+
+
+def test_cache_counts_long_text_once():
+    cache = TokenCache(max_entries=1)
+    words = WordTokenizer()
+    text = "word " * 100
+
+    assert cache.count(text, words) == 100
+    assert cache.count(text, words) == 100
+    assert (words.calls, cache.hits, cache.misses) == (1, 1, 1)
+
+    # The oldest entry is evicted past max_entries
+    cache.count("other " * 100, words)
+    cache.count(text, words)
+    assert words.calls == 3
+
+
+def test_message_tokens_cover_plain_and_part_content():
+    register_tokenizer("custom/", WordTokenizer)
+    messages = [
+        {"role": "system", "content": "one two"},
+        {"role": "user", "content": [{"type": "text", "text": "three four five"}]},
+    ]
+    assert count_message_tokens(messages, "custom/model") == 5 + 2 * MESSAGE_OVERHEAD_TOKENS
+
+
+@pytest.mark.parametrize(
+    "model, override, expected",
+    [
+        ("openai/gpt-4.1-mini", None, 1_000_000),
+        ("openai/gpt-4o", None, 128_000),
+        ("anthropic/claude-sonnet-4", 50_000, 50_000),
+        ("unknown/model", None, DEFAULT_CONTEXT_WINDOW),
+    ],
+)
+def test_context_window(model, override, expected):
+    assert context_window(model, override) == expected
@@ -0,0 +1,76 @@
+"""Tests for rubric watching, incremental re-parsing and outline diffs."""
+
+import asyncio
+
+from book_writer.parser import diff_outlines, parse_rubric_text, reparse_outline
+from book_writer.watch import RubricWatcher
+
+from .conftest import RUBRIC
+
+
+def test_diff_reports_changed_section():
+    edited = RUBRIC.replace("- Go deeper", "- Go much deeper")
+    changed, removed = diff_outlines(parse_rubric_text(RUBRIC), parse_rubric_text(edited))
+
+    assert changed == {"1": ["1.details"]}
+    assert removed == []
+
+
+def test_diff_reports_added_and_removed_sections():
+    edited = RUBRIC.replace("## Details\n- Go deeper\n\n", "") + "\n## Examples\n- Show it\n"
+    changed, removed = diff_outlines(parse_rubric_text(RUBRIC), parse_rubric_text(edited))
+
+    # Chapter 1 lost a section, so its order changed with nothing to rewrite
+    assert changed == {"1": [], "2": ["2.examples"]}
+    assert removed == []
+
+
+def test_diff_reports_removed_chapter():
+    edited = RUBRIC.split("# Chapter 2")[0]
+    changed, removed = diff_outlines(parse_rubric_text(RUBRIC), parse_rubric_text(edited))
+
+    assert changed == {}
+    assert removed == ["2"]
+
+
+def test_reparse_matches_a_full_parse():
+    outline = parse_rubric_text(RUBRIC)
+    for edited in (
+        # Section edit: only chapter 1 is re-parsed, chapter 2 shifts down
+        RUBRIC.replace("- Go deeper", "- Go deeper\n- And deeper still"),
+        # New chapter heading: falls back to a full parse
+        RUBRIC + "\n# Chapter 3: Last\n\n## Wrap\n- Conclude\n",
+    ):
+        assert reparse_outline(outline, RUBRIC, edited) == parse_rubric_text(edited)
+
+
+async def test_watcher_reports_a_burst_of_writes_once(tmp_path):
+    rubric = tmp_path / "rubric.md"
+    rubric.write_text(RUBRIC, encoding="utf-8")
+    watcher = RubricWatcher(rubric, poll_interval=0.01, debounce=0.1)
+    waiting = asyncio.create_task(watcher.wait_for_change())
+
+    # An editor saving in several steps
+    for step in range(3):
+        rubric.write_text(RUBRIC + "x" * (step + 1), encoding="utf-8")
+        await asyncio.sleep(0.03)
+
+    old, new = await asyncio.wait_for(waiting, 2.0)
+    assert old == RUBRIC
+    assert new == RUBRIC + "xxx"
+    assert watcher.content == new
+
+
+async def test_watcher_ignores_rewrites_with_the_same_content(tmp_path):
+    rubric = tmp_path / "rubric.md"
+    rubric.write_text(RUBRIC, encoding="utf-8")
+    watcher = RubricWatcher(rubric, poll_interval=0.01, debounce=0.02)
+    waiting = asyncio.create_task(watcher.wait_for_change())
+
+    rubric.write_text(RUBRIC, encoding="utf-8")
+    await asyncio.sleep(0.1)
+    assert not waiting.done()
+
+    rubric.write_text(RUBRIC + "edited", encoding="utf-8")
+    _, new = await asyncio.wait_for(waiting, 2.0)
+    assert new == RUBRIC + "edited"